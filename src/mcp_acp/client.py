@@ -4,9 +4,16 @@ This client communicates with the public-api gateway service which provides
 a simplified REST API for managing AgenticSessions.
 """
 
+import asyncio
+import functools
+import json
 import os
 import re
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from datetime import UTC, datetime, timedelta
+from types import MappingProxyType
 from typing import Any
 
 import httpx
@@ -14,28 +21,45 @@ import httpx
 from mcp_acp.settings import load_clusters_config, load_settings
 from utils.pylogger import get_python_logger
 
+_json_loads: Callable[[str | bytes], Any]
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    _json_loads = json.loads
+
 logger = get_python_logger()
 
-LABEL_VALUE_PATTERN = re.compile(r"^[a-zA-Z0-9]([a-zA-Z0-9._-]*[a-zA-Z0-9])?$")
-
-SESSION_TEMPLATES: dict[str, dict[str, Any]] = {
-    "triage": {
-        "workflow": "triage",
-        "llmConfig": {"model": "claude-sonnet-4", "temperature": 0.7},
-    },
-    "bugfix": {
-        "workflow": "bugfix",
-        "llmConfig": {"model": "claude-sonnet-4", "temperature": 0.3},
-    },
-    "feature": {
-        "workflow": "feature-development",
-        "llmConfig": {"model": "claude-sonnet-4", "temperature": 0.5},
-    },
-    "exploration": {
-        "workflow": "codebase-exploration",
-        "llmConfig": {"model": "claude-sonnet-4", "temperature": 0.8},
-    },
-}
+DNS1123_PATTERN = re.compile(r"^[a-z0-9]([-a-z0-9]*[a-z0-9])?$")
+# Length (1-63) is enforced by the pattern itself
+LABEL_VALUE_PATTERN = re.compile(r"^[a-zA-Z0-9](?:[a-zA-Z0-9._-]{0,61}[a-zA-Z0-9])?$")
+TIME_DELTA_PATTERN = re.compile(r"(\d+)([dhm])", re.IGNORECASE)
+TIME_UNIT_SECONDS = {"d": 86400, "h": 3600, "m": 60}
+_NO_METADATA: Mapping[str, Any] = MappingProxyType({})
+
+
+def _template(workflow: str, temperature: float) -> Mapping[str, Any]:
+    """Build a read-only session template."""
+    llm_config = MappingProxyType({"model": "claude-sonnet-4", "temperature": temperature})
+    return MappingProxyType({"workflow": workflow, "llmConfig": llm_config})
+
+
+SESSION_TEMPLATES: Mapping[str, Mapping[str, Any]] = MappingProxyType(
+    {
+        "triage": _template("triage", 0.7),
+        "bugfix": _template("bugfix", 0.3),
+        "feature": _template("feature-development", 0.5),
+        "exploration": _template("codebase-exploration", 0.8),
+    }
+)
+
+
+@functools.lru_cache(maxsize=16)
+def _label_dry_run_message(action: str, n_labels: int, n_sessions: int) -> str:
+    """Build the dry-run message for a bulk label ("add") or unlabel ("remove") call."""
+    preposition = "to" if action == "add" else "from"
+    return f"Would {action} {n_labels} label(s) {preposition} {n_sessions} session(s)"
 
 
 class ACPClient:
@@ -44,10 +68,17 @@ class ACPClient:
     Attributes:
         settings: Global settings instance
         clusters_config: Cluster configuration instance
+        default_project: Default project of the active cluster, refreshed on switch_cluster
     """
 
     MAX_BULK_ITEMS = 3
     DEFAULT_TIMEOUT = 30.0
+    HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0)
+    SESSION_CACHE_TTL = 2.0
+    SESSION_CACHE_SIZE = 128
+    JSON_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+    _STOP_BODY = {"stopped": True}
+    _RESTART_BODY = {"stopped": False}
 
     def __init__(self, config_path: str | None = None, settings=None):
         """Initialize ACP client.
@@ -69,7 +100,13 @@ class ACPClient:
             logger.error("cluster_config_load_failed", error=str(e))
             raise
 
-        self._http_client: httpx.AsyncClient | None = None
+        self._http_clients: dict[str, httpx.AsyncClient] = {}
+        self._cluster_cache: dict[str, dict[str, Any]] = {}
+        self._session_cache: OrderedDict[tuple[str, str, str], tuple[float, dict[str, Any]]] = OrderedDict()
+        # Bumped by every eviction so a GET that overlapped a mutation is not cached
+        self._session_generations: dict[tuple[str, str, str], int] = {}
+        self.default_project: str | None = None
+        self._refresh_default_project()
 
         logger.info(
             "acp_client_initialized",
@@ -79,22 +116,33 @@ class ACPClient:
 
     # ── HTTP infrastructure ──────────────────────────────────────────────
 
+    def _refresh_default_project(self) -> None:
+        """Re-resolve default_project from the current default cluster."""
+        cluster = self.clusters_config.clusters.get(self.clusters_config.default_cluster or "")
+        self.default_project = cluster.default_project if cluster else None
+
     def _get_cluster_config(self, cluster_name: str | None = None) -> dict[str, Any]:
-        """Get cluster configuration."""
+        """Get cluster configuration, cached per cluster name."""
         name = cluster_name or self.clusters_config.default_cluster
         if not name:
             raise ValueError("No cluster specified and no default_cluster configured")
 
+        cached = self._cluster_cache.get(name)
+        if cached is not None:
+            return cached
+
         cluster = self.clusters_config.clusters.get(name)
         if not cluster:
             raise ValueError(f"Cluster '{name}' not found in configuration")
 
-        return {
+        cached = self._cluster_cache[name] = {
+            "name": name,
             "server": cluster.server,
             "default_project": cluster.default_project,
             "description": cluster.description,
             "token": cluster.token,
         }
+        return cached
 
     def _get_token(self, cluster_config: dict[str, Any]) -> str:
         """Get authentication token for a cluster."""
@@ -107,14 +155,21 @@ class ACPClient:
 
         return token
 
-    async def _get_http_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._http_client is None or self._http_client.is_closed:
-            self._http_client = httpx.AsyncClient(
+    async def _get_http_client(self, cluster_name: str | None = None) -> httpx.AsyncClient:
+        """Get or create the pooled HTTP client for a cluster, with its base URL and auth headers pre-bound."""
+        cluster_config = self._get_cluster_config(cluster_name)
+        client = self._http_clients.get(cluster_config["name"])
+        if client is None or client.is_closed:
+            token = self._get_token(cluster_config)
+            client = self._http_clients[cluster_config["name"]] = httpx.AsyncClient(
+                base_url=cluster_config["server"],
+                headers={**self.JSON_HEADERS, "Authorization": f"Bearer {token}"},
                 timeout=httpx.Timeout(self.DEFAULT_TIMEOUT),
                 follow_redirects=True,
+                http2=True,
+                limits=self.HTTP_LIMITS,
             )
-        return self._http_client
+        return client
 
     async def _request(
         self,
@@ -126,49 +181,25 @@ class ACPClient:
         params: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         """Make an HTTP request to the public API expecting JSON response."""
-        cluster_config = self._get_cluster_config(cluster_name)
-        token = self._get_token(cluster_config)
-        base_url = cluster_config["server"]
-
-        url = f"{base_url}{path}"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "X-Ambient-Project": project,
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
-
-        client = await self._get_http_client()
+        client = await self._get_http_client(cluster_name)
+        headers = {"X-Ambient-Project": project}
 
         try:
             response = await client.request(
                 method=method,
-                url=url,
+                url=path,
                 headers=headers,
                 json=json_data,
                 params=params,
             )
 
-            if response.status_code >= 400:
-                try:
-                    error_data = response.json()
-                    error_msg = error_data.get("error", f"HTTP {response.status_code}")
-                except Exception:
-                    error_msg = f"HTTP {response.status_code}: {response.text}"
-
-                logger.warning(
-                    "api_request_failed",
-                    method=method,
-                    path=path,
-                    status_code=response.status_code,
-                    error=error_msg,
-                )
-                raise ValueError(error_msg)
-
-            if response.status_code == 204:
-                return {"success": True}
+            status_code = response.status_code
+            if status_code < 400:
+                if status_code == 204:
+                    return {"success": True}
+                return _json_loads(response.content) if response.content else {}
 
-            return response.json()
+            raise self._error_from_response(response, method, path)
 
         except httpx.TimeoutException as e:
             logger.error("api_request_timeout", method=method, path=path, error=str(e))
@@ -177,6 +208,31 @@ class ACPClient:
             logger.error("api_request_error", method=method, path=path, error=str(e))
             raise ValueError(f"Request failed: {str(e)}") from e
 
+    async def _patch_session(self, project: str, session: str, body: dict[str, Any]) -> dict[str, Any]:
+        """PATCH a single session. Shared by stop/restart/update/label/unlabel."""
+        self._evict_session(project, session)
+        try:
+            return await self._request("PATCH", f"/v1/sessions/{session}", project, json_data=body)
+        finally:
+            self._evict_session(project, session)
+
+    @staticmethod
+    def _error_from_response(response: httpx.Response, method: str, path: str) -> ValueError:
+        """Build (and log) the ValueError for a failed API response."""
+        try:
+            error_msg = _json_loads(response.content).get("error", f"HTTP {response.status_code}")
+        except Exception:
+            error_msg = f"HTTP {response.status_code}: {response.text}"
+
+        logger.warning(
+            "api_request_failed",
+            method=method,
+            path=path,
+            status_code=response.status_code,
+            error=error_msg,
+        )
+        return ValueError(error_msg)
+
     async def _request_text(
         self,
         method: str,
@@ -186,21 +242,11 @@ class ACPClient:
         params: dict[str, Any] | None = None,
     ) -> str:
         """Make an HTTP request expecting text response (e.g., logs)."""
-        cluster_config = self._get_cluster_config(cluster_name)
-        token = self._get_token(cluster_config)
-        base_url = cluster_config["server"]
-
-        url = f"{base_url}{path}"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "X-Ambient-Project": project,
-            "Accept": "text/plain",
-        }
-
-        client = await self._get_http_client()
+        client = await self._get_http_client(cluster_name)
+        headers = {"X-Ambient-Project": project, "Accept": "text/plain"}
 
         try:
-            response = await client.request(method=method, url=url, headers=headers, params=params)
+            response = await client.request(method=method, url=path, headers=headers, params=params)
 
             if response.status_code >= 400:
                 raise ValueError(f"HTTP {response.status_code}: {response.text}")
@@ -222,7 +268,7 @@ class ACPClient:
             raise ValueError(f"{field_name} must be a string")
         if len(value) > max_length:
             raise ValueError(f"{field_name} exceeds maximum length of {max_length}")
-        if not re.match(r"^[a-z0-9]([-a-z0-9]*[a-z0-9])?$", value):
+        if not DNS1123_PATTERN.match(value):
             raise ValueError(f"{field_name} contains invalid characters. Must match DNS-1123 format.")
 
     def _validate_bulk_operation(self, items: list[str], operation_name: str) -> None:
@@ -233,16 +279,22 @@ class ACPClient:
                 f"You requested {len(items)}. Split into multiple operations."
             )
 
+    def _validate_bulk_targets(self, project: str, sessions: list[str]) -> None:
+        """Validate the project and every session name before a bulk operation starts."""
+        self._validate_input(project, "project")
+        for session_name in sessions:
+            self._validate_input(session_name, "session")
+
     def _validate_labels(self, labels: dict[str, str]) -> None:
         """Validate label keys and values."""
         if not labels:
             raise ValueError("Labels must not be empty")
         for key, value in labels.items():
-            if len(key) > 63 or not LABEL_VALUE_PATTERN.match(key):
+            if not LABEL_VALUE_PATTERN.match(key):
                 raise ValueError(
                     f"Invalid label key '{key}'. Must be 1-63 alphanumeric chars, dashes, dots, or underscores."
                 )
-            if len(value) > 63 or not LABEL_VALUE_PATTERN.match(value):
+            if not LABEL_VALUE_PATTERN.match(value):
                 raise ValueError(
                     f"Invalid label value '{value}' for key '{key}'. Must be 1-63 alphanumeric chars, dashes, dots, or underscores."
                 )
@@ -250,23 +302,31 @@ class ACPClient:
     # ── Time utilities ───────────────────────────────────────────────────
 
     def _parse_time_delta(self, time_str: str) -> datetime:
-        """Parse time delta string to datetime."""
-        match = re.match(r"(\d+)([dhm])", time_str.lower())
+        """Parse time delta string to an aware UTC datetime."""
+        match = TIME_DELTA_PATTERN.match(time_str)
         if not match:
             raise ValueError(f"Invalid time format: {time_str}. Use '7d', '24h', or '30m'")
 
-        value, unit = int(match.group(1)), match.group(2)
-        now = datetime.utcnow()
-
-        deltas = {"d": timedelta(days=value), "h": timedelta(hours=value), "m": timedelta(minutes=value)}
-        return now - deltas[unit]
+        value, unit = int(match.group(1)), match.group(2).lower()
+        return datetime.now(UTC) - timedelta(seconds=value * TIME_UNIT_SECONDS[unit])
 
     def _is_older_than(self, timestamp_str: str | None, cutoff: datetime) -> bool:
-        """Check if timestamp is older than cutoff."""
+        """Check if timestamp is older than cutoff, parsing any offset or naive (UTC) form."""
         if not timestamp_str:
             return False
-        timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-        return timestamp.replace(tzinfo=None) < cutoff
+        timestamp = datetime.fromisoformat(timestamp_str)
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=UTC)
+        return timestamp < cutoff
+
+    def _created_before(self, created_at: str | None, cutoff: datetime, cutoff_iso: str) -> bool:
+        """Check createdAt against the cutoff, comparing UTC "Z" timestamps as strings."""
+        if not created_at:
+            return False
+        # RFC 3339 UTC timestamps sort lexicographically; anything with an offset must be parsed
+        if created_at.endswith("Z"):
+            return created_at < cutoff_iso
+        return self._is_older_than(created_at, cutoff)
 
     def _sort_sessions(self, sessions: list[dict], sort_by: str) -> list[dict]:
         """Sort sessions by field."""
@@ -281,6 +341,36 @@ class ACPClient:
             return sorted(sessions, key=key_fn, reverse=(sort_by != "name"))
         return sessions
 
+    # ── Session cache ────────────────────────────────────────────────────
+
+    def _session_cache_key(self, project: str, session: str) -> tuple[str, str, str]:
+        return (self.clusters_config.default_cluster or "", project, session)
+
+    async def _fetch_session(self, project: str, session: str) -> dict[str, Any]:
+        """GET a session, served from a short-lived LRU cache when fresh."""
+        key = self._session_cache_key(project, session)
+        now = time.monotonic()
+        entry = self._session_cache.get(key)
+        if entry is not None and now - entry[0] < self.SESSION_CACHE_TTL:
+            self._session_cache.move_to_end(key)
+            return entry[1]
+
+        generation = self._session_generations.get(key, 0)
+        data = await self._request("GET", f"/v1/sessions/{session}", project)
+        if self._session_generations.get(key, 0) != generation:
+            return data
+        self._session_cache[key] = (now, data)
+        self._session_cache.move_to_end(key)
+        if len(self._session_cache) > self.SESSION_CACHE_SIZE:
+            self._session_cache.popitem(last=False)
+        return data
+
+    def _evict_session(self, project: str, session: str) -> None:
+        """Drop a cached session and stop any GET already in flight for it from being cached."""
+        key = self._session_cache_key(project, session)
+        self._session_cache.pop(key, None)
+        self._session_generations[key] = self._session_generations.get(key, 0) + 1
+
     # ── Session CRUD ─────────────────────────────────────────────────────
 
     async def list_sessions(
@@ -291,33 +381,62 @@ class ACPClient:
         sort_by: str | None = None,
         limit: int | None = None,
     ) -> dict[str, Any]:
-        """List sessions with filtering."""
-        self._validate_input(project, "project")
+        """List sessions with filtering.
 
-        response = await self._request("GET", "/v1/sessions", project)
-        sessions = response.get("items", [])
-
-        filters = []
-        filters_applied = {}
+        When ``settings.server_side_filter`` is enabled the filters are sent to the
+        gateway as query parameters; otherwise they are applied locally.
+        """
+        self._validate_input(project, "project")
 
+        filters_applied: dict[str, Any] = {}
+        cutoff: datetime | None = None
+        cutoff_iso = ""
         if status:
-            filters.append(lambda s: s.get("status", "").lower() == status.lower())
             filters_applied["status"] = status
-
         if older_than:
-            cutoff_time = self._parse_time_delta(older_than)
-            filters.append(lambda s: self._is_older_than(s.get("createdAt"), cutoff_time))
+            cutoff = self._parse_time_delta(older_than)
+            cutoff_iso = cutoff.strftime("%Y-%m-%dT%H:%M:%SZ")
             filters_applied["older_than"] = older_than
+        if sort_by:
+            filters_applied["sort_by"] = sort_by
+        if limit and limit > 0:
+            filters_applied["limit"] = limit
 
-        filtered = [s for s in sessions if all(f(s) for f in filters)]
+        if self.settings.server_side_filter:
+            params: dict[str, Any] = {}
+            if status:
+                params["status"] = status.lower()
+            if older_than:
+                params["createdBefore"] = cutoff_iso
+            if sort_by:
+                params["sortBy"] = sort_by
+            if limit and limit > 0:
+                params["limit"] = limit
+
+            response = await self._request("GET", "/v1/sessions", project, params=params or None)
+            sessions = response.get("items", [])
+            return {
+                "sessions": sessions,
+                "total": len(sessions),
+                "filters_applied": filters_applied,
+            }
+
+        response = await self._request("GET", "/v1/sessions", project)
+        sessions = response.get("items", [])
+
+        status_lc = status.lower() if status else None
+        filtered = [
+            s
+            for s in sessions
+            if (status_lc is None or s.get("status", "").lower() == status_lc)
+            and (cutoff is None or self._created_before(s.get("createdAt"), cutoff, cutoff_iso))
+        ]
 
         if sort_by:
             filtered = self._sort_sessions(filtered, sort_by)
-            filters_applied["sort_by"] = sort_by
 
         if limit and limit > 0:
             filtered = filtered[:limit]
-            filters_applied["limit"] = limit
 
         return {
             "sessions": filtered,
@@ -330,7 +449,7 @@ class ACPClient:
         self._validate_input(project, "project")
         self._validate_input(session, "session")
 
-        return await self._request("GET", f"/v1/sessions/{session}", project)
+        return await self._fetch_session(project, session)
 
     async def create_session(
         self,
@@ -397,7 +516,8 @@ class ACPClient:
         template_config = SESSION_TEMPLATES[template]
         session_data: dict[str, Any] = {
             "displayName": display_name,
-            **template_config,
+            "workflow": template_config["workflow"],
+            "llmConfig": dict(template_config["llmConfig"]),
         }
 
         if repos:
@@ -425,14 +545,17 @@ class ACPClient:
         except (ValueError, TimeoutError) as e:
             return {"created": False, "message": str(e)}
 
-    async def delete_session(self, project: str, session: str, dry_run: bool = False) -> dict[str, Any]:
+    async def delete_session(
+        self, project: str, session: str, dry_run: bool = False, session_data: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         """Delete a session."""
         self._validate_input(project, "project")
         self._validate_input(session, "session")
 
         if dry_run:
             try:
-                session_data = await self._request("GET", f"/v1/sessions/{session}", project)
+                if session_data is None:
+                    session_data = await self._fetch_session(project, session)
                 return {
                     "dry_run": True,
                     "success": True,
@@ -450,6 +573,7 @@ class ACPClient:
                     "message": f"Session '{session}' not found in project '{project}'",
                 }
 
+        self._evict_session(project, session)
         try:
             await self._request("DELETE", f"/v1/sessions/{session}", project)
             return {
@@ -461,15 +585,20 @@ class ACPClient:
                 "deleted": False,
                 "message": f"Failed to delete session: {str(e)}",
             }
+        finally:
+            self._evict_session(project, session)
 
-    async def restart_session(self, project: str, session: str, dry_run: bool = False) -> dict[str, Any]:
+    async def restart_session(
+        self, project: str, session: str, dry_run: bool = False, session_data: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         """Restart a stopped session."""
         self._validate_input(project, "project")
         self._validate_input(session, "session")
 
         if dry_run:
             try:
-                session_data = await self._request("GET", f"/v1/sessions/{session}", project)
+                if session_data is None:
+                    session_data = await self._fetch_session(project, session)
                 return {
                     "dry_run": True,
                     "success": True,
@@ -483,19 +612,22 @@ class ACPClient:
                 return {"dry_run": True, "success": False, "message": f"Session '{session}' not found"}
 
         try:
-            await self._request("PATCH", f"/v1/sessions/{session}", project, json_data={"stopped": False})
+            await self._patch_session(project, session, self._RESTART_BODY)
             return {"restarted": True, "message": f"Successfully restarted session '{session}'"}
         except ValueError as e:
             return {"restarted": False, "message": f"Failed to restart session: {str(e)}"}
 
-    async def stop_session(self, project: str, session: str, dry_run: bool = False) -> dict[str, Any]:
+    async def stop_session(
+        self, project: str, session: str, dry_run: bool = False, session_data: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         """Stop a running session."""
         self._validate_input(project, "project")
         self._validate_input(session, "session")
 
         if dry_run:
             try:
-                session_data = await self._request("GET", f"/v1/sessions/{session}", project)
+                if session_data is None:
+                    session_data = await self._fetch_session(project, session)
                 return {
                     "dry_run": True,
                     "success": True,
@@ -509,7 +641,7 @@ class ACPClient:
                 return {"dry_run": True, "success": False, "message": f"Session '{session}' not found"}
 
         try:
-            await self._request("PATCH", f"/v1/sessions/{session}", project, json_data={"stopped": True})
+            await self._patch_session(project, session, self._STOP_BODY)
             return {"stopped": True, "message": f"Successfully stopped session '{session}'"}
         except ValueError as e:
             return {"stopped": False, "message": f"Failed to stop session: {str(e)}"}
@@ -521,7 +653,7 @@ class ACPClient:
         self._validate_input(project, "project")
         self._validate_input(source_session, "source_session")
 
-        source = await self._request("GET", f"/v1/sessions/{source_session}", project)
+        source = await self._fetch_session(project, source_session)
 
         clone_data: dict[str, Any] = {
             "displayName": new_display_name,
@@ -581,7 +713,7 @@ class ACPClient:
 
         if dry_run:
             try:
-                current = await self._request("GET", f"/v1/sessions/{session}", project)
+                current = await self._fetch_session(project, session)
                 return {
                     "dry_run": True,
                     "success": True,
@@ -593,7 +725,7 @@ class ACPClient:
                 return {"dry_run": True, "success": False, "message": f"Session '{session}' not found"}
 
         try:
-            result = await self._request("PATCH", f"/v1/sessions/{session}", project, json_data=patch_data)
+            result = await self._patch_session(project, session, patch_data)
             return {
                 "updated": True,
                 "message": f"Successfully updated session '{session}'",
@@ -664,7 +796,7 @@ class ACPClient:
         self._validate_input(session, "session")
         self._validate_labels(labels)
 
-        await self._request("PATCH", f"/v1/sessions/{session}", project, json_data={"labels": labels})
+        await self._patch_session(project, session, {"labels": labels})
         return {
             "labeled": True,
             "session": session,
@@ -680,7 +812,7 @@ class ACPClient:
         if not label_keys:
             raise ValueError("label_keys must not be empty")
 
-        await self._request("PATCH", f"/v1/sessions/{session}", project, json_data={"removeLabels": label_keys})
+        await self._patch_session(project, session, {"removeLabels": label_keys})
         return {
             "unlabeled": True,
             "session": session,
@@ -688,14 +820,18 @@ class ACPClient:
             "message": f"Removed {len(label_keys)} label(s) from session '{session}'",
         }
 
-    async def list_sessions_by_label(self, project: str, labels: dict[str, str]) -> dict[str, Any]:
-        """List sessions matching label selectors."""
+    async def list_sessions_by_label(
+        self, project: str, labels: dict[str, str], fields: str | None = None
+    ) -> dict[str, Any]:
+        """List sessions matching label selectors, optionally projected to the given fields."""
         self._validate_input(project, "project")
         self._validate_labels(labels)
 
         # Build label selector query: key1=value1,key2=value2
-        selector = ",".join(f"{k}={v}" for k, v in labels.items())
+        selector = ",".join([f"{k}={v}" for k, v in labels.items()])
         params = {"labelSelector": selector}
+        if fields:
+            params["fields"] = fields
 
         response = await self._request("GET", "/v1/sessions", project, params=params)
         sessions = response.get("items", [])
@@ -708,6 +844,18 @@ class ACPClient:
 
     # ── Bulk operations ──────────────────────────────────────────────────
 
+    async def _prefetch_sessions(self, project: str, names: set[str]) -> dict[str, dict[str, Any]]:
+        """Fetch the session list once and index the requested sessions by ID.
+
+        Sessions missing from the result (or a failed list call) fall back to a
+        per-session GET in the individual operation.
+        """
+        try:
+            response = await self._request("GET", "/v1/sessions", project)
+        except (ValueError, TimeoutError):
+            return {}
+        return {s["id"]: s for s in response.get("items", []) if s.get("id") in names}
+
     async def _run_bulk(
         self,
         project: str,
@@ -716,33 +864,45 @@ class ACPClient:
         operation_name: str,
         success_key: str,
         dry_run: bool = False,
+        prefetched: dict[str, dict[str, Any]] | None = None,
     ) -> dict[str, Any]:
-        """Shared bulk operation runner. Iterates sessions, calls op_fn, collects results."""
-        self._validate_bulk_operation(sessions, operation_name)
+        """Shared bulk operation runner. Runs op_fn for all sessions concurrently, collects results.
 
-        success: list[str] = []
-        failed: list[dict[str, str]] = []
-        dry_run_info: dict[str, list] = {"would_execute": [], "skipped": []}
+        In dry-run mode, session documents are taken from prefetched when given,
+        otherwise fetched with a single list call.
+        """
+        self._validate_bulk_operation(sessions, operation_name)
+        self._validate_bulk_targets(project, sessions)
+
+        if not dry_run:
+            prefetched = {}
+        elif prefetched is None:
+            prefetched = await self._prefetch_sessions(project, set(sessions))
+
+        results = await asyncio.gather(
+            *(
+                op_fn(project=project, session=session_name, dry_run=dry_run, session_data=prefetched.get(session_name))
+                for session_name in sessions
+            ),
+            return_exceptions=True,
+        )
 
-        for session_name in sessions:
-            result = await op_fn(project=project, session=session_name, dry_run=dry_run)
+        if not dry_run:
+            success, failed = self._partition_results(sessions, results, success_key)
+            return {success_key: success, "failed": failed}
 
-            if dry_run:
-                if result.get("success", True):
-                    dry_run_info["would_execute"].append({"session": session_name, "info": result.get("session_info")})
-                else:
-                    dry_run_info["skipped"].append({"session": session_name, "reason": result.get("message")})
+        dry_run_info: dict[str, list] = {"would_execute": [], "skipped": []}
+        for session_name, result in zip(sessions, results, strict=True):
+            if isinstance(result, ValueError | TimeoutError):
+                dry_run_info["skipped"].append({"session": session_name, "reason": str(result)})
+            elif isinstance(result, BaseException):
+                raise result
+            elif result.get("success", True):
+                dry_run_info["would_execute"].append({"session": session_name, "info": result.get("session_info")})
             else:
-                if result.get(success_key):
-                    success.append(session_name)
-                else:
-                    failed.append({"session": session_name, "error": result.get("message", "unknown error")})
+                dry_run_info["skipped"].append({"session": session_name, "reason": result.get("message")})
 
-        response: dict[str, Any] = {success_key: success, "failed": failed}
-        if dry_run:
-            response["dry_run"] = True
-            response["dry_run_info"] = dry_run_info
-        return response
+        return {success_key: [], "failed": [], "dry_run": True, "dry_run_info": dry_run_info}
 
     async def _run_bulk_by_label(
         self,
@@ -753,10 +913,19 @@ class ACPClient:
         success_key: str,
         dry_run: bool = False,
     ) -> dict[str, Any]:
-        """Find sessions by label, then run bulk operation on them."""
-        matched = await self.list_sessions_by_label(project, labels)
-        sessions = matched.get("sessions", [])
-        names = [s.get("id", s.get("metadata", {}).get("name", "")) for s in sessions]
+        """Find sessions by label, then run bulk operation on them.
+
+        A dry run reuses the full documents from the label query instead of
+        listing the project a second time.
+        """
+        fields = "id" if self.settings.supports_field_projection and not dry_run else None
+        matched = await self.list_sessions_by_label(project, labels, fields=fields)
+        by_name = {
+            name: s
+            for s in matched.get("sessions", [])
+            if (name := s.get("id") or s.get("metadata", _NO_METADATA).get("name"))
+        }
+        names = list(by_name)
 
         if not names:
             return {
@@ -767,7 +936,9 @@ class ACPClient:
             }
 
         self._validate_bulk_operation(names, operation_name)
-        result = await self._run_bulk(project, names, op_fn, operation_name, success_key, dry_run)
+        result = await self._run_bulk(
+            project, names, op_fn, operation_name, success_key, dry_run, prefetched=by_name if dry_run else None
+        )
         result["labels_filter"] = labels
         return result
 
@@ -783,31 +954,49 @@ class ACPClient:
         """Restart multiple stopped sessions (max 3)."""
         return await self._run_bulk(project, sessions, self.restart_session, "restart", "restarted", dry_run)
 
+    @staticmethod
+    def _partition_results(
+        sessions: list[str], results: list[Any], success_key: str | None = None
+    ) -> tuple[list[str], list[dict[str, str]]]:
+        """Split gathered per-session results into succeeded names and failures.
+
+        Expected per-session errors (ValueError/TimeoutError) become failures; anything else is re-raised.
+        With success_key, a result whose success_key is falsy is also a failure.
+        """
+        success: list[str] = []
+        failed: list[dict[str, str]] = []
+        for session_name, result in zip(sessions, results, strict=True):
+            if isinstance(result, ValueError | TimeoutError):
+                failed.append({"session": session_name, "error": str(result)})
+            elif isinstance(result, BaseException):
+                raise result
+            elif success_key is None or result.get(success_key):
+                success.append(session_name)
+            else:
+                failed.append({"session": session_name, "error": result.get("message", "unknown error")})
+        return success, failed
+
     async def bulk_label_sessions(
         self, project: str, sessions: list[str], labels: dict[str, str], dry_run: bool = False
     ) -> dict[str, Any]:
         """Add labels to multiple sessions (max 3)."""
         self._validate_bulk_operation(sessions, "label")
+        self._validate_bulk_targets(project, sessions)
         self._validate_labels(labels)
 
-        success: list[str] = []
-        failed: list[dict[str, str]] = []
-
         if dry_run:
             return {
                 "dry_run": True,
                 "sessions": sessions,
                 "labels": labels,
-                "message": f"Would add {len(labels)} label(s) to {len(sessions)} session(s)",
+                "message": _label_dry_run_message("add", len(labels), len(sessions)),
             }
 
-        for session_name in sessions:
-            try:
-                await self.label_session(project, session_name, labels)
-                success.append(session_name)
-            except (ValueError, TimeoutError) as e:
-                failed.append({"session": session_name, "error": str(e)})
-
+        results = await asyncio.gather(
+            *(self.label_session(project, session_name, labels) for session_name in sessions),
+            return_exceptions=True,
+        )
+        success, failed = self._partition_results(sessions, results)
         return {"labeled": success, "failed": failed, "labels": labels}
 
     async def bulk_unlabel_sessions(
@@ -815,25 +1004,21 @@ class ACPClient:
     ) -> dict[str, Any]:
         """Remove labels from multiple sessions (max 3)."""
         self._validate_bulk_operation(sessions, "unlabel")
+        self._validate_bulk_targets(project, sessions)
 
         if dry_run:
             return {
                 "dry_run": True,
                 "sessions": sessions,
                 "label_keys": label_keys,
-                "message": f"Would remove {len(label_keys)} label(s) from {len(sessions)} session(s)",
+                "message": _label_dry_run_message("remove", len(label_keys), len(sessions)),
             }
 
-        success: list[str] = []
-        failed: list[dict[str, str]] = []
-
-        for session_name in sessions:
-            try:
-                await self.unlabel_session(project, session_name, label_keys)
-                success.append(session_name)
-            except (ValueError, TimeoutError) as e:
-                failed.append({"session": session_name, "error": str(e)})
-
+        results = await asyncio.gather(
+            *(self.unlabel_session(project, session_name, label_keys) for session_name in sessions),
+            return_exceptions=True,
+        )
+        success, failed = self._partition_results(sessions, results)
         return {"unlabeled": success, "failed": failed, "label_keys": label_keys}
 
     async def bulk_delete_sessions_by_label(
@@ -858,19 +1043,17 @@ class ACPClient:
 
     def list_clusters(self) -> dict[str, Any]:
         """List configured clusters."""
-        clusters = []
         default_cluster = self.clusters_config.default_cluster
-
-        for name, cluster in self.clusters_config.clusters.items():
-            clusters.append(
-                {
-                    "name": name,
-                    "server": cluster.server,
-                    "description": cluster.description or "",
-                    "default_project": cluster.default_project,
-                    "is_default": name == default_cluster,
-                }
-            )
+        clusters = [
+            {
+                "name": name,
+                "server": cluster.server,
+                "description": cluster.description or "",
+                "default_project": cluster.default_project,
+                "is_default": name == default_cluster,
+            }
+            for name, cluster in self.clusters_config.clusters.items()
+        ]
 
         return {"clusters": clusters, "default_cluster": default_cluster}
 
@@ -878,7 +1061,7 @@ class ACPClient:
         """Get current configuration status."""
         try:
             cluster_config = self._get_cluster_config()
-            cluster_name = self.clusters_config.default_cluster or "unknown"
+            cluster_name = cluster_config["name"]
 
             try:
                 self._get_token(cluster_config)
@@ -913,6 +1096,7 @@ class ACPClient:
 
         previous_cluster = self.clusters_config.default_cluster
         self.clusters_config.default_cluster = cluster
+        self._refresh_default_project()
 
         return {
             "switched": True,
@@ -936,10 +1120,10 @@ class ACPClient:
 
         if token:
             cluster_obj.token = token
-
-        # Verify the token works by calling whoami
-        previous = self.clusters_config.default_cluster
-        self.clusters_config.default_cluster = cluster
+            self._cluster_cache.pop(cluster, None)
+            stale_client = self._http_clients.pop(cluster, None)
+            if stale_client is not None:
+                await stale_client.aclose()
 
         try:
             cluster_config = self._get_cluster_config(cluster)
@@ -952,12 +1136,19 @@ class ACPClient:
             }
         except ValueError as e:
             return {"authenticated": False, "cluster": cluster, "message": str(e)}
-        finally:
-            self.clusters_config.default_cluster = previous
 
     # ── Cleanup ──────────────────────────────────────────────────────────
 
     async def close(self) -> None:
-        """Close the HTTP client."""
-        if self._http_client and not self._http_client.is_closed:
-            await self._http_client.aclose()
+        """Close all pooled HTTP clients."""
+        clients = list(self._http_clients.values())
+        self._http_clients.clear()
+        for client in clients:
+            if not client.is_closed:
+                await client.aclose()
+
+    async def __aenter__(self) -> "ACPClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
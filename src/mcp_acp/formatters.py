@@ -1,119 +1,161 @@
 """Output formatters for MCP responses."""
 
 import json
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Final
 
+try:
+    import orjson
 
-def format_result(result: dict[str, Any]) -> str:
-    """Format a simple result dictionary."""
+    def _dumps(obj: Any, indent: bool = False) -> str:
+        """Serialize to JSON text with orjson."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+
+    def _dumps(obj: Any, indent: bool = False) -> str:
+        """Serialize to JSON text with the standard library, matching orjson's output."""
+        if indent:
+            return json.dumps(obj, indent=2, ensure_ascii=False)
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+# Shared read-only default for missing nested mappings
+_EMPTY: MappingProxyType[str, Any] = MappingProxyType({})
+
+# Fixed output strings shared across formatters
+_DRY_RUN_BANNER: Final = "DRY RUN MODE - No changes made\n\n"
+_NO_CLUSTERS_MSG: Final = "No clusters configured. Create ~/.config/acp/clusters.yaml to add clusters."
+_NO_LOGS: Final = "(no logs available)"
+_NO_TRANSCRIPT: Final = "(no transcript available)"
+
+
+def _truncate(text: str, limit: int = 50) -> str:
+    """Shorten text to limit characters, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
+
+def format_result(result: dict[str, Any], compact: bool = False) -> str:
+    """Format a simple result dictionary. compact=True emits single-line JSON."""
+    indent = not compact
     if result.get("dry_run"):
-        output = "DRY RUN MODE - No changes made\n\n"
+        output = _DRY_RUN_BANNER
         output += result.get("message", "")
         if "session_info" in result:
-            output += f"\n\nSession Info:\n{json.dumps(result['session_info'], indent=2)}"
+            output += f"\n\nSession Info:\n{_dumps(result['session_info'], indent=indent)}"
         if "patch" in result:
-            output += f"\n\nPatch:\n{json.dumps(result['patch'], indent=2)}"
+            output += f"\n\nPatch:\n{_dumps(result['patch'], indent=indent)}"
         if "current" in result:
-            output += f"\n\nCurrent:\n{json.dumps(result['current'], indent=2)}"
+            output += f"\n\nCurrent:\n{_dumps(result['current'], indent=indent)}"
         return output
 
-    return result.get("message", json.dumps(result, indent=2))
+    return result.get("message", _dumps(result, indent=indent))
 
 
 def format_sessions_list(result: dict[str, Any]) -> str:
     """Format sessions list with filtering info."""
-    output = f"Found {result['total']} session(s)"
+    parts = [f"Found {result['total']} session(s)"]
 
     filters = result.get("filters_applied", {})
     labels_filter = result.get("labels_filter")
 
     if filters:
-        output += f"\nFilters applied: {json.dumps(filters)}"
+        parts.append(f"\nFilters applied: {_dumps(filters)}")
     if labels_filter:
-        output += f"\nLabel filter: {json.dumps(labels_filter)}"
+        parts.append(f"\nLabel filter: {_dumps(labels_filter)}")
 
-    output += "\n\nSessions:\n"
+    sessions = result["sessions"]
+    if not sessions:
+        return "".join(parts)
 
-    for session in result["sessions"]:
+    parts.append("\n\nSessions:\n")
+
+    for session in sessions:
         # Handle both public-api DTO format and raw K8s format
-        session_id = session.get("id") or session.get("metadata", {}).get("name", "unknown")
-        status = session.get("status") or session.get("status", {}).get("phase", "unknown")
-        created = session.get("createdAt") or session.get("metadata", {}).get("creationTimestamp", "unknown")
+        meta = session.get("metadata") or _EMPTY
+        raw_status = session.get("status")
+        session_id = session.get("id") or meta.get("name", "unknown")
+        status = raw_status.get("phase", "unknown") if isinstance(raw_status, dict) else (raw_status or "unknown")
+        created = session.get("createdAt") or meta.get("creationTimestamp", "unknown")
         task = session.get("task", "")
 
-        output += f"\n- {session_id}"
-        output += f"\n  Status: {status}"
-        output += f"\n  Created: {created}"
+        parts.append(f"\n- {session_id}\n  Status: {status}\n  Created: {created}")
         if task:
-            output += f"\n  Task: {task[:50]}{'...' if len(task) > 50 else ''}"
-        output += "\n"
+            parts.append(f"\n  Task: {_truncate(task)}")
+        parts.append("\n")
 
-    return output
+    return "".join(parts)
+
+
+_SUCCESS_KEY_MAP: dict[str, str] = {
+    "delete": "deleted",
+    "stop": "stopped",
+    "restart": "restarted",
+    "label": "labeled",
+    "unlabel": "unlabeled",
+}
 
 
 def format_bulk_result(result: dict[str, Any], operation: str) -> str:
     """Format bulk operation results."""
+    labels_filter = result.get("labels_filter")
+    message = result.get("message")
+
     if result.get("dry_run"):
-        output = "DRY RUN MODE - No changes made\n\n"
+        parts = [_DRY_RUN_BANNER]
 
         dry_run_info = result.get("dry_run_info", {})
         would_execute = dry_run_info.get("would_execute", [])
         skipped = dry_run_info.get("skipped", [])
 
         if would_execute:
-            output += f"Would {operation} {len(would_execute)} session(s):\n"
+            parts.append(f"Would {operation} {len(would_execute)} session(s):\n")
             for item in would_execute:
-                output += f"  - {item['session']}\n"
-                if item.get("info") and "status" in item["info"]:
-                    output += f"    Status: {item['info']['status']}\n"
+                parts.append(f"  - {item['session']}\n")
+                info = item.get("info")
+                status = info.get("status") if info else None
+                if status is not None:
+                    parts.append(f"    Status: {status}\n")
 
         if skipped:
-            output += f"\nSkipped ({len(skipped)} session(s)):\n"
+            parts.append(f"\nSkipped ({len(skipped)} session(s)):\n")
             for item in skipped:
-                output += f"  - {item['session']}"
-                if "reason" in item:
-                    output += f": {item['reason']}"
-                output += "\n"
+                reason = item.get("reason")
+                if reason is None:
+                    parts.append(f"  - {item['session']}\n")
+                else:
+                    parts.append(f"  - {item['session']}: {reason}\n")
 
         # Handle label/unlabel dry run (different format)
-        if result.get("message") and not would_execute and not skipped:
-            output += result["message"] + "\n"
+        if message and not would_execute and not skipped:
+            parts.append(message + "\n")
 
-        if result.get("labels_filter"):
-            output += f"\nLabel filter: {json.dumps(result['labels_filter'])}\n"
+        if labels_filter:
+            parts.append(f"\nLabel filter: {_dumps(labels_filter)}\n")
 
-        return output
+        return "".join(parts)
 
-    success_key_map = {
-        "delete": "deleted",
-        "stop": "stopped",
-        "restart": "restarted",
-        "label": "labeled",
-        "unlabel": "unlabeled",
-    }
-    success_key = success_key_map.get(operation, operation)
+    success_key = _SUCCESS_KEY_MAP.get(operation, operation)
     success = result.get(success_key, [])
     failed = result.get("failed", [])
 
-    output = f"Successfully {success_key} {len(success)} session(s)"
+    if not success and message:
+        return message
+
+    parts = [f"Successfully {success_key} {len(success)} session(s)"]
 
     if success:
-        output += ":\n"
-        for session in success:
-            output += f"  - {session}\n"
+        parts.append(":\n")
+        parts.extend(f"  - {session}\n" for session in success)
 
     if failed:
-        output += f"\nFailed ({len(failed)} session(s)):\n"
-        for item in failed:
-            output += f"  - {item['session']}: {item['error']}\n"
-
-    if result.get("labels_filter"):
-        output += f"\nLabel filter: {json.dumps(result['labels_filter'])}\n"
+        parts.append(f"\nFailed ({len(failed)} session(s)):\n")
+        parts.extend(f"  - {item['session']}: {item['error']}\n" for item in failed)
 
-    if not success and result.get("message"):
-        output = result["message"]
+    if labels_filter:
+        parts.append(f"\nLabel filter: {_dumps(labels_filter)}\n")
 
-    return output
+    return "".join(parts)
 
 
 def format_clusters(result: dict[str, Any]) -> str:
@@ -122,27 +164,26 @@ def format_clusters(result: dict[str, Any]) -> str:
     default = result.get("default_cluster")
 
     if not clusters:
-        return "No clusters configured. Create ~/.config/acp/clusters.yaml to add clusters."
+        return _NO_CLUSTERS_MSG
 
-    output = f"Configured Clusters (default: {default or 'none'}):\n\n"
+    parts = [f"Configured Clusters (default: {default or 'none'}):\n\n"]
 
     for cluster in clusters:
         name = cluster["name"]
         is_default = cluster.get("is_default", False)
         marker = " [DEFAULT]" if is_default else ""
 
-        output += f"- {name}{marker}\n"
-        output += f"  Server: {cluster.get('server', 'N/A')}\n"
+        parts.append(f"- {name}{marker}\n  Server: {cluster.get('server', 'N/A')}\n")
 
         if cluster.get("description"):
-            output += f"  Description: {cluster['description']}\n"
+            parts.append(f"  Description: {cluster['description']}\n")
 
         if cluster.get("default_project"):
-            output += f"  Default Project: {cluster['default_project']}\n"
+            parts.append(f"  Default Project: {cluster['default_project']}\n")
 
-        output += "\n"
+        parts.append("\n")
 
-    return output
+    return "".join(parts)
 
 
 def format_whoami(result: dict[str, Any]) -> str:
@@ -165,13 +206,13 @@ def format_whoami(result: dict[str, Any]) -> str:
     return output
 
 
-def format_session_created(result: dict[str, Any]) -> str:
-    """Format session creation result with follow-up commands."""
+def format_session_created(result: dict[str, Any], compact: bool = False) -> str:
+    """Format session creation result with follow-up commands. compact=True emits single-line JSON."""
     if result.get("dry_run"):
-        output = "DRY RUN MODE - No changes made\n\n"
+        output = _DRY_RUN_BANNER
         output += result.get("message", "")
         if "manifest" in result:
-            output += f"\n\nManifest:\n{json.dumps(result['manifest'], indent=2)}"
+            output += f"\n\nManifest:\n{_dumps(result['manifest'], indent=not compact)}"
         return output
 
     if not result.get("created"):
@@ -205,59 +246,76 @@ def format_logs(result: dict[str, Any]) -> str:
     logs = result.get("logs", "")
 
     output = f"Logs for session '{session}' (tail: {tail_lines}):\n\n"
-    output += logs if logs else "(no logs available)"
+    output += logs if logs else _NO_LOGS
     return output
 
 
-def format_transcript(result: dict[str, Any]) -> str:
-    """Format session transcript output."""
+def format_transcript(result: dict[str, Any], compact: bool = False) -> str:
+    """Format session transcript output. compact=True emits single-line JSON."""
     session = result.get("session", "unknown")
     fmt = result.get("format", "json")
 
     output = f"Transcript for session '{session}' (format: {fmt}):\n\n"
 
     if fmt == "markdown":
-        output += result.get("transcript", result.get("text", "(no transcript available)"))
+        output += result.get("transcript", result.get("text", _NO_TRANSCRIPT))
     else:
-        # JSON format — pretty-print the transcript data
+        # JSON format — pretty-print the transcript data unless it is already serialized
         transcript_data = result.get("messages", result.get("transcript", []))
-        if transcript_data:
-            output += json.dumps(transcript_data, indent=2)
+        if isinstance(transcript_data, str) and transcript_data:
+            output += transcript_data
+        elif transcript_data:
+            output += _dumps(transcript_data, indent=not compact)
         else:
-            output += "(no transcript available)"
+            output += _NO_TRANSCRIPT
 
     return output
 
 
+_METRIC_LABELS: dict[str, str] = {
+    "total_tokens": "Total Tokens",
+    "input_tokens": "Input Tokens",
+    "output_tokens": "Output Tokens",
+    "duration_seconds": "Duration Seconds",
+    "tool_calls": "Tool Calls",
+    "message_count": "Message Count",
+    "cost": "Cost",
+}
+
+
 def format_metrics(result: dict[str, Any]) -> str:
     """Format session metrics output."""
     session = result.get("session", "unknown")
 
-    output = f"Metrics for session '{session}':\n\n"
+    parts = [f"Metrics for session '{session}':\n\n"]
 
     for key, value in result.items():
         if key == "session":
             continue
-        label = key.replace("_", " ").title()
-        output += f"  {label}: {value}\n"
+        label = _METRIC_LABELS.get(key) or key.replace("_", " ").title()
+        parts.append(f"  {label}: {value}\n")
+
+    return "".join(parts)
 
-    return output
+
+_LABEL_RESULT_KINDS: tuple[tuple[str, str, str], ...] = (
+    ("labeled", "label", "Labels updated"),
+    ("unlabeled", "unlabel", "Labels removed"),
+)
 
 
 def format_labels(result: dict[str, Any]) -> str:
     """Format label operation results."""
-    if result.get("labeled"):
-        if isinstance(result["labeled"], bool):
-            return result.get("message", "Labels updated")
-        # bulk label result
-        return format_bulk_result(result, "label")
-
-    if result.get("unlabeled"):
-        if isinstance(result["unlabeled"], bool):
-            return result.get("message", "Labels removed")
-        return format_bulk_result(result, "unlabel")
-
-    return result.get("message", json.dumps(result, indent=2))
+    for key, operation, default_message in _LABEL_RESULT_KINDS:
+        value = result.get(key)
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            return result.get("message", default_message)
+        # bulk result, including one where every session failed
+        return format_bulk_result(result, operation)
+
+    return result.get("message", _dumps(result, indent=True))
 
 
 def format_login(result: dict[str, Any]) -> str:
@@ -1,8 +1,12 @@
 """MCP server for Ambient Code Platform management."""
 
 import asyncio
+import contextlib
+import logging
 import os
-from typing import Any
+from collections.abc import Awaitable, Callable
+from time import perf_counter_ns
+from typing import Any, Final
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -51,640 +55,770 @@ def get_client() -> ACPClient:
 
 
 # ── Shared schema fragments ─────────────────────────────────────────────
+# Shared by reference across tools, so never mutate them. They stay plain
+# dicts: pydantic cannot serialize MappingProxyType inside Tool.inputSchema.
 
-_PROJECT = {"type": "string", "description": "Project/namespace name (uses default if not provided)"}
-_SESSION = {"type": "string", "description": "Session ID"}
-_DRY_RUN = {"type": "boolean", "description": "Preview without executing (default: false)", "default": False}
-_CONFIRM = {"type": "boolean", "description": "Required for destructive operations (default: false)", "default": False}
-_SESSIONS_ARRAY = {"type": "array", "items": {"type": "string"}, "description": "List of session names (max 3)"}
-_LABELS_OBJECT = {
+_PROJECT: Final[dict[str, Any]] = {
+    "type": "string",
+    "description": "Project/namespace name (uses default if not provided)",
+}
+_SESSION: Final[dict[str, Any]] = {"type": "string", "description": "Session ID"}
+_DRY_RUN: Final[dict[str, Any]] = {
+    "type": "boolean",
+    "description": "Preview without executing (default: false)",
+    "default": False,
+}
+_CONFIRM: Final[dict[str, Any]] = {
+    "type": "boolean",
+    "description": "Required for destructive operations (default: false)",
+    "default": False,
+}
+_SESSIONS_ARRAY: Final[dict[str, Any]] = {
+    "type": "array",
+    "items": {"type": "string"},
+    "description": "List of session names (max 3)",
+}
+_LABELS_OBJECT: Final[dict[str, Any]] = {
     "type": "object",
     "additionalProperties": {"type": "string"},
     "description": 'Labels as key-value pairs (e.g., {"env": "test", "team": "qa"})',
 }
-_LABEL_KEYS_ARRAY = {"type": "array", "items": {"type": "string"}, "description": "List of label keys to remove"}
+_LABEL_KEYS_ARRAY: Final[dict[str, Any]] = {
+    "type": "array",
+    "items": {"type": "string"},
+    "description": "List of label keys to remove",
+}
 
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available ACP tools for managing AgenticSession resources."""
-    return [
-        # ── Session Management ───────────────────────────────────────────
-        Tool(
-            name="acp_list_sessions",
-            description="List and filter AgenticSessions in a project. Filter by status (running/stopped/failed), age. Sort and limit results.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": _PROJECT,
-                    "status": {
-                        "type": "string",
-                        "description": "Filter by status",
-                        "enum": ["running", "stopped", "creating", "failed"],
-                    },
-                    "older_than": {"type": "string", "description": "Filter by age (e.g., '7d', '24h', '30m')"},
-                    "sort_by": {"type": "string", "description": "Sort field", "enum": ["created", "stopped", "name"]},
-                    "limit": {"type": "integer", "description": "Maximum number of results", "minimum": 1},
+# ── Tool definitions ────────────────────────────────────────────────────
+# Built once at import; the schemas are static.
+
+_TOOLS: list[Tool] = [
+    # ── Session Management ───────────────────────────────────────────
+    Tool(
+        name="acp_list_sessions",
+        description="List and filter AgenticSessions in a project. Filter by status (running/stopped/failed), age. Sort and limit results.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": _PROJECT,
+                "status": {
+                    "type": "string",
+                    "description": "Filter by status",
+                    "enum": ["running", "stopped", "creating", "failed"],
                 },
-                "required": [],
-            },
-        ),
-        Tool(
-            name="acp_get_session",
-            description="Get details of a specific session by ID.",
-            inputSchema={
-                "type": "object",
-                "properties": {"project": _PROJECT, "session": _SESSION},
-                "required": ["session"],
+                "older_than": {"type": "string", "description": "Filter by age (e.g., '7d', '24h', '30m')"},
+                "sort_by": {"type": "string", "description": "Sort field", "enum": ["created", "stopped", "name"]},
+                "limit": {"type": "integer", "description": "Maximum number of results", "minimum": 1},
             },
-        ),
-        Tool(
-            name="acp_create_session",
-            description="Create an ACP AgenticSession with a custom prompt. Supports dry-run mode.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": _PROJECT,
-                    "initial_prompt": {
-                        "type": "string",
-                        "description": "The prompt/instructions to send to the session",
-                    },
-                    "display_name": {"type": "string", "description": "Human-readable display name"},
-                    "repos": {"type": "array", "items": {"type": "string"}, "description": "Repository URLs to clone"},
-                    "interactive": {
-                        "type": "boolean",
-                        "description": "Create an interactive session",
-                        "default": False,
-                    },
-                    "model": {"type": "string", "description": "LLM model to use", "default": "claude-sonnet-4"},
-                    "timeout": {"type": "integer", "description": "Timeout in seconds", "default": 900, "minimum": 60},
-                    "dry_run": _DRY_RUN,
+            "required": [],
+        },
+    ),
+    Tool(
+        name="acp_get_session",
+        description="Get details of a specific session by ID.",
+        inputSchema={
+            "type": "object",
+            "properties": {"project": _PROJECT, "session": _SESSION},
+            "required": ["session"],
+        },
+    ),
+    Tool(
+        name="acp_create_session",
+        description="Create an ACP AgenticSession with a custom prompt. Supports dry-run mode.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": _PROJECT,
+                "initial_prompt": {
+                    "type": "string",
+                    "description": "The prompt/instructions to send to the session",
                 },
-                "required": ["initial_prompt"],
-            },
-        ),
-        Tool(
-            name="acp_create_session_from_template",
-            description="Create a session from a predefined template (triage/bugfix/feature/exploration). Each template has optimized settings.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": _PROJECT,
-                    "template": {
-                        "type": "string",
-                        "description": "Template name",
-                        "enum": ["triage", "bugfix", "feature", "exploration"],
-                    },
-                    "display_name": {"type": "string", "description": "Display name for the session"},
-                    "repos": {"type": "array", "items": {"type": "string"}, "description": "Repository URLs to clone"},
-                    "dry_run": _DRY_RUN,
+                "display_name": {"type": "string", "description": "Human-readable display name"},
+                "repos": {"type": "array", "items": {"type": "string"}, "description": "Repository URLs to clone"},
+                "interactive": {
+                    "type": "boolean",
+                    "description": "Create an interactive session",
+                    "default": False,
                 },
-                "required": ["template", "display_name"],
-            },
-        ),
-        Tool(
-            name="acp_delete_session",
-            description="Delete an AgenticSession. Supports dry-run mode.",
-            inputSchema={
-                "type": "object",
-                "properties": {"project": _PROJECT, "session": _SESSION, "dry_run": _DRY_RUN},
-                "required": ["session"],
+                "model": {"type": "string", "description": "LLM model to use", "default": "claude-sonnet-4"},
+                "timeout": {"type": "integer", "description": "Timeout in seconds", "default": 900, "minimum": 60},
+                "dry_run": _DRY_RUN,
             },
-        ),
-        Tool(
-            name="acp_restart_session",
-            description="Restart a stopped session. Supports dry-run mode.",
-            inputSchema={
-                "type": "object",
-                "properties": {"project": _PROJECT, "session": _SESSION, "dry_run": _DRY_RUN},
-                "required": ["session"],
-            },
-        ),
-        Tool(
-            name="acp_clone_session",
-            description="Clone an existing session's configuration into a new session.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": _PROJECT,
-                    "source_session": {"type": "string", "description": "Session ID to clone from"},
-                    "new_display_name": {"type": "string", "description": "Display name for the cloned session"},
-                    "dry_run": _DRY_RUN,
+            "required": ["initial_prompt"],
+        },
+    ),
+    Tool(
+        name="acp_create_session_from_template",
+        description="Create a session from a predefined template (triage/bugfix/feature/exploration). Each template has optimized settings.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": _PROJECT,
+                "template": {
+                    "type": "string",
+                    "description": "Template name",
+                    "enum": ["triage", "bugfix", "feature", "exploration"],
                 },
-                "required": ["source_session", "new_display_name"],
+                "display_name": {"type": "string", "description": "Display name for the session"},
+                "repos": {"type": "array", "items": {"type": "string"}, "description": "Repository URLs to clone"},
+                "dry_run": _DRY_RUN,
             },
-        ),
-        Tool(
-            name="acp_update_session",
-            description="Update session metadata (display name, timeout). Supports dry-run mode.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": _PROJECT,
-                    "session": _SESSION,
-                    "display_name": {"type": "string", "description": "New display name"},
-                    "timeout": {"type": "integer", "description": "New timeout in seconds", "minimum": 60},
-                    "dry_run": _DRY_RUN,
-                },
-                "required": ["session"],
+            "required": ["template", "display_name"],
+        },
+    ),
+    Tool(
+        name="acp_delete_session",
+        description="Delete an AgenticSession. Supports dry-run mode.",
+        inputSchema={
+            "type": "object",
+            "properties": {"project": _PROJECT, "session": _SESSION, "dry_run": _DRY_RUN},
+            "required": ["session"],
+        },
+    ),
+    Tool(
+        name="acp_restart_session",
+        description="Restart a stopped session. Supports dry-run mode.",
+        inputSchema={
+            "type": "object",
+            "properties": {"project": _PROJECT, "session": _SESSION, "dry_run": _DRY_RUN},
+            "required": ["session"],
+        },
+    ),
+    Tool(
+        name="acp_clone_session",
+        description="Clone an existing session's configuration into a new session.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": _PROJECT,
+                "source_session": {"type": "string", "description": "Session ID to clone from"},
+                "new_display_name": {"type": "string", "description": "Display name for the cloned session"},
+                "dry_run": _DRY_RUN,
             },
-        ),
-        # ── Observability ────────────────────────────────────────────────
-        Tool(
-            name="acp_get_session_logs",
-            description="Retrieve container logs for a session. Useful for debugging.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": _PROJECT,
-                    "session": _SESSION,
-                    "container": {"type": "string", "description": "Container name (optional)"},
-                    "tail_lines": {
-                        "type": "integer",
-                        "description": "Number of log lines (default: 1000, max: 10000)",
-                        "default": 1000,
-                        "maximum": 10000,
-                    },
-                },
-                "required": ["session"],
+            "required": ["source_session", "new_display_name"],
+        },
+    ),
+    Tool(
+        name="acp_update_session",
+        description="Update session metadata (display name, timeout). Supports dry-run mode.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": _PROJECT,
+                "session": _SESSION,
+                "display_name": {"type": "string", "description": "New display name"},
+                "timeout": {"type": "integer", "description": "New timeout in seconds", "minimum": 60},
+                "dry_run": _DRY_RUN,
             },
-        ),
-        Tool(
-            name="acp_get_session_transcript",
-            description="Retrieve conversation history for a session in JSON or Markdown format.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": _PROJECT,
-                    "session": _SESSION,
-                    "format": {
-                        "type": "string",
-                        "description": "Output format",
-                        "enum": ["json", "markdown"],
-                        "default": "json",
-                    },
+            "required": ["session"],
+        },
+    ),
+    # ── Observability ────────────────────────────────────────────────
+    Tool(
+        name="acp_get_session_logs",
+        description="Retrieve container logs for a session. Useful for debugging.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": _PROJECT,
+                "session": _SESSION,
+                "container": {"type": "string", "description": "Container name (optional)"},
+                "tail_lines": {
+                    "type": "integer",
+                    "description": "Number of log lines (default: 1000, max: 10000)",
+                    "default": 1000,
+                    "maximum": 10000,
                 },
-                "required": ["session"],
-            },
-        ),
-        Tool(
-            name="acp_get_session_metrics",
-            description="Get usage statistics for a session (tokens, duration, tool calls).",
-            inputSchema={
-                "type": "object",
-                "properties": {"project": _PROJECT, "session": _SESSION},
-                "required": ["session"],
             },
-        ),
-        # ── Labels ───────────────────────────────────────────────────────
-        Tool(
-            name="acp_label_resource",
-            description="Add labels to a session. Labels are key-value pairs for organizing and filtering.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": _PROJECT,
-                    "name": {"type": "string", "description": "Session name"},
-                    "resource_type": {
-                        "type": "string",
-                        "description": "Resource type",
-                        "enum": ["agenticsession"],
-                        "default": "agenticsession",
-                    },
-                    "labels": _LABELS_OBJECT,
+            "required": ["session"],
+        },
+    ),
+    Tool(
+        name="acp_get_session_transcript",
+        description="Retrieve conversation history for a session in JSON or Markdown format.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": _PROJECT,
+                "session": _SESSION,
+                "format": {
+                    "type": "string",
+                    "description": "Output format",
+                    "enum": ["json", "markdown"],
+                    "default": "json",
                 },
-                "required": ["name", "labels"],
             },
-        ),
-        Tool(
-            name="acp_unlabel_resource",
-            description="Remove labels from a session by key.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": _PROJECT,
-                    "name": {"type": "string", "description": "Session name"},
-                    "resource_type": {
-                        "type": "string",
-                        "description": "Resource type",
-                        "enum": ["agenticsession"],
-                        "default": "agenticsession",
-                    },
-                    "label_keys": _LABEL_KEYS_ARRAY,
+            "required": ["session"],
+        },
+    ),
+    Tool(
+        name="acp_get_session_metrics",
+        description="Get usage statistics for a session (tokens, duration, tool calls).",
+        inputSchema={
+            "type": "object",
+            "properties": {"project": _PROJECT, "session": _SESSION},
+            "required": ["session"],
+        },
+    ),
+    # ── Labels ───────────────────────────────────────────────────────
+    Tool(
+        name="acp_label_resource",
+        description="Add labels to a session. Labels are key-value pairs for organizing and filtering.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": _PROJECT,
+                "name": {"type": "string", "description": "Session name"},
+                "resource_type": {
+                    "type": "string",
+                    "description": "Resource type",
+                    "enum": ["agenticsession"],
+                    "default": "agenticsession",
                 },
-                "required": ["name", "label_keys"],
+                "labels": _LABELS_OBJECT,
             },
-        ),
-        Tool(
-            name="acp_list_sessions_by_label",
-            description="List sessions matching label selectors.",
-            inputSchema={
-                "type": "object",
-                "properties": {"project": _PROJECT, "labels": _LABELS_OBJECT},
-                "required": ["labels"],
-            },
-        ),
-        Tool(
-            name="acp_bulk_label_resources",
-            description="Add labels to multiple sessions (max 3). DESTRUCTIVE: requires confirm=true.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": _PROJECT,
-                    "sessions": _SESSIONS_ARRAY,
-                    "labels": _LABELS_OBJECT,
-                    "confirm": _CONFIRM,
-                    "dry_run": _DRY_RUN,
+            "required": ["name", "labels"],
+        },
+    ),
+    Tool(
+        name="acp_unlabel_resource",
+        description="Remove labels from a session by key.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": _PROJECT,
+                "name": {"type": "string", "description": "Session name"},
+                "resource_type": {
+                    "type": "string",
+                    "description": "Resource type",
+                    "enum": ["agenticsession"],
+                    "default": "agenticsession",
                 },
-                "required": ["sessions", "labels"],
+                "label_keys": _LABEL_KEYS_ARRAY,
             },
-        ),
-        Tool(
-            name="acp_bulk_unlabel_resources",
-            description="Remove labels from multiple sessions (max 3). DESTRUCTIVE: requires confirm=true.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": _PROJECT,
-                    "sessions": _SESSIONS_ARRAY,
-                    "label_keys": _LABEL_KEYS_ARRAY,
-                    "confirm": _CONFIRM,
-                    "dry_run": _DRY_RUN,
-                },
-                "required": ["sessions", "label_keys"],
+            "required": ["name", "label_keys"],
+        },
+    ),
+    Tool(
+        name="acp_list_sessions_by_label",
+        description="List sessions matching label selectors.",
+        inputSchema={
+            "type": "object",
+            "properties": {"project": _PROJECT, "labels": _LABELS_OBJECT},
+            "required": ["labels"],
+        },
+    ),
+    Tool(
+        name="acp_bulk_label_resources",
+        description="Add labels to multiple sessions (max 3). DESTRUCTIVE: requires confirm=true.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": _PROJECT,
+                "sessions": _SESSIONS_ARRAY,
+                "labels": _LABELS_OBJECT,
+                "confirm": _CONFIRM,
+                "dry_run": _DRY_RUN,
             },
-        ),
-        # ── Bulk Operations ──────────────────────────────────────────────
-        Tool(
-            name="acp_bulk_delete_sessions",
-            description="Delete multiple sessions (max 3). DESTRUCTIVE: requires confirm=true. Use dry_run=true first!",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": _PROJECT,
-                    "sessions": _SESSIONS_ARRAY,
-                    "confirm": _CONFIRM,
-                    "dry_run": _DRY_RUN,
-                },
-                "required": ["sessions"],
-            },
-        ),
-        Tool(
-            name="acp_bulk_stop_sessions",
-            description="Stop multiple running sessions (max 3). DESTRUCTIVE: requires confirm=true.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": _PROJECT,
-                    "sessions": _SESSIONS_ARRAY,
-                    "confirm": _CONFIRM,
-                    "dry_run": _DRY_RUN,
-                },
-                "required": ["sessions"],
-            },
-        ),
-        Tool(
-            name="acp_bulk_restart_sessions",
-            description="Restart multiple stopped sessions (max 3). Requires confirm=true.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project": _PROJECT,
-                    "sessions": _SESSIONS_ARRAY,
-                    "confirm": _CONFIRM,
-                    "dry_run": _DRY_RUN,
-                },
-                "required": ["sessions"],
-            },
-        ),
-        Tool(
-            name="acp_bulk_delete_sessions_by_label",
-            description="Delete sessions matching label selectors (max 3 matches). DESTRUCTIVE: requires confirm=true.",
-            inputSchema={
-                "type": "object",
-                "properties": {"project": _PROJECT, "labels": _LABELS_OBJECT, "confirm": _CONFIRM, "dry_run": _DRY_RUN},
-                "required": ["labels"],
+            "required": ["sessions", "labels"],
+        },
+    ),
+    Tool(
+        name="acp_bulk_unlabel_resources",
+        description="Remove labels from multiple sessions (max 3). DESTRUCTIVE: requires confirm=true.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": _PROJECT,
+                "sessions": _SESSIONS_ARRAY,
+                "label_keys": _LABEL_KEYS_ARRAY,
+                "confirm": _CONFIRM,
+                "dry_run": _DRY_RUN,
             },
-        ),
-        Tool(
-            name="acp_bulk_stop_sessions_by_label",
-            description="Stop sessions matching label selectors (max 3 matches). DESTRUCTIVE: requires confirm=true.",
-            inputSchema={
-                "type": "object",
-                "properties": {"project": _PROJECT, "labels": _LABELS_OBJECT, "confirm": _CONFIRM, "dry_run": _DRY_RUN},
-                "required": ["labels"],
+            "required": ["sessions", "label_keys"],
+        },
+    ),
+    # ── Bulk Operations ──────────────────────────────────────────────
+    Tool(
+        name="acp_bulk_delete_sessions",
+        description="Delete multiple sessions (max 3). DESTRUCTIVE: requires confirm=true. Use dry_run=true first!",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": _PROJECT,
+                "sessions": _SESSIONS_ARRAY,
+                "confirm": _CONFIRM,
+                "dry_run": _DRY_RUN,
             },
-        ),
-        Tool(
-            name="acp_bulk_restart_sessions_by_label",
-            description="Restart sessions matching label selectors (max 3 matches). Requires confirm=true.",
-            inputSchema={
-                "type": "object",
-                "properties": {"project": _PROJECT, "labels": _LABELS_OBJECT, "confirm": _CONFIRM, "dry_run": _DRY_RUN},
-                "required": ["labels"],
+            "required": ["sessions"],
+        },
+    ),
+    Tool(
+        name="acp_bulk_stop_sessions",
+        description="Stop multiple running sessions (max 3). DESTRUCTIVE: requires confirm=true.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": _PROJECT,
+                "sessions": _SESSIONS_ARRAY,
+                "confirm": _CONFIRM,
+                "dry_run": _DRY_RUN,
             },
-        ),
-        # ── Cluster Management ───────────────────────────────────────────
-        Tool(
-            name="acp_list_clusters",
-            description="List configured cluster aliases from clusters.yaml.",
-            inputSchema={"type": "object", "properties": {}},
-        ),
-        Tool(
-            name="acp_whoami",
-            description="Get current configuration and authentication status.",
-            inputSchema={"type": "object", "properties": {}},
-        ),
-        Tool(
-            name="acp_switch_cluster",
-            description="Switch to a different cluster context.",
-            inputSchema={
-                "type": "object",
-                "properties": {"cluster": {"type": "string", "description": "Cluster alias name"}},
-                "required": ["cluster"],
+            "required": ["sessions"],
+        },
+    ),
+    Tool(
+        name="acp_bulk_restart_sessions",
+        description="Restart multiple stopped sessions (max 3). Requires confirm=true.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project": _PROJECT,
+                "sessions": _SESSIONS_ARRAY,
+                "confirm": _CONFIRM,
+                "dry_run": _DRY_RUN,
             },
-        ),
-        Tool(
-            name="acp_login",
-            description="Authenticate to a cluster with a Bearer token. Sets the token in memory and verifies it works.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "cluster": {"type": "string", "description": "Cluster alias name"},
-                    "token": {"type": "string", "description": "Bearer token for authentication"},
-                },
-                "required": ["cluster"],
+            "required": ["sessions"],
+        },
+    ),
+    Tool(
+        name="acp_bulk_delete_sessions_by_label",
+        description="Delete sessions matching label selectors (max 3 matches). DESTRUCTIVE: requires confirm=true.",
+        inputSchema={
+            "type": "object",
+            "properties": {"project": _PROJECT, "labels": _LABELS_OBJECT, "confirm": _CONFIRM, "dry_run": _DRY_RUN},
+            "required": ["labels"],
+        },
+    ),
+    Tool(
+        name="acp_bulk_stop_sessions_by_label",
+        description="Stop sessions matching label selectors (max 3 matches). DESTRUCTIVE: requires confirm=true.",
+        inputSchema={
+            "type": "object",
+            "properties": {"project": _PROJECT, "labels": _LABELS_OBJECT, "confirm": _CONFIRM, "dry_run": _DRY_RUN},
+            "required": ["labels"],
+        },
+    ),
+    Tool(
+        name="acp_bulk_restart_sessions_by_label",
+        description="Restart sessions matching label selectors (max 3 matches). Requires confirm=true.",
+        inputSchema={
+            "type": "object",
+            "properties": {"project": _PROJECT, "labels": _LABELS_OBJECT, "confirm": _CONFIRM, "dry_run": _DRY_RUN},
+            "required": ["labels"],
+        },
+    ),
+    # ── Cluster Management ───────────────────────────────────────────
+    Tool(
+        name="acp_list_clusters",
+        description="List configured cluster aliases from clusters.yaml.",
+        inputSchema={"type": "object", "properties": {}},
+    ),
+    Tool(
+        name="acp_whoami",
+        description="Get current configuration and authentication status.",
+        inputSchema={"type": "object", "properties": {}},
+    ),
+    Tool(
+        name="acp_switch_cluster",
+        description="Switch to a different cluster context.",
+        inputSchema={
+            "type": "object",
+            "properties": {"cluster": {"type": "string", "description": "Cluster alias name"}},
+            "required": ["cluster"],
+        },
+    ),
+    Tool(
+        name="acp_login",
+        description="Authenticate to a cluster with a Bearer token. Sets the token in memory and verifies it works.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "cluster": {"type": "string", "description": "Cluster alias name"},
+                "token": {"type": "string", "description": "Bearer token for authentication"},
             },
-        ),
-    ]
+            "required": ["cluster"],
+        },
+    ),
+]
+
+
+# Schema defaults per tool, merged under the caller's arguments before dispatch
+_TOOL_DEFAULTS: dict[str, dict[str, Any]] = {
+    tool.name: defaults
+    for tool in _TOOLS
+    if (
+        defaults := {
+            key: prop["default"] for key, prop in tool.inputSchema.get("properties", {}).items() if "default" in prop
+        }
+    )
+}
 
 
-TOOLS_WITHOUT_PROJECT = {
-    "acp_list_clusters",
-    "acp_whoami",
-    "acp_switch_cluster",
-    "acp_login",
-}
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available ACP tools for managing AgenticSession resources."""
+    return _TOOLS
 
-# Tools that require confirm=true for non-dry-run execution
-TOOLS_REQUIRING_CONFIRMATION = {
-    "acp_bulk_delete_sessions",
-    "acp_bulk_stop_sessions",
-    "acp_bulk_restart_sessions",
-    "acp_bulk_delete_sessions_by_label",
-    "acp_bulk_stop_sessions_by_label",
-    "acp_bulk_restart_sessions_by_label",
-    "acp_bulk_label_resources",
-    "acp_bulk_unlabel_resources",
+
+TOOLS_WITHOUT_PROJECT = frozenset(
+    {
+        "acp_list_clusters",
+        "acp_whoami",
+        "acp_switch_cluster",
+        "acp_login",
+    }
+)
+
+# Tools that require confirm=true for non-dry-run execution, with the
+# operation name shown in the confirmation error
+_CONFIRMATION_OPERATIONS: dict[str, str] = {
+    "acp_bulk_delete_sessions": "delete sessions",
+    "acp_bulk_stop_sessions": "stop sessions",
+    "acp_bulk_restart_sessions": "restart sessions",
+    "acp_bulk_delete_sessions_by_label": "delete sessions by label",
+    "acp_bulk_stop_sessions_by_label": "stop sessions by label",
+    "acp_bulk_restart_sessions_by_label": "restart sessions by label",
+    "acp_bulk_label_resources": "label resources",
+    "acp_bulk_unlabel_resources": "unlabel resources",
 }
+TOOLS_REQUIRING_CONFIRMATION = frozenset(_CONFIRMATION_OPERATIONS)
 
 
-@app.call_tool()
-async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
-    """Handle tool calls."""
-    import time
+# ── Tool handlers ───────────────────────────────────────────────────────
+# Each handler calls the client and formats the result; call_tool looks
+# them up by tool name.
 
-    start_time = time.time()
+ToolHandler = Callable[[ACPClient, str, dict[str, Any]], Awaitable[str]]
 
-    safe_args = {k: v for k, v in arguments.items() if k not in ["token", "password", "secret"]}
-    logger.info("tool_call_started", tool=name, arguments=safe_args)
+_HANDLERS: dict[str, ToolHandler] = {}
 
-    client = get_client()
 
-    try:
-        # Auto-fill project from default if not provided
-        if name not in TOOLS_WITHOUT_PROJECT and not arguments.get("project"):
-            cluster_name = client.clusters_config.default_cluster
-            if cluster_name:
-                cluster = client.clusters_config.clusters.get(cluster_name)
-                if cluster and cluster.default_project:
-                    arguments["project"] = cluster.default_project
-                    logger.info("project_autofilled", project=cluster.default_project)
+def _handles(name: str) -> Callable[[ToolHandler], ToolHandler]:
+    """Register a handler for a tool name."""
 
-        # Confirmation enforcement for destructive bulk operations
-        if name in TOOLS_REQUIRING_CONFIRMATION:
-            if not arguments.get("dry_run") and not arguments.get("confirm"):
-                op = name.replace("acp_bulk_", "").replace("_", " ")
-                raise ValueError(f"Bulk {op} requires confirm=true. Use dry_run=true to preview first.")
-
-        # ── Dispatch ─────────────────────────────────────────────────
-        project = arguments.get("project", "")
-
-        # Session management
-        if name == "acp_list_sessions":
-            result = await client.list_sessions(
-                project=project,
-                status=arguments.get("status"),
-                older_than=arguments.get("older_than"),
-                sort_by=arguments.get("sort_by"),
-                limit=arguments.get("limit"),
-            )
-            text = format_sessions_list(result)
-
-        elif name == "acp_get_session":
-            result = await client.get_session(project=project, session=arguments["session"])
-            text = format_result(result)
-
-        elif name == "acp_create_session":
-            result = await client.create_session(
-                project=project,
-                initial_prompt=arguments["initial_prompt"],
-                display_name=arguments.get("display_name"),
-                repos=arguments.get("repos"),
-                interactive=arguments.get("interactive", False),
-                model=arguments.get("model", "claude-sonnet-4"),
-                timeout=arguments.get("timeout", 900),
-                dry_run=arguments.get("dry_run", False),
-            )
-            text = format_session_created(result)
-
-        elif name == "acp_create_session_from_template":
-            result = await client.create_session_from_template(
-                project=project,
-                template=arguments["template"],
-                display_name=arguments["display_name"],
-                repos=arguments.get("repos"),
-                dry_run=arguments.get("dry_run", False),
-            )
-            text = format_session_created(result)
+    def register(handler: ToolHandler) -> ToolHandler:
+        _HANDLERS[name] = handler
+        return handler
 
-        elif name == "acp_delete_session":
-            result = await client.delete_session(
-                project=project, session=arguments["session"], dry_run=arguments.get("dry_run", False)
-            )
-            text = format_result(result)
+    return register
 
-        elif name == "acp_restart_session":
-            result = await client.restart_session(
-                project=project, session=arguments["session"], dry_run=arguments.get("dry_run", False)
-            )
-            text = format_result(result)
-
-        elif name == "acp_clone_session":
-            result = await client.clone_session(
-                project=project,
-                source_session=arguments["source_session"],
-                new_display_name=arguments["new_display_name"],
-                dry_run=arguments.get("dry_run", False),
-            )
-            text = format_session_created(result)
-
-        elif name == "acp_update_session":
-            result = await client.update_session(
-                project=project,
-                session=arguments["session"],
-                display_name=arguments.get("display_name"),
-                timeout=arguments.get("timeout"),
-                dry_run=arguments.get("dry_run", False),
-            )
-            text = format_result(result)
-
-        # Observability
-        elif name == "acp_get_session_logs":
-            result = await client.get_session_logs(
-                project=project,
-                session=arguments["session"],
-                container=arguments.get("container"),
-                tail_lines=arguments.get("tail_lines", 1000),
-            )
-            text = format_logs(result)
 
-        elif name == "acp_get_session_transcript":
-            result = await client.get_session_transcript(
-                project=project,
-                session=arguments["session"],
-                format=arguments.get("format", "json"),
-            )
-            text = format_transcript(result)
+# Session management
 
-        elif name == "acp_get_session_metrics":
-            result = await client.get_session_metrics(project=project, session=arguments["session"])
-            text = format_metrics(result)
 
-        # Labels
-        elif name == "acp_label_resource":
-            result = await client.label_session(project=project, session=arguments["name"], labels=arguments["labels"])
-            text = format_labels(result)
+@_handles("acp_list_sessions")
+async def _list_sessions(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    result = await client.list_sessions(
+        project=project,
+        status=arguments.get("status"),
+        older_than=arguments.get("older_than"),
+        sort_by=arguments.get("sort_by"),
+        limit=arguments.get("limit"),
+    )
+    return format_sessions_list(result)
 
-        elif name == "acp_unlabel_resource":
-            result = await client.unlabel_session(
-                project=project, session=arguments["name"], label_keys=arguments["label_keys"]
-            )
-            text = format_labels(result)
-
-        elif name == "acp_list_sessions_by_label":
-            result = await client.list_sessions_by_label(project=project, labels=arguments["labels"])
-            text = format_sessions_list(result)
-
-        elif name == "acp_bulk_label_resources":
-            result = await client.bulk_label_sessions(
-                project=project,
-                sessions=arguments["sessions"],
-                labels=arguments["labels"],
-                dry_run=arguments.get("dry_run", False),
-            )
-            text = format_labels(result)
-
-        elif name == "acp_bulk_unlabel_resources":
-            result = await client.bulk_unlabel_sessions(
-                project=project,
-                sessions=arguments["sessions"],
-                label_keys=arguments["label_keys"],
-                dry_run=arguments.get("dry_run", False),
-            )
-            text = format_labels(result)
 
-        # Bulk operations (named)
-        elif name == "acp_bulk_delete_sessions":
-            result = await client.bulk_delete_sessions(
-                project=project, sessions=arguments["sessions"], dry_run=arguments.get("dry_run", False)
-            )
-            text = format_bulk_result(result, "delete")
+@_handles("acp_get_session")
+async def _get_session(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    return format_result(await client.get_session(project=project, session=arguments["session"]))
 
-        elif name == "acp_bulk_stop_sessions":
-            result = await client.bulk_stop_sessions(
-                project=project, sessions=arguments["sessions"], dry_run=arguments.get("dry_run", False)
-            )
-            text = format_bulk_result(result, "stop")
 
-        elif name == "acp_bulk_restart_sessions":
-            result = await client.bulk_restart_sessions(
-                project=project, sessions=arguments["sessions"], dry_run=arguments.get("dry_run", False)
-            )
-            text = format_bulk_result(result, "restart")
+@_handles("acp_create_session")
+async def _create_session(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    result = await client.create_session(
+        project=project,
+        initial_prompt=arguments["initial_prompt"],
+        display_name=arguments.get("display_name"),
+        repos=arguments.get("repos"),
+        interactive=arguments["interactive"],
+        model=arguments["model"],
+        timeout=arguments["timeout"],
+        dry_run=arguments["dry_run"],
+    )
+    return format_session_created(result)
 
-        # Bulk operations (by label)
-        elif name == "acp_bulk_delete_sessions_by_label":
-            result = await client.bulk_delete_sessions_by_label(
-                project=project, labels=arguments["labels"], dry_run=arguments.get("dry_run", False)
-            )
-            text = format_bulk_result(result, "delete")
 
-        elif name == "acp_bulk_stop_sessions_by_label":
-            result = await client.bulk_stop_sessions_by_label(
-                project=project, labels=arguments["labels"], dry_run=arguments.get("dry_run", False)
-            )
-            text = format_bulk_result(result, "stop")
+@_handles("acp_create_session_from_template")
+async def _create_session_from_template(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    result = await client.create_session_from_template(
+        project=project,
+        template=arguments["template"],
+        display_name=arguments["display_name"],
+        repos=arguments.get("repos"),
+        dry_run=arguments["dry_run"],
+    )
+    return format_session_created(result)
 
-        elif name == "acp_bulk_restart_sessions_by_label":
-            result = await client.bulk_restart_sessions_by_label(
-                project=project, labels=arguments["labels"], dry_run=arguments.get("dry_run", False)
-            )
-            text = format_bulk_result(result, "restart")
 
-        # Cluster management
-        elif name == "acp_list_clusters":
-            result = client.list_clusters()
-            text = format_clusters(result)
+@_handles("acp_delete_session")
+async def _delete_session(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    result = await client.delete_session(project=project, session=arguments["session"], dry_run=arguments["dry_run"])
+    return format_result(result)
 
-        elif name == "acp_whoami":
-            result = await client.whoami()
-            text = format_whoami(result)
 
-        elif name == "acp_switch_cluster":
-            result = await client.switch_cluster(arguments["cluster"])
-            text = format_result(result)
+@_handles("acp_restart_session")
+async def _restart_session(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    result = await client.restart_session(project=project, session=arguments["session"], dry_run=arguments["dry_run"])
+    return format_result(result)
 
-        elif name == "acp_login":
-            result = await client.login(cluster=arguments["cluster"], token=arguments.get("token"))
-            text = format_login(result)
 
-        else:
-            logger.warning("unknown_tool_requested", tool=name)
-            return [TextContent(type="text", text=f"Unknown tool: {name}")]
+@_handles("acp_clone_session")
+async def _clone_session(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    result = await client.clone_session(
+        project=project,
+        source_session=arguments["source_session"],
+        new_display_name=arguments["new_display_name"],
+        dry_run=arguments["dry_run"],
+    )
+    return format_session_created(result)
+
+
+@_handles("acp_update_session")
+async def _update_session(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    result = await client.update_session(
+        project=project,
+        session=arguments["session"],
+        display_name=arguments.get("display_name"),
+        timeout=arguments.get("timeout"),
+        dry_run=arguments["dry_run"],
+    )
+    return format_result(result)
+
+
+# Observability
+
+
+@_handles("acp_get_session_logs")
+async def _get_session_logs(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    result = await client.get_session_logs(
+        project=project,
+        session=arguments["session"],
+        container=arguments.get("container"),
+        tail_lines=arguments["tail_lines"],
+    )
+    return format_logs(result)
 
-        elapsed = time.time() - start_time
-        logger.info("tool_call_completed", tool=name, elapsed_seconds=round(elapsed, 2))
 
+@_handles("acp_get_session_transcript")
+async def _get_session_transcript(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    result = await client.get_session_transcript(
+        project=project,
+        session=arguments["session"],
+        format=arguments["format"],
+    )
+    return format_transcript(result)
+
+
+@_handles("acp_get_session_metrics")
+async def _get_session_metrics(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    return format_metrics(await client.get_session_metrics(project=project, session=arguments["session"]))
+
+
+# Labels
+
+
+@_handles("acp_label_resource")
+async def _label_resource(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    result = await client.label_session(project=project, session=arguments["name"], labels=arguments["labels"])
+    return format_labels(result)
+
+
+@_handles("acp_unlabel_resource")
+async def _unlabel_resource(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    result = await client.unlabel_session(
+        project=project, session=arguments["name"], label_keys=arguments["label_keys"]
+    )
+    return format_labels(result)
+
+
+@_handles("acp_list_sessions_by_label")
+async def _list_sessions_by_label(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    return format_sessions_list(await client.list_sessions_by_label(project=project, labels=arguments["labels"]))
+
+
+@_handles("acp_bulk_label_resources")
+async def _bulk_label_resources(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    result = await client.bulk_label_sessions(
+        project=project,
+        sessions=arguments["sessions"],
+        labels=arguments["labels"],
+        dry_run=arguments["dry_run"],
+    )
+    return format_labels(result)
+
+
+@_handles("acp_bulk_unlabel_resources")
+async def _bulk_unlabel_resources(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    result = await client.bulk_unlabel_sessions(
+        project=project,
+        sessions=arguments["sessions"],
+        label_keys=arguments["label_keys"],
+        dry_run=arguments["dry_run"],
+    )
+    return format_labels(result)
+
+
+# Bulk operations (named and by label)
+
+
+def _bulk_handler(method_name: str, target_arg: str, operation: str) -> ToolHandler:
+    """Build a handler for a bulk client method that takes sessions or labels plus dry_run."""
+
+    async def handler(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+        method = getattr(client, method_name)
+        result = await method(project=project, **{target_arg: arguments[target_arg]}, dry_run=arguments["dry_run"])
+        return format_bulk_result(result, operation)
+
+    return handler
+
+
+for _operation in ("delete", "stop", "restart"):
+    _HANDLERS[f"acp_bulk_{_operation}_sessions"] = _bulk_handler(f"bulk_{_operation}_sessions", "sessions", _operation)
+    _HANDLERS[f"acp_bulk_{_operation}_sessions_by_label"] = _bulk_handler(
+        f"bulk_{_operation}_sessions_by_label", "labels", _operation
+    )
+
+
+# Cluster management
+
+
+@_handles("acp_list_clusters")
+async def _list_clusters(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    return format_clusters(client.list_clusters())
+
+
+@_handles("acp_whoami")
+async def _whoami(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    return format_whoami(await client.whoami())
+
+
+@_handles("acp_switch_cluster")
+async def _switch_cluster(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    return format_result(await client.switch_cluster(arguments["cluster"]))
+
+
+@_handles("acp_login")
+async def _login(client: ACPClient, project: str, arguments: dict[str, Any]) -> str:
+    return format_login(await client.login(cluster=arguments["cluster"], token=arguments.get("token")))
+
+
+# Large outputs (logs, transcripts) are split into content blocks of at most this many characters
+MAX_TEXT_BLOCK_CHARS = 64 * 1024
+
+
+def _text(text: str) -> list[TextContent]:
+    """Wrap text as MCP text content, splitting oversized text into blocks at line boundaries."""
+    if len(text) <= MAX_TEXT_BLOCK_CHARS:
         return [TextContent(type="text", text=text)]
 
+    blocks: list[TextContent] = []
+    start = 0
+    while start < len(text):
+        end = start + MAX_TEXT_BLOCK_CHARS
+        if end < len(text):
+            newline = text.rfind("\n", start, end)
+            if newline > start:
+                end = newline + 1
+        blocks.append(TextContent(type="text", text=text[start:end]))
+        start = end
+    return blocks
+
+
+# The MCP server runs each request in its own task; this caps how many reach the API at once
+MAX_CONCURRENT_TOOL_CALLS = 8
+_tool_call_slots = asyncio.Semaphore(MAX_CONCURRENT_TOOL_CALLS)
+
+# Arguments never written to the logs
+REDACTED_ARGUMENTS = frozenset({"token", "password", "secret"})
+
+
+@app.call_tool()
+async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
+    """Handle tool calls."""
+    start_ns = perf_counter_ns()
+
+    if logger.isEnabledFor(logging.DEBUG):
+        safe_args = {k: v for k, v in arguments.items() if k not in REDACTED_ARGUMENTS}
+        logger.debug("tool_call_started", tool=name, arguments=safe_args)
+
+    client = get_client()
+
+    defaults = _TOOL_DEFAULTS.get(name)
+    if defaults:
+        arguments = {**defaults, **arguments}
+
+    try:
+        # Auto-fill project from default if not provided
+        if name not in TOOLS_WITHOUT_PROJECT and not arguments.get("project"):
+            default_project = client.default_project
+            if default_project:
+                arguments["project"] = default_project
+                logger.info("project_autofilled", project=default_project)
+
+        # Confirmation enforcement for destructive bulk operations
+        op = _CONFIRMATION_OPERATIONS.get(name)
+        if op and not (arguments.get("dry_run") or arguments.get("confirm")):
+            raise ValueError(f"Bulk {op} requires confirm=true. Use dry_run=true to preview first.")
+
+        handler = _HANDLERS.get(name)
+        if handler is None:
+            logger.warning("unknown_tool_requested", tool=name)
+            return _text(f"Unknown tool: {name}")
+
+        async with _tool_call_slots:
+            text = await handler(client, arguments.get("project", ""), arguments)
+
+        elapsed_ms = (perf_counter_ns() - start_ns) // 1_000_000
+        logger.info("tool_call_completed", tool=name, elapsed_ms=elapsed_ms)
+
+        return _text(text)
+
     except ValueError as e:
-        elapsed = time.time() - start_time
-        logger.warning("tool_validation_error", tool=name, elapsed_seconds=round(elapsed, 2), error=str(e))
-        return [TextContent(type="text", text=f"Validation Error: {str(e)}")]
+        elapsed_ms = (perf_counter_ns() - start_ns) // 1_000_000
+        error = str(e)
+        logger.warning("tool_validation_error", tool=name, elapsed_ms=elapsed_ms, error=error)
+        return _text(f"Validation Error: {error}")
     except TimeoutError as e:
-        elapsed = time.time() - start_time
-        logger.error("tool_timeout", tool=name, elapsed_seconds=round(elapsed, 2), error=str(e))
-        return [TextContent(type="text", text=f"Timeout Error: {str(e)}")]
+        elapsed_ms = (perf_counter_ns() - start_ns) // 1_000_000
+        error = str(e)
+        logger.error("tool_timeout", tool=name, elapsed_ms=elapsed_ms, error=error)
+        return _text(f"Timeout Error: {error}")
     except Exception as e:
-        elapsed = time.time() - start_time
-        logger.error("tool_unexpected_error", tool=name, elapsed_seconds=round(elapsed, 2), error=str(e), exc_info=True)
-        return [TextContent(type="text", text=f"Error: {str(e)}")]
+        elapsed_ms = (perf_counter_ns() - start_ns) // 1_000_000
+        error = str(e)
+        logger.error("tool_unexpected_error", tool=name, elapsed_ms=elapsed_ms, error=error, exc_info=True)
+        return _text(f"Error: {error}")
 
 
 async def main() -> None:
     """Run the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options(),
-        )
+    # Build the client before serving so config loading doesn't stall the first tool calls.
+    # A failure is already logged by get_client and will be reported again on each call.
+    with contextlib.suppress(Exception):
+        get_client()
+
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options(),
+            )
+    finally:
+        if _client is not None:
+            await _client.close()
 
 
 def run() -> None:
-    """Entry point for the MCP server."""
-    asyncio.run(main())
+    """Entry point for the MCP server. Uses uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        asyncio.run(main(), loop_factory=uvloop.new_event_loop)
 
 
 if __name__ == "__main__":
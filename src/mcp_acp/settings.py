@@ -13,6 +13,9 @@ from utils.pylogger import get_python_logger
 
 logger = get_python_logger()
 
+# Parsed cluster configs keyed by resolved path, with the file mtime they were read at
+_CLUSTERS_CACHE: dict[Path, tuple[int, "ClustersConfig"]] = {}
+
 
 class ClusterConfig(BaseSettings):
     """Configuration for a single Ambient Code Platform cluster.
@@ -157,6 +160,8 @@ class Settings(BaseSettings):
     Attributes:
         config_path: Path to clusters.yaml configuration file
         log_level: Logging level
+        server_side_filter: Send list_sessions filters to the gateway as query parameters
+        supports_field_projection: Ask the gateway for session IDs only when resolving label matches
     """
 
     config_path: Path = Field(
@@ -168,6 +173,14 @@ class Settings(BaseSettings):
         description="Logging level",
         json_schema_extra={"enum": ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]},
     )
+    server_side_filter: bool = Field(
+        default=False,
+        description="Filter, sort and limit list_sessions on the gateway instead of locally",
+    )
+    supports_field_projection: bool = Field(
+        default=False,
+        description="Request only session IDs (fields=id) when resolving sessions for bulk-by-label operations",
+    )
 
     @field_validator("log_level")
     @classmethod
@@ -197,6 +210,9 @@ def load_settings() -> Settings:
 def load_clusters_config(settings: Settings | None = None) -> ClustersConfig:
     """Load and validate cluster configuration.
 
+    Parsed configs are cached per file and re-read when the file's mtime changes.
+    Each call returns a deep copy, so callers may mutate their config freely.
+
     Args:
         settings: Optional Settings instance. If not provided, loads default settings.
 
@@ -210,7 +226,17 @@ def load_clusters_config(settings: Settings | None = None) -> ClustersConfig:
     if settings is None:
         settings = load_settings()
 
-    return ClustersConfig.from_yaml(settings.config_path)
+    path = settings.config_path
+    try:
+        key = path.resolve()
+        mtime = key.stat().st_mtime_ns
+    except OSError:
+        return ClustersConfig.from_yaml(path)
+
+    cached = _CLUSTERS_CACHE.get(key)
+    if cached is None or cached[0] != mtime:
+        cached = _CLUSTERS_CACHE[key] = (mtime, ClustersConfig.from_yaml(path))
+    return cached[1].model_copy(deep=True)
 
 
 # Global settings instance
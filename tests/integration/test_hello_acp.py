@@ -47,7 +47,6 @@ def _default_project(client: ACPClient) -> str:
 
 
 @pytest.mark.integration
-@pytest.mark.asyncio
 async def test_hello_acp(client: ACPClient) -> None:
     """Submit a hello-world session and verify it runs and produces marker output."""
     project = _default_project(client)
@@ -1,42 +1,112 @@
 """Tests for ACP client."""
 
-from datetime import UTC, datetime, timedelta
-from unittest.mock import AsyncMock, MagicMock, patch
-
+import asyncio
+import json
+import os
+import re
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import httpx
 import pytest
+import respx
 
 from mcp_acp.client import ACPClient
+from mcp_acp.settings import ClusterConfig, ClustersConfig, Settings, load_clusters_config
+
+RE_INVALID_CHARS = re.compile("invalid characters")
+RE_INVALID_LABEL_KEY = re.compile("Invalid label key")
+RE_INVALID_LABEL_VALUE = re.compile("Invalid label value")
+
+
+def make_response(status_code: int = 200, text: str = "") -> SimpleNamespace:
+    """Create a lightweight HTTP response stub."""
+    return SimpleNamespace(status_code=status_code, content=text.encode(), text=text)
+
+
+def json_response(body: Any, status_code: int = 200) -> SimpleNamespace:
+    """Create an HTTP response stub carrying a JSON body."""
+    return make_response(status_code, json.dumps(body))
+
+
+NO_CONTENT_RESPONSE = make_response(204)
+S1_RUNNING_RESPONSE = json_response({"id": "s1", "status": "running"})
+S1_STOPPED_RESPONSE = json_response({"id": "s1", "status": "stopped"})
+
+
+def async_returning(value: Any) -> Callable[..., Awaitable[Any]]:
+    """Create a plain coroutine function that always returns value."""
+
+    async def _return(*args: Any, **kwargs: Any) -> Any:
+        return value
+
+    return _return
 
 
 @pytest.fixture
 def mock_settings():
-    """Create mock settings."""
-    settings = MagicMock()
-    settings.config_path = None
-    return settings
+    """Create settings stub."""
+    return SimpleNamespace(config_path=None, server_side_filter=False, supports_field_projection=False)
 
 
 @pytest.fixture
 def mock_clusters_config():
-    """Create mock clusters config."""
-    cluster = MagicMock()
-    cluster.server = "https://public-api-test.apps.example.com"
-    cluster.default_project = "test-project"
-    cluster.description = "Test Cluster"
-    cluster.token = "test-token"
+    """Create clusters config holding one real ClusterConfig."""
+    cluster = ClusterConfig(
+        server="https://public-api-test.apps.example.com",
+        default_project="test-project",
+        description="Test Cluster",
+        token="test-token",
+    )
+    return SimpleNamespace(clusters={"test-cluster": cluster}, default_cluster="test-cluster")
+
+
+@pytest.fixture
+async def client(mock_settings, mock_clusters_config):
+    """Create client with mocked config, closing its pooled HTTP clients afterwards."""
+    with (
+        patch("mcp_acp.client.load_settings", return_value=mock_settings),
+        patch("mcp_acp.client.load_clusters_config", return_value=mock_clusters_config),
+    ):
+        acp_client = ACPClient()
+    yield acp_client
+    await acp_client.close()
+
 
-    config = MagicMock()
-    config.clusters = {"test-cluster": cluster}
-    config.default_cluster = "test-cluster"
-    return config
+@pytest.fixture(scope="module")
+def ok_session_response() -> SimpleNamespace:
+    """A 200 response for session-1, shared because the stub is never mutated."""
+    return json_response({"id": "session-1"})
+
+
+@pytest.fixture(scope="module")
+def http_stub() -> SimpleNamespace:
+    """A fake pooled HTTP client, reused across the module."""
+    return SimpleNamespace(request=AsyncMock())
+
+
+@pytest.fixture
+def mock_http(client, monkeypatch, http_stub) -> SimpleNamespace:
+    """Stand in for the client's pooled HTTP client; set request.return_value or side_effect per test."""
+    http_stub.request.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr(client, "_get_http_client", async_returning(http_stub))
+    return http_stub
+
+
+@pytest.fixture
+def api_base_url(mock_clusters_config) -> str:
+    """Base URL of the test cluster's public API."""
+    return mock_clusters_config.clusters["test-cluster"].server
 
 
 @pytest.fixture
-def client(mock_settings, mock_clusters_config):
-    """Create client with mocked config."""
-    with patch("mcp_acp.client.load_settings", return_value=mock_settings):
-        with patch("mcp_acp.client.load_clusters_config", return_value=mock_clusters_config):
-            return ACPClient()
+def api(api_base_url):
+    """Mock the public API at the httpx transport layer, exercising the real pooled client."""
+    with respx.mock(base_url=api_base_url, assert_all_called=False) as router:
+        yield router
 
 
 class TestACPClientInit:
@@ -48,6 +118,44 @@ class TestACPClientInit:
         assert "test-cluster" in client.clusters_config.clusters
 
 
+class TestHTTPClientLifecycle:
+    """Tests for the pooled HTTP client."""
+
+    async def test_http_client_reused(self, client: ACPClient) -> None:
+        """Test the HTTP client is created once and reused across requests."""
+        first = await client._get_http_client()
+        second = await client._get_http_client()
+
+        assert first is second
+        await client.close()
+
+    async def test_http_client_binds_auth_headers(self, client: ACPClient) -> None:
+        """Test the pooled client carries the cluster URL, token and JSON headers."""
+        http_client = await client._get_http_client()
+
+        assert http_client.headers["Authorization"] == "Bearer test-token"
+        assert http_client.headers["Accept"] == "application/json"
+        assert http_client.base_url == "https://public-api-test.apps.example.com"
+        await client.close()
+
+    async def test_http_client_pool_limits(self, client: ACPClient) -> None:
+        """Test the pooled client keeps enough connections alive for concurrent bulk calls."""
+        with patch("mcp_acp.client.httpx.AsyncClient") as async_client:
+            await client._get_http_client()
+
+        kwargs = async_client.call_args.kwargs
+        assert kwargs["limits"] is ACPClient.HTTP_LIMITS
+        assert kwargs["http2"] is True
+
+    async def test_async_context_manager_closes_client(self, client: ACPClient) -> None:
+        """Test async with closes the HTTP client on exit."""
+        async with client as c:
+            http_client = await c._get_http_client()
+            assert not http_client.is_closed
+
+        assert http_client.is_closed
+
+
 class TestInputValidation:
     """Tests for input validation."""
 
@@ -56,18 +164,19 @@ class TestInputValidation:
         client._validate_input("my-session", "session")
         client._validate_input("project-123", "project")
 
-    def test_validate_input_invalid_chars(self, client: ACPClient) -> None:
-        """Test invalid characters rejected."""
-        with pytest.raises(ValueError, match="invalid characters"):
-            client._validate_input("my_session", "session")
-
-        with pytest.raises(ValueError, match="invalid characters"):
-            client._validate_input("My-Session", "session")
-
-    def test_validate_input_too_long(self, client: ACPClient) -> None:
-        """Test input exceeding max length rejected."""
-        with pytest.raises(ValueError, match="exceeds maximum length"):
-            client._validate_input("a" * 254, "session")
+    @pytest.mark.parametrize(
+        ("value", "match"),
+        [
+            ("my_session", RE_INVALID_CHARS),
+            ("My-Session", RE_INVALID_CHARS),
+            ("a" * 254, "exceeds maximum length"),
+        ],
+        ids=["underscore", "uppercase", "too-long"],
+    )
+    def test_validate_input_rejected(self, client: ACPClient, value: str, match: str | re.Pattern[str]) -> None:
+        """Test invalid characters and over-long names are rejected."""
+        with pytest.raises(ValueError, match=match):
+            client._validate_input(value, "session")
 
     def test_validate_bulk_operation_within_limit(self, client: ACPClient) -> None:
         """Test bulk operation within limit passes."""
@@ -84,8 +193,6 @@ class TestServerURLValidation:
 
     def test_reject_k8s_api_port(self) -> None:
         """Direct K8s API URL (port 6443) should be rejected."""
-        from mcp_acp.settings import ClusterConfig
-
         with pytest.raises(ValueError, match="port 6443"):
             ClusterConfig(
                 server="https://api.test.example.com:6443",
@@ -94,8 +201,6 @@ class TestServerURLValidation:
 
     def test_accept_gateway_url(self) -> None:
         """Gateway URL should be accepted."""
-        from mcp_acp.settings import ClusterConfig
-
         config = ClusterConfig(
             server="https://public-api-ambient.apps.cluster.example.com",
             default_project="test-project",
@@ -104,8 +209,6 @@ class TestServerURLValidation:
 
     def test_accept_port_443(self) -> None:
         """Standard HTTPS port should be accepted."""
-        from mcp_acp.settings import ClusterConfig
-
         config = ClusterConfig(
             server="https://api.example.com:443",
             default_project="test-project",
@@ -113,38 +216,81 @@ class TestServerURLValidation:
         assert config.server == "https://api.example.com:443"
 
 
+class TestClustersConfigCache:
+    """Tests for load_clusters_config caching."""
+
+    def test_cached_until_file_changes(self, tmp_path) -> None:
+        """Config should be parsed once and re-read only when the file's mtime changes."""
+        config_file = tmp_path / "clusters.yaml"
+        config_file.write_text(
+            "clusters:\n  dev:\n    server: https://dev.example.com\n    default_project: dev-project\n"
+            "default_cluster: dev\n"
+        )
+        settings = Settings(config_path=config_file)
+
+        with patch.object(ClustersConfig, "from_yaml", wraps=ClustersConfig.from_yaml) as from_yaml:
+            first = load_clusters_config(settings)
+            second = load_clusters_config(settings)
+            assert from_yaml.call_count == 1
+
+            first.clusters["dev"].token = "mutated"
+            assert second.clusters["dev"].token is None
+
+            stat = config_file.stat()
+            os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            load_clusters_config(settings)
+            assert from_yaml.call_count == 2
+
+
 class TestTimeParsing:
     """Tests for time parsing utilities."""
 
-    def test_parse_time_delta_days(self, client: ACPClient) -> None:
-        """Test parsing days."""
+    @pytest.fixture
+    def now_pair(self) -> tuple[datetime, datetime]:
+        """Current time as an aware/naive pair."""
         now = datetime.now(UTC)
+        return now, now.replace(tzinfo=None)
+
+    def test_parse_time_delta_days(self, client: ACPClient, now_pair: tuple[datetime, datetime]) -> None:
+        """Test parsing days."""
+        now_utc, _ = now_pair
         result = client._parse_time_delta("7d")
-        expected = now - timedelta(days=7)
-        assert abs((result - expected.replace(tzinfo=None)).total_seconds()) < 5
+        assert abs((result - (now_utc - timedelta(days=7))).total_seconds()) < 5
 
-    def test_parse_time_delta_hours(self, client: ACPClient) -> None:
+    def test_parse_time_delta_hours(self, client: ACPClient, now_pair: tuple[datetime, datetime]) -> None:
         """Test parsing hours."""
-        now = datetime.now(UTC)
+        now_utc, _ = now_pair
         result = client._parse_time_delta("24h")
-        expected = now - timedelta(hours=24)
-        assert abs((result - expected.replace(tzinfo=None)).total_seconds()) < 5
+        assert abs((result - (now_utc - timedelta(hours=24))).total_seconds()) < 5
+
+    def test_parse_time_delta_uppercase(self, client: ACPClient) -> None:
+        """Test unit letters are case-insensitive."""
+        assert abs((client._parse_time_delta("24H") - client._parse_time_delta("24h")).total_seconds()) < 5
 
     def test_parse_time_delta_invalid(self, client: ACPClient) -> None:
         """Test invalid format rejected."""
         with pytest.raises(ValueError, match="Invalid time format"):
             client._parse_time_delta("7x")
 
-    def test_is_older_than(self, client: ACPClient) -> None:
+    def test_is_older_than(self, client: ACPClient, now_pair: tuple[datetime, datetime]) -> None:
         """Test age comparison."""
-        cutoff = datetime.now(UTC) - timedelta(days=7)
-        cutoff_naive = cutoff.replace(tzinfo=None)
+        now_utc, now_naive = now_pair
+        cutoff = now_utc - timedelta(days=7)
+
+        old_timestamp = (now_utc - timedelta(days=10)).isoformat()
+        assert client._is_older_than(old_timestamp, cutoff) is True
+
+        new_timestamp = (now_utc - timedelta(days=1)).isoformat()
+        assert client._is_older_than(new_timestamp, cutoff) is False
 
-        old_timestamp = (datetime.now(UTC) - timedelta(days=10)).isoformat()
-        assert client._is_older_than(old_timestamp, cutoff_naive) is True
+        naive_timestamp = (now_naive - timedelta(days=10)).isoformat()
+        assert client._is_older_than(naive_timestamp, cutoff) is True
 
-        new_timestamp = (datetime.now(UTC) - timedelta(days=1)).isoformat()
-        assert client._is_older_than(new_timestamp, cutoff_naive) is False
+        assert client._is_older_than("2020-01-01T00:00:00Z", cutoff) is True
+
+        # Older by instant, though later as a string than the UTC cutoff
+        offset_timestamp = (cutoff - timedelta(hours=1)).astimezone(timezone(timedelta(hours=2))).isoformat()
+        assert client._is_older_than(offset_timestamp, cutoff) is True
 
 
 class TestListClusters:
@@ -164,13 +310,22 @@ class TestListClusters:
 class TestSwitchCluster:
     """Tests for switch_cluster."""
 
-    @pytest.mark.asyncio
     async def test_switch_cluster_success(self, client: ACPClient) -> None:
         """Test switching to valid cluster."""
         result = await client.switch_cluster("test-cluster")
         assert result["switched"] is True
 
-    @pytest.mark.asyncio
+    async def test_switch_cluster_refreshes_default_project(self, client: ACPClient) -> None:
+        """Test the cached default project follows the active cluster."""
+        client.clusters_config.clusters["other-cluster"] = ClusterConfig(
+            server="https://other.example.com", default_project="other-project"
+        )
+        assert client.default_project == "test-project"
+
+        await client.switch_cluster("other-cluster")
+
+        assert client.default_project == "other-project"
+
     async def test_switch_cluster_unknown(self, client: ACPClient) -> None:
         """Test switching to unknown cluster."""
         result = await client.switch_cluster("unknown-cluster")
@@ -181,7 +336,6 @@ class TestSwitchCluster:
 class TestWhoami:
     """Tests for whoami."""
 
-    @pytest.mark.asyncio
     async def test_whoami_authenticated(self, client: ACPClient) -> None:
         """Test whoami with valid token."""
         result = await client.whoami()
@@ -195,82 +349,291 @@ class TestWhoami:
 class TestHTTPRequests:
     """Tests for HTTP request handling."""
 
-    @pytest.mark.asyncio
-    async def test_list_sessions(self, client: ACPClient) -> None:
-        """Test list_sessions makes correct HTTP request."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"items": [{"id": "session-1", "status": "running"}]}
+    async def test_request_sends_auth_and_project_headers(self, client: ACPClient, api: respx.MockRouter) -> None:
+        """Requests through the pooled client should carry the bearer token and project header."""
+        route = api.get("/v1/sessions/session-1").mock(return_value=httpx.Response(200, json={"id": "session-1"}))
+
+        result = await client.get_session("test-project", "session-1")
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+        assert result == {"id": "session-1"}
+        request = route.calls.last.request
+        assert request.headers["Authorization"] == "Bearer test-token"
+        assert request.headers["X-Ambient-Project"] == "test-project"
 
-            result = await client.list_sessions("test-project")
+    async def test_list_sessions(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """Test list_sessions makes correct HTTP request."""
+        mock_response = json_response({"items": [{"id": "session-1", "status": "running"}]})
+
+        mock_http.request.return_value = mock_response
 
-            assert result["total"] == 1
-            assert result["sessions"][0]["id"] == "session-1"
+        result = await client.list_sessions("test-project")
 
-    @pytest.mark.asyncio
-    async def test_delete_session_dry_run(self, client: ACPClient) -> None:
-        """Test delete_session in dry_run mode."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "session-1", "status": "running"}
+        assert result["total"] == 1
+        assert result["sessions"][0]["id"] == "session-1"
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+    @pytest.mark.parametrize(
+        ("method", "verb"),
+        [("delete_session", "Would delete"), ("restart_session", "Would restart"), ("stop_session", "Would stop")],
+    )
+    async def test_session_action_dry_run(
+        self,
+        client: ACPClient,
+        mock_http: SimpleNamespace,
+        ok_session_response: SimpleNamespace,
+        method: str,
+        verb: str,
+    ) -> None:
+        """Dry run should preview the action with a single GET and no mutation."""
+        mock_http.request.return_value = ok_session_response
 
-            result = await client.delete_session("test-project", "session-1", dry_run=True)
+        result = await getattr(client, method)("test-project", "session-1", dry_run=True)
 
-            assert result["dry_run"] is True
-            assert result["success"] is True
-            assert "Would delete" in result["message"]
+        assert result["dry_run"] is True
+        assert result["success"] is True
+        assert verb in result["message"]
+        assert mock_http.request.call_args.kwargs["method"] == "GET"
 
-    @pytest.mark.asyncio
-    async def test_delete_session_success(self, client: ACPClient) -> None:
+    async def test_delete_session_success(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
         """Test delete_session success."""
-        mock_response = MagicMock()
-        mock_response.status_code = 204
+        mock_http.request.return_value = NO_CONTENT_RESPONSE
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+        result = await client.delete_session("test-project", "session-1")
 
-            result = await client.delete_session("test-project", "session-1")
+        assert result["deleted"] is True
 
-            assert result["deleted"] is True
+    async def test_empty_body_returns_empty_dict(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """A successful response without a body should not be decoded."""
+        mock_response = make_response(200)
 
+        mock_http.request.return_value = mock_response
 
-class TestBulkOperations:
-    """Tests for bulk operations."""
+        result = await client.get_session("test-project", "session-1")
+
+        assert result == {}
+
+
+class TestListSessionsFiltering:
+    """Tests for local list_sessions filtering."""
+
+    async def test_older_than_filter(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """Only sessions created before the cutoff should be returned."""
+        old = (datetime.now(UTC) - timedelta(days=10)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        recent = (datetime.now(UTC) - timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        mock_response = json_response(
+            {
+                "items": [
+                    {"id": "old", "status": "Completed", "createdAt": old},
+                    {"id": "recent", "status": "Completed", "createdAt": recent},
+                    {"id": "undated", "status": "Completed"},
+                ]
+            }
+        )
+
+        mock_http.request.return_value = mock_response
+
+        result = await client.list_sessions("test-project", status="completed", older_than="7d")
+
+        assert [s["id"] for s in result["sessions"]] == ["old"]
+
+    async def test_older_than_filter_offset_timestamps(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """Timestamps with a UTC offset should be compared by instant, not as strings."""
+        cutoff = datetime.now(UTC) - timedelta(days=7)
+        # Written in local time, each sorts on the wrong side of a "Z" cutoff string
+        old = (cutoff - timedelta(hours=1)).astimezone(timezone(timedelta(hours=2))).isoformat(timespec="seconds")
+        recent = (cutoff + timedelta(hours=1)).astimezone(timezone(timedelta(hours=-5))).isoformat(timespec="seconds")
+        mock_http.request.return_value = json_response(
+            {
+                "items": [
+                    {"id": "old", "status": "Completed", "createdAt": old},
+                    {"id": "recent", "status": "Completed", "createdAt": recent},
+                ]
+            }
+        )
+
+        result = await client.list_sessions("test-project", older_than="7d")
+
+        assert [s["id"] for s in result["sessions"]] == ["old"]
+
+
+class TestServerSideFiltering:
+    """Tests for list_sessions with server-side filtering enabled."""
+
+    async def test_filters_sent_as_query_params(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """Filters should be pushed to the gateway and the response returned as-is."""
+        client.settings.server_side_filter = True
+        mock_response = json_response({"items": [{"id": "s2", "status": "stopped"}, {"id": "s1"}]})
+
+        mock_http.request.return_value = mock_response
+
+        result = await client.list_sessions(
+            "test-project", status="Stopped", older_than="7d", sort_by="created", limit=2
+        )
+
+        params = mock_http.request.call_args.kwargs["params"]
+        assert params["status"] == "stopped"
+        assert params["createdBefore"].endswith("Z")
+        assert params["sortBy"] == "created"
+        assert params["limit"] == 2
+        assert [s["id"] for s in result["sessions"]] == ["s2", "s1"]
+        assert result["filters_applied"]["older_than"] == "7d"
+
+
+class TestSessionCache:
+    """Tests for the short-lived session lookup cache."""
+
+    async def test_repeated_get_served_from_cache(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """A second lookup within the TTL should not hit the API."""
+        mock_http.request.return_value = S1_RUNNING_RESPONSE
+
+        await client.get_session("test-project", "s1")
+        result = await client.stop_session("test-project", "s1", dry_run=True)
+
+        assert mock_http.request.call_count == 1
+        assert result["session_info"]["status"] == "running"
 
-    @pytest.mark.asyncio
-    async def test_bulk_delete_sessions(self, client: ACPClient) -> None:
-        """Test bulk delete sessions."""
-        mock_response = MagicMock()
-        mock_response.status_code = 204
+    async def test_mutation_evicts_cached_session(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """Stopping a session should force the next lookup to refetch it."""
+        mock_http.request.return_value = S1_RUNNING_RESPONSE
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+        await client.get_session("test-project", "s1")
+        await client.stop_session("test-project", "s1")
+        await client.get_session("test-project", "s1")
 
-            result = await client.bulk_delete_sessions("test-project", ["s1", "s2"])
+        assert mock_http.request.call_count == 3
 
-            assert len(result["deleted"]) == 2
-            assert "s1" in result["deleted"]
-            assert "s2" in result["deleted"]
+    @pytest.mark.parametrize("method", ["stop_session", "delete_session"])
+    async def test_get_overlapping_mutation_not_cached(
+        self, client: ACPClient, mock_http: SimpleNamespace, method: str
+    ) -> None:
+        """A GET still in flight when a mutation finishes must not cache its pre-mutation body."""
+        get_started = asyncio.Event()
+        release_get = asyncio.Event()
+
+        async def request(method: str, url: str, **kwargs: Any) -> SimpleNamespace:
+            if method != "GET":
+                return NO_CONTENT_RESPONSE
+            if not get_started.is_set():
+                get_started.set()
+                await release_get.wait()
+                return S1_RUNNING_RESPONSE
+            return S1_STOPPED_RESPONSE
+
+        mock_http.request.side_effect = request
+
+        pending_get = asyncio.create_task(client.get_session("test-project", "s1"))
+        await get_started.wait()
+        await getattr(client, method)("test-project", "s1")
+        release_get.set()
+        stale = await pending_get
+        fresh = await client.get_session("test-project", "s1")
+
+        assert stale["status"] == "running"
+        assert fresh["status"] == "stopped"
+        assert mock_http.request.call_count == 3
+
+    async def test_get_during_mutation_not_cached(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """A GET that starts while a PATCH is in flight must not outlive the PATCH in the cache."""
+        patch_started = asyncio.Event()
+        release_patch = asyncio.Event()
+
+        async def request(method: str, url: str, **kwargs: Any) -> SimpleNamespace:
+            if method == "PATCH":
+                patch_started.set()
+                await release_patch.wait()
+                return S1_STOPPED_RESPONSE
+            return S1_STOPPED_RESPONSE if release_patch.is_set() else S1_RUNNING_RESPONSE
+
+        mock_http.request.side_effect = request
+
+        pending_stop = asyncio.create_task(client.stop_session("test-project", "s1"))
+        await patch_started.wait()
+        assert (await client.get_session("test-project", "s1"))["status"] == "running"
+        release_patch.set()
+        await pending_stop
+
+        assert (await client.get_session("test-project", "s1"))["status"] == "stopped"
+
+    async def test_expired_entry_refetched(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """Entries older than the TTL should be refetched."""
+        client.SESSION_CACHE_TTL = 0
+        mock_http.request.return_value = S1_RUNNING_RESPONSE
+
+        await client.get_session("test-project", "s1")
+        await client.get_session("test-project", "s1")
+
+        assert mock_http.request.call_count == 2
+
+
+class TestBulkOperations:
+    """Tests for bulk operations."""
+
+    @pytest.mark.parametrize(
+        ("method", "response", "result_key"),
+        [
+            ("bulk_delete_sessions", NO_CONTENT_RESPONSE, "deleted"),
+            ("bulk_stop_sessions", S1_STOPPED_RESPONSE, "stopped"),
+            ("bulk_restart_sessions", S1_RUNNING_RESPONSE, "restarted"),
+        ],
+        ids=["delete", "stop", "restart"],
+    )
+    async def test_bulk_action(
+        self, client: ACPClient, mock_http: SimpleNamespace, method: str, response: SimpleNamespace, result_key: str
+    ) -> None:
+        """Each bulk action should report every session it acted on."""
+        mock_http.request.return_value = response
+
+        result = await getattr(client, method)("test-project", ["s1", "s2"])
+
+        assert result[result_key] == ["s1", "s2"]
+
+    async def test_bulk_operations_run_concurrently(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """All bulk requests should be in flight before any of them completes."""
+        in_flight = 0
+        peak = 0
+
+        async def slow_request(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return NO_CONTENT_RESPONSE
+
+        mock_http.request.side_effect = slow_request
+
+        result = await client.bulk_stop_sessions("test-project", ["s1", "s2", "s3"])
+
+        assert result["stopped"] == ["s1", "s2", "s3"]
+        assert peak == 3
+
+    async def test_bulk_timeout_collected_as_failure(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """A timeout on one session should not abort the others."""
+        mock_http.request.side_effect = [NO_CONTENT_RESPONSE, httpx.TimeoutException("slow")]
+
+        result = await client.bulk_stop_sessions("test-project", ["s1", "s2"])
+
+        assert result["stopped"] == ["s1"]
+        assert result["failed"][0]["session"] == "s2"
+        assert "timed out" in result["failed"][0]["error"]
+
+    @pytest.mark.parametrize(
+        ("project", "sessions"),
+        [("Bad_Project", ["s1", "s2"]), ("test-project", ["s1", "Bad_Session"])],
+        ids=["project", "session"],
+    )
+    async def test_bulk_invalid_name_rejected_before_any_request(
+        self, client: ACPClient, mock_http: SimpleNamespace, project: str, sessions: list[str]
+    ) -> None:
+        """An invalid name should fail the whole call without touching the other sessions."""
+        with pytest.raises(ValueError, match=RE_INVALID_CHARS):
+            await client.bulk_stop_sessions(project, sessions)
+
+        mock_http.request.assert_not_called()
 
 
 class TestCreateSession:
     """Tests for create_session."""
 
-    @pytest.mark.asyncio
     async def test_create_session_dry_run(self, client: ACPClient) -> None:
         """Dry run should return manifest without hitting API."""
         result = await client.create_session(
@@ -285,15 +648,15 @@ class TestCreateSession:
         assert result["success"] is True
         assert result["project"] == "test-project"
 
-        manifest = result["manifest"]
-        assert manifest["initialPrompt"] == "Run all tests"
-        assert manifest["displayName"] == "Test Run"
-        assert manifest["repos"] == ["https://github.com/org/repo"]
-        assert manifest["interactive"] is False
-        assert manifest["llmConfig"]["model"] == "claude-sonnet-4"
-        assert manifest["timeout"] == 900
-
-    @pytest.mark.asyncio
+        assert result["manifest"] == {
+            "initialPrompt": "Run all tests",
+            "displayName": "Test Run",
+            "repos": ["https://github.com/org/repo"],
+            "interactive": False,
+            "llmConfig": {"model": "claude-sonnet-4"},
+            "timeout": 900,
+        }
+
     async def test_create_session_dry_run_minimal(self, client: ACPClient) -> None:
         """Dry run with only required fields should omit optional keys."""
         result = await client.create_session(
@@ -302,53 +665,43 @@ class TestCreateSession:
             dry_run=True,
         )
 
-        manifest = result["manifest"]
-        assert "displayName" not in manifest
-        assert "repos" not in manifest
+        assert result["manifest"] == {
+            "initialPrompt": "hello",
+            "interactive": False,
+            "llmConfig": {"model": "claude-sonnet-4"},
+            "timeout": 900,
+        }
 
-    @pytest.mark.asyncio
-    async def test_create_session_success(self, client: ACPClient) -> None:
+    async def test_create_session_success(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
         """Successful creation should return session id and project."""
-        mock_response = MagicMock()
-        mock_response.status_code = 201
-        mock_response.json.return_value = {"id": "compiled-abc12", "status": "creating"}
+        mock_response = json_response({"id": "compiled-abc12", "status": "creating"}, status_code=201)
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+        mock_http.request.return_value = mock_response
 
-            result = await client.create_session(
-                project="test-project",
-                initial_prompt="Implement feature X",
-            )
+        result = await client.create_session(
+            project="test-project",
+            initial_prompt="Implement feature X",
+        )
 
-            assert result["created"] is True
-            assert result["session"] == "compiled-abc12"
-            assert result["project"] == "test-project"
+        assert result["created"] is True
+        assert result["session"] == "compiled-abc12"
+        assert result["project"] == "test-project"
 
-    @pytest.mark.asyncio
-    async def test_create_session_api_failure(self, client: ACPClient) -> None:
+    async def test_create_session_api_failure(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
         """API failure should return created=False with error message."""
-        mock_response = MagicMock()
-        mock_response.status_code = 400
-        mock_response.json.return_value = {"error": "invalid session spec"}
+        mock_response = json_response({"error": "invalid session spec"}, status_code=400)
         mock_response.text = "invalid session spec"
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+        mock_http.request.return_value = mock_response
 
-            result = await client.create_session(
-                project="test-project",
-                initial_prompt="hello",
-            )
+        result = await client.create_session(
+            project="test-project",
+            initial_prompt="hello",
+        )
 
-            assert result["created"] is False
-            assert "invalid session spec" in result["message"]
+        assert result["created"] is False
+        assert "invalid session spec" in result["message"]
 
-    @pytest.mark.asyncio
     async def test_create_session_custom_model_and_timeout(self, client: ACPClient) -> None:
         """Custom model and timeout should appear in dry-run manifest."""
         result = await client.create_session(
@@ -367,203 +720,149 @@ class TestCreateSession:
 class TestRestartSession:
     """Tests for restart_session."""
 
-    @pytest.mark.asyncio
-    async def test_restart_session_dry_run(self, client: ACPClient) -> None:
-        """Dry run should preview restart without executing."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "session-1", "status": "stopped"}
-
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
-
-            result = await client.restart_session("test-project", "session-1", dry_run=True)
-
-            assert result["dry_run"] is True
-            assert result["success"] is True
-            assert "Would restart" in result["message"]
-
-    @pytest.mark.asyncio
-    async def test_restart_session_success(self, client: ACPClient) -> None:
+    async def test_restart_session_success(
+        self, client: ACPClient, mock_http: SimpleNamespace, ok_session_response: SimpleNamespace
+    ) -> None:
         """Restart should PATCH with stopped=False."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "session-1", "status": "running"}
-
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+        mock_http.request.return_value = ok_session_response
 
-            result = await client.restart_session("test-project", "session-1")
+        result = await client.restart_session("test-project", "session-1")
 
-            assert result["restarted"] is True
-            assert "Successfully restarted" in result["message"]
-
-            call_args = mock_http_client.request.call_args
-            assert call_args.kwargs["method"] == "PATCH"
-            assert call_args.kwargs["json"] == {"stopped": False}
+        assert result["restarted"] is True
+        assert "Successfully restarted" in result["message"]
 
 
 class TestStopSession:
     """Tests for stop_session."""
 
-    @pytest.mark.asyncio
-    async def test_stop_session_dry_run(self, client: ACPClient) -> None:
-        """Dry run should preview stop without executing."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "session-1", "status": "running"}
-
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+    async def test_stop_session_success(
+        self, client: ACPClient, mock_http: SimpleNamespace, ok_session_response: SimpleNamespace
+    ) -> None:
+        """Stop should PATCH with stopped=True."""
+        mock_http.request.return_value = ok_session_response
 
-            result = await client.stop_session("test-project", "session-1", dry_run=True)
+        result = await client.stop_session("test-project", "session-1")
 
-            assert result["dry_run"] is True
-            assert result["success"] is True
-            assert "Would stop" in result["message"]
+        assert result["stopped"] is True
+        assert "Successfully stopped" in result["message"]
 
-    @pytest.mark.asyncio
-    async def test_stop_session_success(self, client: ACPClient) -> None:
-        """Stop should PATCH with stopped=True."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "session-1", "status": "stopped"}
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+class TestPatchRequests:
+    """Tests for the PATCH bodies sent by session mutations."""
 
-            result = await client.stop_session("test-project", "session-1")
+    @pytest.mark.parametrize(
+        ("method_name", "kwargs", "expected_json"),
+        [
+            ("restart_session", {}, {"stopped": False}),
+            ("stop_session", {}, {"stopped": True}),
+            ("update_session", {"display_name": "new-name"}, {"displayName": "new-name"}),
+            ("update_session", {"timeout": 1800}, {"timeout": 1800}),
+        ],
+    )
+    async def test_patch_body(
+        self,
+        client: ACPClient,
+        mock_http: SimpleNamespace,
+        ok_session_response: SimpleNamespace,
+        method_name: str,
+        kwargs: dict[str, Any],
+        expected_json: dict[str, Any],
+    ) -> None:
+        """Each mutation should PATCH the session with its body."""
+        mock_http.request.return_value = ok_session_response
 
-            assert result["stopped"] is True
-            assert "Successfully stopped" in result["message"]
+        await getattr(client, method_name)("test-project", "session-1", **kwargs)
 
-            call_args = mock_http_client.request.call_args
-            assert call_args.kwargs["method"] == "PATCH"
-            assert call_args.kwargs["json"] == {"stopped": True}
+        call_kwargs = mock_http.request.call_args.kwargs
+        assert call_kwargs["method"] == "PATCH"
+        assert call_kwargs["json"] == expected_json
 
 
 class TestCloneSession:
     """Tests for clone_session."""
 
-    @pytest.mark.asyncio
-    async def test_clone_session_dry_run(self, client: ACPClient) -> None:
+    async def test_clone_session_dry_run(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
         """Dry run should GET source and return manifest without POSTing."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "id": "source-1",
-            "initialPrompt": "original prompt",
-            "interactive": False,
-            "timeout": 900,
-            "llmConfig": {"model": "claude-sonnet-4"},
-            "repos": ["https://github.com/org/repo"],
-        }
+        mock_response = json_response(
+            {
+                "id": "source-1",
+                "initialPrompt": "original prompt",
+                "interactive": False,
+                "timeout": 900,
+                "llmConfig": {"model": "claude-sonnet-4"},
+                "repos": ["https://github.com/org/repo"],
+            }
+        )
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+        mock_http.request.return_value = mock_response
 
-            result = await client.clone_session("test-project", "source-1", "clone-name", dry_run=True)
+        result = await client.clone_session("test-project", "source-1", "clone-name", dry_run=True)
 
-            assert result["dry_run"] is True
-            assert result["success"] is True
-            assert "Would clone" in result["message"]
-            assert result["manifest"]["displayName"] == "clone-name"
-            assert result["source_session"] == "source-1"
+        assert result["dry_run"] is True
+        assert result["success"] is True
+        assert "Would clone" in result["message"]
+        assert result["manifest"]["displayName"] == "clone-name"
+        assert result["source_session"] == "source-1"
 
-    @pytest.mark.asyncio
-    async def test_clone_session_success(self, client: ACPClient) -> None:
+    async def test_clone_session_success(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
         """Clone should GET source then POST new session."""
-        source_response = MagicMock()
-        source_response.status_code = 200
-        source_response.json.return_value = {
-            "id": "source-1",
-            "initialPrompt": "original prompt",
-            "interactive": False,
-            "timeout": 900,
-            "llmConfig": {"model": "claude-sonnet-4"},
-        }
+        source_response = json_response(
+            {
+                "id": "source-1",
+                "initialPrompt": "original prompt",
+                "interactive": False,
+                "timeout": 900,
+                "llmConfig": {"model": "claude-sonnet-4"},
+            }
+        )
 
-        create_response = MagicMock()
-        create_response.status_code = 201
-        create_response.json.return_value = {"id": "cloned-abc12"}
+        create_response = json_response({"id": "cloned-abc12"}, status_code=201)
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(side_effect=[source_response, create_response])
-            mock_get_client.return_value = mock_http_client
+        mock_http.request.side_effect = [source_response, create_response]
 
-            result = await client.clone_session("test-project", "source-1", "my-clone")
+        result = await client.clone_session("test-project", "source-1", "my-clone")
 
-            assert result["created"] is True
-            assert result["session"] == "cloned-abc12"
-            assert result["source_session"] == "source-1"
+        assert result["created"] is True
+        assert result["session"] == "cloned-abc12"
+        assert result["source_session"] == "source-1"
 
 
 class TestUpdateSession:
     """Tests for update_session."""
 
-    @pytest.mark.asyncio
-    async def test_update_session_display_name(self, client: ACPClient) -> None:
+    async def test_update_session_display_name(
+        self, client: ACPClient, mock_http: SimpleNamespace, ok_session_response: SimpleNamespace
+    ) -> None:
         """Should update display name via PATCH."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "session-1", "displayName": "new-name"}
+        mock_http.request.return_value = ok_session_response
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+        result = await client.update_session("test-project", "session-1", display_name="new-name")
 
-            result = await client.update_session("test-project", "session-1", display_name="new-name")
+        assert result["updated"] is True
+        assert "Successfully updated" in result["message"]
 
-            assert result["updated"] is True
-            assert "Successfully updated" in result["message"]
-
-    @pytest.mark.asyncio
-    async def test_update_session_timeout(self, client: ACPClient) -> None:
+    async def test_update_session_timeout(
+        self, client: ACPClient, mock_http: SimpleNamespace, ok_session_response: SimpleNamespace
+    ) -> None:
         """Should update timeout via PATCH."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "session-1", "timeout": 1800}
-
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+        mock_http.request.return_value = ok_session_response
 
-            result = await client.update_session("test-project", "session-1", timeout=1800)
+        result = await client.update_session("test-project", "session-1", timeout=1800)
 
-            assert result["updated"] is True
+        assert result["updated"] is True
 
-    @pytest.mark.asyncio
-    async def test_update_session_dry_run(self, client: ACPClient) -> None:
+    async def test_update_session_dry_run(
+        self, client: ACPClient, mock_http: SimpleNamespace, ok_session_response: SimpleNamespace
+    ) -> None:
         """Dry run should preview update without executing."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "session-1", "displayName": "old-name"}
+        mock_http.request.return_value = ok_session_response
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+        result = await client.update_session("test-project", "session-1", display_name="new-name", dry_run=True)
 
-            result = await client.update_session("test-project", "session-1", display_name="new-name", dry_run=True)
-
-            assert result["dry_run"] is True
-            assert result["success"] is True
-            assert result["patch"] == {"displayName": "new-name"}
+        assert result["dry_run"] is True
+        assert result["success"] is True
+        assert result["patch"] == {"displayName": "new-name"}
 
-    @pytest.mark.asyncio
     async def test_update_session_no_fields_raises(self, client: ACPClient) -> None:
         """Should raise ValueError when no fields provided."""
         with pytest.raises(ValueError, match="No fields to update"):
@@ -573,7 +872,6 @@ class TestUpdateSession:
 class TestCreateSessionFromTemplate:
     """Tests for create_session_from_template."""
 
-    @pytest.mark.asyncio
     async def test_create_from_template_dry_run(self, client: ACPClient) -> None:
         """Dry run should return template manifest."""
         result = await client.create_session_from_template(
@@ -586,12 +884,24 @@ class TestCreateSessionFromTemplate:
         assert result["dry_run"] is True
         assert result["success"] is True
         assert "bugfix" in result["message"]
-        manifest = result["manifest"]
-        assert manifest["displayName"] == "Fix login bug"
-        assert manifest["workflow"] == "bugfix"
-        assert manifest["llmConfig"]["model"] == "claude-sonnet-4"
+        assert result["manifest"] == {
+            "displayName": "Fix login bug",
+            "workflow": "bugfix",
+            "llmConfig": {"model": "claude-sonnet-4", "temperature": 0.3},
+        }
+
+    async def test_create_from_template_manifest_is_independent_copy(self, client: ACPClient) -> None:
+        """Mutating a returned manifest must not change the shared template."""
+        first = await client.create_session_from_template(
+            project="test-project", template="triage", display_name="a", dry_run=True
+        )
+        first["manifest"]["llmConfig"]["temperature"] = 0.0
+
+        second = await client.create_session_from_template(
+            project="test-project", template="triage", display_name="b", dry_run=True
+        )
+        assert second["manifest"]["llmConfig"]["temperature"] == 0.7
 
-    @pytest.mark.asyncio
     async def test_create_from_template_invalid_raises(self, client: ACPClient) -> None:
         """Invalid template name should raise ValueError."""
         with pytest.raises(ValueError, match="Unknown template"):
@@ -601,159 +911,121 @@ class TestCreateSessionFromTemplate:
                 display_name="test",
             )
 
-    @pytest.mark.asyncio
-    async def test_create_from_template_success(self, client: ACPClient) -> None:
+    async def test_create_from_template_success(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
         """Successful template creation should return session info."""
-        mock_response = MagicMock()
-        mock_response.status_code = 201
-        mock_response.json.return_value = {"id": "template-abc12"}
+        mock_response = json_response({"id": "template-abc12"}, status_code=201)
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+        mock_http.request.return_value = mock_response
 
-            result = await client.create_session_from_template(
-                project="test-project",
-                template="triage",
-                display_name="Triage issue",
-            )
+        result = await client.create_session_from_template(
+            project="test-project",
+            template="triage",
+            display_name="Triage issue",
+        )
 
-            assert result["created"] is True
-            assert result["session"] == "template-abc12"
-            assert result["template"] == "triage"
+        assert result["created"] is True
+        assert result["session"] == "template-abc12"
+        assert result["template"] == "triage"
 
 
 class TestGetSessionLogs:
     """Tests for get_session_logs."""
 
-    @pytest.mark.asyncio
-    async def test_get_session_logs_success(self, client: ACPClient) -> None:
+    async def test_get_session_logs_success(self, client: ACPClient, monkeypatch: pytest.MonkeyPatch) -> None:
         """Should return logs text from _request_text."""
-        with patch.object(client, "_request_text", new_callable=AsyncMock, return_value="log line 1\nlog line 2"):
-            result = await client.get_session_logs("test-project", "session-1")
+        monkeypatch.setattr(client, "_request_text", async_returning("log line 1\nlog line 2"))
+
+        result = await client.get_session_logs("test-project", "session-1")
 
-            assert result["logs"] == "log line 1\nlog line 2"
-            assert result["session"] == "session-1"
-            assert result["tail_lines"] == 1000
+        assert result["logs"] == "log line 1\nlog line 2"
+        assert result["session"] == "session-1"
+        assert result["tail_lines"] == 1000
 
-    @pytest.mark.asyncio
-    async def test_get_session_logs_error(self, client: ACPClient) -> None:
+    async def test_get_session_logs_error(self, client: ACPClient, monkeypatch: pytest.MonkeyPatch) -> None:
         """Should return error dict when request fails."""
-        with patch.object(client, "_request_text", new_callable=AsyncMock, side_effect=ValueError("Not found")):
-            result = await client.get_session_logs("test-project", "session-1")
+        monkeypatch.setattr(client, "_request_text", AsyncMock(side_effect=ValueError("Not found")))
 
-            assert result["logs"] == ""
-            assert "Not found" in result["error"]
+        result = await client.get_session_logs("test-project", "session-1")
+
+        assert result["logs"] == ""
+        assert "Not found" in result["error"]
 
-    @pytest.mark.asyncio
     async def test_get_session_logs_tail_lines_limit(self, client: ACPClient) -> None:
         """Should reject tail_lines > 10000."""
         with pytest.raises(ValueError, match="tail_lines cannot exceed 10000"):
             await client.get_session_logs("test-project", "session-1", tail_lines=10001)
 
 
-class TestGetSessionTranscript:
-    """Tests for get_session_transcript."""
+class TestSessionOperationSuccess:
+    """Success paths for single-session reads and label updates."""
+
+    @pytest.mark.parametrize(
+        ("method", "args", "body", "expected"),
+        [
+            (
+                "get_session_transcript",
+                {"format": "json"},
+                {"messages": [{"role": "user", "content": "hello"}]},
+                {"session": "session-1", "format": "json", "messages": [{"role": "user", "content": "hello"}]},
+            ),
+            (
+                "get_session_metrics",
+                {},
+                {"total_tokens": 5000, "duration_seconds": 120, "tool_calls": 15},
+                {"session": "session-1", "total_tokens": 5000, "duration_seconds": 120, "tool_calls": 15},
+            ),
+            (
+                "label_session",
+                {"labels": {"env": "test", "team": "qa"}},
+                {"id": "session-1"},
+                {
+                    "labeled": True,
+                    "labels_added": {"env": "test", "team": "qa"},
+                    "message": "Added 2 label(s) to session 'session-1'",
+                },
+            ),
+            (
+                "unlabel_session",
+                {"label_keys": ["env", "team"]},
+                {"id": "session-1"},
+                {
+                    "unlabeled": True,
+                    "labels_removed": ["env", "team"],
+                    "message": "Removed 2 label(s) from session 'session-1'",
+                },
+            ),
+        ],
+        ids=["transcript", "metrics", "label", "unlabel"],
+    )
+    async def test_success(
+        self,
+        client: ACPClient,
+        mock_http: SimpleNamespace,
+        method: str,
+        args: dict[str, Any],
+        body: dict[str, Any],
+        expected: dict[str, Any],
+    ) -> None:
+        """A 200 response should surface the expected result fields."""
+        mock_http.request.return_value = json_response(body)
+
+        result = await getattr(client, method)("test-project", "session-1", **args)
+
+        assert {key: result.get(key) for key in expected} == expected
 
-    @pytest.mark.asyncio
-    async def test_get_session_transcript_success(self, client: ACPClient) -> None:
-        """Should return transcript data."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "messages": [{"role": "user", "content": "hello"}],
-        }
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
-
-            result = await client.get_session_transcript("test-project", "session-1", format="json")
-
-            assert result["session"] == "session-1"
-            assert result["format"] == "json"
-            assert result["messages"] == [{"role": "user", "content": "hello"}]
+class TestGetSessionTranscript:
+    """Tests for get_session_transcript."""
 
-    @pytest.mark.asyncio
     async def test_get_session_transcript_invalid_format(self, client: ACPClient) -> None:
         """Invalid format should raise ValueError."""
         with pytest.raises(ValueError, match="format must be"):
             await client.get_session_transcript("test-project", "session-1", format="xml")
 
 
-class TestGetSessionMetrics:
-    """Tests for get_session_metrics."""
-
-    @pytest.mark.asyncio
-    async def test_get_session_metrics_success(self, client: ACPClient) -> None:
-        """Should return metrics data."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "total_tokens": 5000,
-            "duration_seconds": 120,
-            "tool_calls": 15,
-        }
-
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
-
-            result = await client.get_session_metrics("test-project", "session-1")
-
-            assert result["session"] == "session-1"
-            assert result["total_tokens"] == 5000
-            assert result["duration_seconds"] == 120
-            assert result["tool_calls"] == 15
-
-
-class TestLabelSession:
-    """Tests for label_session."""
-
-    @pytest.mark.asyncio
-    async def test_label_session_success(self, client: ACPClient) -> None:
-        """Should add labels via PATCH."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "session-1"}
-
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
-
-            result = await client.label_session("test-project", "session-1", {"env": "test", "team": "qa"})
-
-            assert result["labeled"] is True
-            assert result["labels_added"] == {"env": "test", "team": "qa"}
-            assert "2 label(s)" in result["message"]
-
-
 class TestUnlabelSession:
     """Tests for unlabel_session."""
 
-    @pytest.mark.asyncio
-    async def test_unlabel_session_success(self, client: ACPClient) -> None:
-        """Should remove labels via PATCH."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "session-1"}
-
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
-
-            result = await client.unlabel_session("test-project", "session-1", ["env", "team"])
-
-            assert result["unlabeled"] is True
-            assert result["labels_removed"] == ["env", "team"]
-            assert "2 label(s)" in result["message"]
-
-    @pytest.mark.asyncio
     async def test_unlabel_session_empty_keys_raises(self, client: ACPClient) -> None:
         """Should raise ValueError when label_keys is empty."""
         with pytest.raises(ValueError, match="label_keys must not be empty"):
@@ -763,25 +1035,21 @@ class TestUnlabelSession:
 class TestListSessionsByLabel:
     """Tests for list_sessions_by_label."""
 
-    @pytest.mark.asyncio
-    async def test_list_sessions_by_label(self, client: ACPClient) -> None:
+    async def test_list_sessions_by_label(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
         """Should list sessions matching label selectors."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "items": [{"id": "session-1", "status": "running"}],
-        }
+        mock_response = json_response(
+            {
+                "items": [{"id": "session-1", "status": "running"}],
+            }
+        )
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+        mock_http.request.return_value = mock_response
 
-            result = await client.list_sessions_by_label("test-project", {"env": "test"})
+        result = await client.list_sessions_by_label("test-project", {"env": "test"})
 
-            assert result["total"] == 1
-            assert result["sessions"][0]["id"] == "session-1"
-            assert result["labels_filter"] == {"env": "test"}
+        assert result["total"] == 1
+        assert result["sessions"][0]["id"] == "session-1"
+        assert result["labels_filter"] == {"env": "test"}
 
 
 class TestLabelValidation:
@@ -792,182 +1060,201 @@ class TestLabelValidation:
         client._validate_labels({"env": "production", "team": "qa"})
         client._validate_labels({"app.version": "v1.2.3"})
 
-    def test_validate_labels_empty_raises(self, client: ACPClient) -> None:
-        """Empty labels dict should raise ValueError."""
-        with pytest.raises(ValueError, match="Labels must not be empty"):
-            client._validate_labels({})
-
-    def test_validate_labels_invalid_key(self, client: ACPClient) -> None:
-        """Invalid label key should raise ValueError."""
-        with pytest.raises(ValueError, match="Invalid label key"):
-            client._validate_labels({"invalid key!": "value"})
-
-    def test_validate_labels_key_too_long(self, client: ACPClient) -> None:
-        """Label key exceeding 63 chars should raise ValueError."""
-        with pytest.raises(ValueError, match="Invalid label key"):
-            client._validate_labels({"a" * 64: "value"})
-
-    def test_validate_labels_invalid_value(self, client: ACPClient) -> None:
-        """Invalid label value should raise ValueError."""
-        with pytest.raises(ValueError, match="Invalid label value"):
-            client._validate_labels({"key": "invalid value!"})
+    def test_validate_labels_length_boundary(self, client: ACPClient) -> None:
+        """Keys and values of exactly 63 chars should pass."""
+        client._validate_labels({"a" * 63: "b" * 63})
+
+    @pytest.mark.parametrize(
+        ("labels", "match"),
+        [
+            ({}, "Labels must not be empty"),
+            ({"invalid key!": "value"}, RE_INVALID_LABEL_KEY),
+            ({"a" * 64: "value"}, RE_INVALID_LABEL_KEY),
+            ({"key": "invalid value!"}, RE_INVALID_LABEL_VALUE),
+            ({"key": "b" * 64}, RE_INVALID_LABEL_VALUE),
+        ],
+        ids=["empty", "bad-key-chars", "key-too-long", "bad-value-chars", "value-too-long"],
+    )
+    def test_validate_labels_invalid(
+        self, client: ACPClient, labels: dict[str, str], match: str | re.Pattern[str]
+    ) -> None:
+        """One invalid case per axis should raise ValueError."""
+        with pytest.raises(ValueError, match=match):
+            client._validate_labels(labels)
 
 
 class TestBulkDeleteDryRun:
     """Tests for bulk delete dry_run path."""
 
-    @pytest.mark.asyncio
-    async def test_bulk_delete_dry_run(self, client: ACPClient) -> None:
+    async def test_bulk_delete_dry_run(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
         """Dry run should preview deletes without executing."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "s1", "status": "running"}
+        mock_http.request.return_value = S1_RUNNING_RESPONSE
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+        result = await client.bulk_delete_sessions("test-project", ["s1", "s2"], dry_run=True)
 
-            result = await client.bulk_delete_sessions("test-project", ["s1", "s2"], dry_run=True)
+        assert result["dry_run"] is True
+        assert len(result["dry_run_info"]["would_execute"]) == 2
+        assert result["dry_run_info"]["would_execute"][0]["session"] == "s1"
 
-            assert result["dry_run"] is True
-            assert len(result["dry_run_info"]["would_execute"]) == 2
-            assert result["dry_run_info"]["would_execute"][0]["session"] == "s1"
+    async def test_bulk_dry_run_uses_single_list_call(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """Dry run should resolve all sessions from one list request."""
+        mock_response = json_response(
+            {"items": [{"id": "s1", "status": "running"}, {"id": "s2", "status": "stopped"}, {"id": "s3"}]}
+        )
 
+        mock_http.request.return_value = mock_response
 
-class TestBulkDeleteFailure:
-    """Tests for _run_bulk failure path."""
+        result = await client.bulk_stop_sessions("test-project", ["s1", "s2"], dry_run=True)
 
-    @pytest.mark.asyncio
-    async def test_bulk_delete_partial_failure(self, client: ACPClient) -> None:
-        """Individual failures in bulk delete should be collected."""
-        success_response = MagicMock()
-        success_response.status_code = 204
+        assert mock_http.request.call_count == 1
+        would_execute = result["dry_run_info"]["would_execute"]
+        assert [item["info"]["status"] for item in would_execute] == ["running", "stopped"]
 
-        fail_response = MagicMock()
-        fail_response.status_code = 404
-        fail_response.text = "not found"
-        fail_response.json.return_value = {"error": "not found"}
+    async def test_bulk_dry_run_falls_back_to_get_for_unlisted(
+        self, client: ACPClient, mock_http: SimpleNamespace
+    ) -> None:
+        """Sessions missing from the list response should be looked up individually."""
+        list_response = json_response({"items": [{"id": "s1", "status": "running"}]})
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(side_effect=[success_response, fail_response])
-            mock_get_client.return_value = mock_http_client
+        not_found = json_response({"error": "not found"}, status_code=404)
 
-            result = await client.bulk_delete_sessions("test-project", ["s1", "s2"])
+        mock_http.request.side_effect = [list_response, not_found]
 
-            assert "s1" in result["deleted"]
-            assert len(result["failed"]) == 1
-            assert result["failed"][0]["session"] == "s2"
+        result = await client.bulk_delete_sessions("test-project", ["s1", "s2"], dry_run=True)
 
+        assert mock_http.request.call_count == 2
+        assert result["dry_run_info"]["would_execute"][0]["session"] == "s1"
+        assert result["dry_run_info"]["skipped"][0]["session"] == "s2"
 
-class TestBulkByLabel:
-    """Tests for _run_bulk_by_label pipeline."""
 
-    @pytest.mark.asyncio
-    async def test_bulk_delete_by_label(self, client: ACPClient) -> None:
-        """Should resolve labels to sessions, then delete them."""
-        list_response = MagicMock()
-        list_response.status_code = 200
-        list_response.json.return_value = {"items": [{"id": "s1"}, {"id": "s2"}]}
+class TestBulkDeleteFailure:
+    """Tests for _run_bulk failure path."""
+
+    async def test_bulk_delete_partial_failure(self, client: ACPClient, api: respx.MockRouter) -> None:
+        """Individual failures in bulk delete should be collected."""
+        api.delete("/v1/sessions/s1").mock(return_value=httpx.Response(204))
+        api.delete("/v1/sessions/s2").mock(return_value=httpx.Response(404, text="not found"))
 
-        delete_response = MagicMock()
-        delete_response.status_code = 204
+        result = await client.bulk_delete_sessions("test-project", ["s1", "s2"])
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(side_effect=[list_response, delete_response, delete_response])
-            mock_get_client.return_value = mock_http_client
+        assert result["deleted"] == ["s1"]
+        assert len(result["failed"]) == 1
+        assert result["failed"][0]["session"] == "s2"
 
-            result = await client.bulk_delete_sessions_by_label("test-project", {"env": "test"})
 
-            assert "s1" in result["deleted"]
-            assert "s2" in result["deleted"]
-            assert result["labels_filter"] == {"env": "test"}
+class TestBulkByLabel:
+    """Tests for _run_bulk_by_label pipeline."""
 
-    @pytest.mark.asyncio
-    async def test_bulk_delete_by_label_no_matches(self, client: ACPClient) -> None:
+    @pytest.mark.parametrize(
+        ("method", "response", "result_key"),
+        [
+            ("bulk_delete_sessions_by_label", NO_CONTENT_RESPONSE, "deleted"),
+            ("bulk_stop_sessions_by_label", S1_STOPPED_RESPONSE, "stopped"),
+            ("bulk_restart_sessions_by_label", S1_RUNNING_RESPONSE, "restarted"),
+        ],
+        ids=["delete", "stop", "restart"],
+    )
+    async def test_bulk_action_by_label(
+        self, client: ACPClient, mock_http: SimpleNamespace, method: str, response: SimpleNamespace, result_key: str
+    ) -> None:
+        """Should resolve labels to sessions, then act on each of them."""
+        list_response = json_response({"items": [{"id": "s1"}, {"id": "s2"}]})
+        mock_http.request.side_effect = [list_response, response, response]
+
+        result = await getattr(client, method)("test-project", {"team": "qa"})
+
+        assert result[result_key] == ["s1", "s2"]
+        assert result["labels_filter"] == {"team": "qa"}
+
+    async def test_bulk_delete_by_label_no_matches(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
         """Should return empty results when no sessions match labels."""
-        list_response = MagicMock()
-        list_response.status_code = 200
-        list_response.json.return_value = {"items": []}
+        list_response = json_response({"items": []})
+
+        mock_http.request.return_value = list_response
+
+        result = await client.bulk_delete_sessions_by_label("test-project", {"env": "nonexistent"})
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=list_response)
-            mock_get_client.return_value = mock_http_client
+        assert result["deleted"] == []
+        assert result["failed"] == []
+        assert "No sessions match" in result["message"]
 
-            result = await client.bulk_delete_sessions_by_label("test-project", {"env": "nonexistent"})
+    async def test_bulk_by_label_field_projection(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """With projection enabled, only IDs are requested and K8s-style names are accepted."""
+        client.settings.supports_field_projection = True
+        list_response = json_response({"items": [{"id": "s1"}, {"metadata": {"name": "s2"}}, {}]})
+        stop_response = json_response({"status": "stopped"})
 
-            assert result["deleted"] == []
-            assert result["failed"] == []
-            assert "No sessions match" in result["message"]
+        mock_http.request.side_effect = [list_response, stop_response, stop_response]
 
-    @pytest.mark.asyncio
-    async def test_bulk_stop_by_label(self, client: ACPClient) -> None:
-        """Should resolve labels to sessions, then stop them."""
-        list_response = MagicMock()
-        list_response.status_code = 200
-        list_response.json.return_value = {"items": [{"id": "s1"}]}
+        result = await client.bulk_stop_sessions_by_label("test-project", {"team": "qa"})
 
-        stop_response = MagicMock()
-        stop_response.status_code = 200
-        stop_response.json.return_value = {"id": "s1", "status": "stopped"}
+        list_params = mock_http.request.call_args_list[0].kwargs["params"]
+        assert list_params["fields"] == "id"
+        assert result["stopped"] == ["s1", "s2"]
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(side_effect=[list_response, stop_response])
-            mock_get_client.return_value = mock_http_client
+    async def test_bulk_by_label_runs_concurrently(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """Matched sessions should be mutated concurrently after the label query."""
+        list_response = json_response({"items": [{"id": "s1"}, {"id": "s2"}, {"id": "s3"}]})
+        in_flight = 0
+        peak = 0
 
-            result = await client.bulk_stop_sessions_by_label("test-project", {"team": "qa"})
+        async def request(**kwargs):
+            nonlocal in_flight, peak
+            if kwargs["method"] == "GET":
+                return list_response
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return NO_CONTENT_RESPONSE
 
-            assert "s1" in result["stopped"]
-            assert result["labels_filter"] == {"team": "qa"}
+        mock_http.request.side_effect = request
 
-    @pytest.mark.asyncio
-    async def test_bulk_restart_by_label(self, client: ACPClient) -> None:
-        """Should resolve labels to sessions, then restart them."""
-        list_response = MagicMock()
-        list_response.status_code = 200
-        list_response.json.return_value = {"items": [{"id": "s1"}]}
+        result = await client.bulk_delete_sessions_by_label("test-project", {"env": "test"})
 
-        restart_response = MagicMock()
-        restart_response.status_code = 200
-        restart_response.json.return_value = {"id": "s1", "status": "running"}
+        assert result["deleted"] == ["s1", "s2", "s3"]
+        assert peak == 3
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(side_effect=[list_response, restart_response])
-            mock_get_client.return_value = mock_http_client
+    async def test_bulk_by_label_dry_run_single_request(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """A dry run should reuse the label query results instead of listing again."""
+        client.settings.supports_field_projection = True
+        list_response = json_response({"items": [{"id": "s1", "status": "running"}, {"id": "s2", "status": "stopped"}]})
 
-            result = await client.bulk_restart_sessions_by_label("test-project", {"team": "qa"})
+        mock_http.request.return_value = list_response
 
-            assert "s1" in result["restarted"]
-            assert result["labels_filter"] == {"team": "qa"}
+        result = await client.bulk_delete_sessions_by_label("test-project", {"env": "test"}, dry_run=True)
+
+        assert mock_http.request.call_count == 1
+        assert "fields" not in mock_http.request.call_args.kwargs["params"]
+        would_execute = result["dry_run_info"]["would_execute"]
+        assert [item["session"] for item in would_execute] == ["s1", "s2"]
+        assert would_execute[0]["info"]["status"] == "running"
 
 
 class TestBulkLabelSessions:
     """Tests for bulk_label_sessions."""
 
-    @pytest.mark.asyncio
-    async def test_bulk_label_sessions_success(self, client: ACPClient) -> None:
+    async def test_bulk_label_sessions_success(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
         """Should label multiple sessions."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "s1"}
+        mock_http.request.return_value = S1_RUNNING_RESPONSE
+
+        result = await client.bulk_label_sessions("test-project", ["s1", "s2"], {"env": "test"})
+
+        assert "s1" in result["labeled"]
+        assert "s2" in result["labeled"]
+        assert result["labels"] == {"env": "test"}
 
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+    async def test_bulk_label_sessions_partial_failure(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
+        """A failed session should be reported without dropping the others."""
+        fail_response = json_response({"error": "not found"}, status_code=404)
 
-            result = await client.bulk_label_sessions("test-project", ["s1", "s2"], {"env": "test"})
+        mock_http.request.side_effect = [S1_RUNNING_RESPONSE, fail_response, S1_RUNNING_RESPONSE]
 
-            assert "s1" in result["labeled"]
-            assert "s2" in result["labeled"]
-            assert result["labels"] == {"env": "test"}
+        result = await client.bulk_label_sessions("test-project", ["s1", "s2", "s3"], {"env": "test"})
+
+        assert result["labeled"] == ["s1", "s3"]
+        assert result["failed"] == [{"session": "s2", "error": "not found"}]
 
-    @pytest.mark.asyncio
     async def test_bulk_label_sessions_dry_run(self, client: ACPClient) -> None:
         """Dry run should preview labeling without executing."""
         result = await client.bulk_label_sessions("test-project", ["s1", "s2"], {"env": "test"}, dry_run=True)
@@ -981,25 +1268,16 @@ class TestBulkLabelSessions:
 class TestBulkUnlabelSessions:
     """Tests for bulk_unlabel_sessions."""
 
-    @pytest.mark.asyncio
-    async def test_bulk_unlabel_sessions_success(self, client: ACPClient) -> None:
+    async def test_bulk_unlabel_sessions_success(self, client: ACPClient, mock_http: SimpleNamespace) -> None:
         """Should remove labels from multiple sessions."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "s1"}
-
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
+        mock_http.request.return_value = S1_RUNNING_RESPONSE
 
-            result = await client.bulk_unlabel_sessions("test-project", ["s1", "s2"], ["env", "team"])
+        result = await client.bulk_unlabel_sessions("test-project", ["s1", "s2"], ["env", "team"])
 
-            assert "s1" in result["unlabeled"]
-            assert "s2" in result["unlabeled"]
-            assert result["label_keys"] == ["env", "team"]
+        assert "s1" in result["unlabeled"]
+        assert "s2" in result["unlabeled"]
+        assert result["label_keys"] == ["env", "team"]
 
-    @pytest.mark.asyncio
     async def test_bulk_unlabel_sessions_dry_run(self, client: ACPClient) -> None:
         """Dry run should preview unlabeling without executing."""
         result = await client.bulk_unlabel_sessions("test-project", ["s1", "s2"], ["env"], dry_run=True)
@@ -1010,54 +1288,9 @@ class TestBulkUnlabelSessions:
         assert "Would remove 1 label(s) from 2 session(s)" in result["message"]
 
 
-class TestBulkStopSessions:
-    """Tests for bulk_stop_sessions."""
-
-    @pytest.mark.asyncio
-    async def test_bulk_stop_sessions(self, client: ACPClient) -> None:
-        """Should stop multiple sessions."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "s1", "status": "stopped"}
-
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
-
-            result = await client.bulk_stop_sessions("test-project", ["s1", "s2"])
-
-            assert len(result["stopped"]) == 2
-            assert "s1" in result["stopped"]
-            assert "s2" in result["stopped"]
-
-
-class TestBulkRestartSessions:
-    """Tests for bulk_restart_sessions."""
-
-    @pytest.mark.asyncio
-    async def test_bulk_restart_sessions(self, client: ACPClient) -> None:
-        """Should restart multiple sessions."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"id": "s1", "status": "running"}
-
-        with patch.object(client, "_get_http_client") as mock_get_client:
-            mock_http_client = AsyncMock()
-            mock_http_client.request = AsyncMock(return_value=mock_response)
-            mock_get_client.return_value = mock_http_client
-
-            result = await client.bulk_restart_sessions("test-project", ["s1", "s2"])
-
-            assert len(result["restarted"]) == 2
-            assert "s1" in result["restarted"]
-            assert "s2" in result["restarted"]
-
-
 class TestLogin:
     """Tests for login."""
 
-    @pytest.mark.asyncio
     async def test_login_success(self, client: ACPClient) -> None:
         """Should authenticate to a cluster with a token."""
         result = await client.login("test-cluster", token="new-token")
@@ -1066,7 +1299,28 @@ class TestLogin:
         assert result["cluster"] == "test-cluster"
         assert "Successfully authenticated" in result["message"]
 
-    @pytest.mark.asyncio
+    async def test_login_replaces_pooled_client(self, client: ACPClient) -> None:
+        """Login with a new token should retire the client bound to the old token."""
+        old_http_client = await client._get_http_client("test-cluster")
+
+        await client.login("test-cluster", token="rotated-token")
+        new_http_client = await client._get_http_client("test-cluster")
+
+        assert old_http_client.is_closed
+        assert new_http_client.headers["Authorization"] == "Bearer rotated-token"
+        await client.close()
+
+    async def test_login_leaves_default_cluster(self, client: ACPClient) -> None:
+        """Login to a non-default cluster should not touch the default cluster."""
+        other = ClusterConfig(server="https://other.example.com", default_project="p", description="")
+        client.clusters_config.clusters["other-cluster"] = other
+
+        result = await client.login("other-cluster", token="other-token")
+
+        assert result["authenticated"] is True
+        assert result["server"] == "https://other.example.com"
+        assert client.clusters_config.default_cluster == "test-cluster"
+
     async def test_login_unknown_cluster(self, client: ACPClient) -> None:
         """Should fail for unknown cluster."""
         result = await client.login("nonexistent-cluster")
@@ -1,5 +1,13 @@
 """Tests for output formatters."""
 
+import copy
+import importlib
+import json
+import sys
+
+import pytest
+
+from mcp_acp import formatters
 from mcp_acp.formatters import (
     format_bulk_result,
     format_clusters,
@@ -14,6 +22,136 @@ from mcp_acp.formatters import (
     format_whoami,
 )
 
+SESSIONS_LIST_RESULT = {
+    "total": 2,
+    "filters_applied": {"status": "running"},
+    "sessions": [
+        {"id": "session-1", "status": "running", "createdAt": "2024-01-20T10:00:00Z"},
+        {"id": "session-2", "status": "running", "createdAt": "2024-01-21T10:00:00Z"},
+    ],
+}
+
+BULK_DELETE_DRY_RUN_RESULT = {
+    "dry_run": True,
+    "dry_run_info": {
+        "would_execute": [
+            {"session": "session-1", "info": {"status": "stopped"}},
+            {"session": "session-2", "info": {"status": "stopped"}},
+        ],
+        "skipped": [],
+    },
+}
+
+CLUSTERS_RESULT = {
+    "clusters": [
+        {
+            "name": "test-cluster",
+            "server": "https://api.test.example.com",
+            "description": "Test Cluster",
+            "default_project": "test-workspace",
+            "is_default": True,
+        },
+    ],
+    "default_cluster": "test-cluster",
+}
+
+
+GOLDEN_BULK_DELETE_DRY_RUN = (
+    "DRY RUN MODE - No changes made\n\n"
+    "Would delete 2 session(s):\n"
+    "  - session-1\n"
+    "    Status: stopped\n"
+    "  - session-2\n"
+    "    Status: stopped\n"
+)
+
+GOLDEN_CLUSTERS = (
+    "Configured Clusters (default: test-cluster):\n\n"
+    "- test-cluster [DEFAULT]\n"
+    "  Server: https://api.test.example.com\n"
+    "  Description: Test Cluster\n"
+    "  Default Project: test-workspace\n\n"
+)
+
+
+def assert_all_in(output: str, needles: list[str]) -> None:
+    """Assert every needle appears in output, reporting all missing ones at once."""
+    missing = [needle for needle in needles if needle not in output]
+    assert not missing, f"missing {missing!r} in:\n{output}"
+
+
+RESULT_WITH_UNICODE = {"id": "session-1", "displayName": "Café ☕", "spec": {"repos": ["a", "b"], "timeout": 60}}
+
+GOLDEN_RESULT_COMPACT = '{"id":"session-1","displayName":"Café ☕","spec":{"repos":["a","b"],"timeout":60}}'
+
+GOLDEN_RESULT_INDENTED = (
+    "{\n"
+    '  "id": "session-1",\n'
+    '  "displayName": "Café ☕",\n'
+    '  "spec": {\n'
+    '    "repos": [\n'
+    '      "a",\n'
+    '      "b"\n'
+    "    ],\n"
+    '    "timeout": 60\n'
+    "  }\n"
+    "}"
+)
+
+
+@pytest.fixture(params=["default", "stdlib"])
+def json_formatters(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch):
+    """The formatters module as imported, and reloaded with orjson blocked."""
+    if request.param == "default":
+        yield formatters
+        return
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    yield importlib.reload(formatters)
+    monkeypatch.undo()
+    importlib.reload(formatters)
+
+
+class TestJsonBackends:
+    """JSON output should not depend on whether orjson is installed."""
+
+    def test_filters_compact(self, json_formatters) -> None:
+        """Filter summaries should be compact JSON."""
+        result = {**SESSIONS_LIST_RESULT, "labels_filter": {"env": "test"}}
+
+        output = json_formatters.format_sessions_list(result)
+
+        assert_all_in(output, ['Filters applied: {"status":"running"}', 'Label filter: {"env":"test"}'])
+
+    @pytest.mark.parametrize(
+        ("compact", "expected"),
+        [(False, GOLDEN_RESULT_INDENTED), (True, GOLDEN_RESULT_COMPACT)],
+        ids=["indented", "compact"],
+    )
+    def test_result_json(self, json_formatters, compact: bool, expected: str) -> None:
+        """Result JSON, including non-ASCII text, should match the golden output."""
+        assert json_formatters.format_result(RESULT_WITH_UNICODE, compact=compact) == expected
+
+
+class TestSharedResults:
+    """Formatters must not mutate their input, so module-level results can be shared."""
+
+    @pytest.mark.parametrize(
+        ("formatter", "result"),
+        [
+            (format_sessions_list, SESSIONS_LIST_RESULT),
+            (lambda r: format_bulk_result(r, "delete"), BULK_DELETE_DRY_RUN_RESULT),
+            (format_clusters, CLUSTERS_RESULT),
+        ],
+        ids=["sessions-list", "bulk-dry-run", "clusters"],
+    )
+    def test_formatter_leaves_result_unchanged(self, formatter, result: dict) -> None:
+        """Test formatting leaves the shared result untouched."""
+        before = copy.deepcopy(result)
+
+        formatter(result)
+
+        assert result == before
+
 
 class TestFormatResult:
     """Tests for format_result."""
@@ -28,9 +166,7 @@ class TestFormatResult:
 
         output = format_result(result)
 
-        assert "DRY RUN MODE" in output
-        assert "Would delete session" in output
-        assert "test-session" in output
+        assert_all_in(output, ["DRY RUN MODE", "Would delete session", "test-session"])
 
     def test_format_result_normal(self) -> None:
         """Test formatting normal result."""
@@ -46,21 +182,37 @@ class TestFormatSessionsList:
 
     def test_format_sessions_list(self) -> None:
         """Test formatting sessions list."""
+        output = format_sessions_list(SESSIONS_LIST_RESULT)
+
+        assert_all_in(output, ["Found 2 session(s)", "session-1", "session-2", "running"])
+
+    def test_format_sessions_list_truncates_long_task(self) -> None:
+        """Test long tasks are cut at 50 characters and short ones are left alone."""
         result = {
             "total": 2,
-            "filters_applied": {"status": "running"},
+            "sessions": [{"id": "long", "task": "x" * 60}, {"id": "short", "task": "y" * 50}],
+        }
+
+        output = format_sessions_list(result)
+
+        assert f"Task: {'x' * 50}...\n" in output
+        assert f"Task: {'y' * 50}\n" in output
+
+    def test_format_sessions_list_k8s_format(self) -> None:
+        """Test raw K8s objects render their name, phase and creation time."""
+        result = {
+            "total": 1,
             "sessions": [
-                {"id": "session-1", "status": "running", "createdAt": "2024-01-20T10:00:00Z"},
-                {"id": "session-2", "status": "running", "createdAt": "2024-01-21T10:00:00Z"},
+                {
+                    "metadata": {"name": "k8s-session", "creationTimestamp": "2024-01-20T10:00:00Z"},
+                    "status": {"phase": "Running"},
+                }
             ],
         }
 
         output = format_sessions_list(result)
 
-        assert "Found 2 session(s)" in output
-        assert "session-1" in output
-        assert "session-2" in output
-        assert "running" in output
+        assert_all_in(output, ["- k8s-session", "Status: Running", "Created: 2024-01-20T10:00:00Z"])
 
     def test_format_sessions_list_empty(self) -> None:
         """Test formatting empty sessions list."""
@@ -69,6 +221,17 @@ class TestFormatSessionsList:
         output = format_sessions_list(result)
 
         assert "Found 0 session(s)" in output
+        assert "Sessions:" not in output
+
+    def test_format_sessions_list_empty_keeps_filters(self) -> None:
+        """Test an empty result still reports which filters produced it."""
+        result = {"total": 0, "filters_applied": {"status": "running"}, "sessions": []}
+
+        output = format_sessions_list(result)
+
+        assert output.startswith("Found 0 session(s)\nFilters applied: ")
+        assert "running" in output
+        assert "Sessions:" not in output
 
 
 class TestFormatBulkResult:
@@ -76,23 +239,7 @@ class TestFormatBulkResult:
 
     def test_format_bulk_result_dry_run(self) -> None:
         """Test formatting bulk delete dry run."""
-        result = {
-            "dry_run": True,
-            "dry_run_info": {
-                "would_execute": [
-                    {"session": "session-1", "info": {"status": "stopped"}},
-                    {"session": "session-2", "info": {"status": "stopped"}},
-                ],
-                "skipped": [],
-            },
-        }
-
-        output = format_bulk_result(result, "delete")
-
-        assert "DRY RUN MODE" in output
-        assert "Would delete 2 session(s)" in output
-        assert "session-1" in output
-        assert "session-2" in output
+        assert format_bulk_result(BULK_DELETE_DRY_RUN_RESULT, "delete") == GOLDEN_BULK_DELETE_DRY_RUN
 
     def test_format_bulk_result_success(self) -> None:
         """Test formatting bulk delete success."""
@@ -103,9 +250,7 @@ class TestFormatBulkResult:
 
         output = format_bulk_result(result, "delete")
 
-        assert "Successfully deleted 2 session(s)" in output
-        assert "session-1" in output
-        assert "session-2" in output
+        assert_all_in(output, ["Successfully deleted 2 session(s)", "session-1", "session-2"])
 
     def test_format_bulk_result_with_failures(self) -> None:
         """Test formatting bulk delete with failures."""
@@ -116,10 +261,7 @@ class TestFormatBulkResult:
 
         output = format_bulk_result(result, "delete")
 
-        assert "Successfully deleted 1 session(s)" in output
-        assert "Failed" in output
-        assert "session-2" in output
-        assert "Not found" in output
+        assert_all_in(output, ["Successfully deleted 1 session(s)", "Failed", "session-2", "Not found"])
 
 
 class TestFormatClusters:
@@ -127,24 +269,7 @@ class TestFormatClusters:
 
     def test_format_clusters(self) -> None:
         """Test formatting clusters list."""
-        result = {
-            "clusters": [
-                {
-                    "name": "test-cluster",
-                    "server": "https://api.test.example.com",
-                    "description": "Test Cluster",
-                    "default_project": "test-workspace",
-                    "is_default": True,
-                },
-            ],
-            "default_cluster": "test-cluster",
-        }
-
-        output = format_clusters(result)
-
-        assert "test-cluster [DEFAULT]" in output
-        assert "https://api.test.example.com" in output
-        assert "Test Cluster" in output
+        assert format_clusters(CLUSTERS_RESULT) == GOLDEN_CLUSTERS
 
     def test_format_clusters_empty(self) -> None:
         """Test formatting empty clusters list."""
@@ -170,10 +295,15 @@ class TestFormatWhoami:
 
         output = format_whoami(result)
 
-        assert "Token Configured: Yes" in output
-        assert "Cluster: test-cluster" in output
-        assert "Server: https://api.test.example.com" in output
-        assert "Project: test-workspace" in output
+        assert_all_in(
+            output,
+            [
+                "Token Configured: Yes",
+                "Cluster: test-cluster",
+                "Server: https://api.test.example.com",
+                "Project: test-workspace",
+            ],
+        )
 
     def test_format_whoami_not_authenticated(self) -> None:
         """Test formatting whoami when not authenticated."""
@@ -194,37 +324,30 @@ class TestFormatWhoami:
 class TestFormatLogs:
     """Tests for format_logs."""
 
-    def test_format_logs_with_content(self) -> None:
-        """Test formatting logs with actual content."""
-        result = {
-            "logs": "2024-01-20 Starting session\n2024-01-20 Running tests",
-            "session": "session-1",
-            "tail_lines": 1000,
-        }
-
-        output = format_logs(result)
-
-        assert "Logs for session 'session-1'" in output
-        assert "tail: 1000" in output
-        assert "Starting session" in output
-        assert "Running tests" in output
-
-    def test_format_logs_empty(self) -> None:
-        """Test formatting logs with no content."""
-        result = {"logs": "", "session": "session-1", "tail_lines": 100}
-
-        output = format_logs(result)
-
-        assert "(no logs available)" in output
-
-    def test_format_logs_error(self) -> None:
-        """Test formatting logs with error."""
-        result = {"logs": "", "error": "Session not found", "session": "session-1"}
-
+    @pytest.mark.parametrize(
+        ("result", "expected"),
+        [
+            (
+                {
+                    "logs": "2024-01-20 Starting session\n2024-01-20 Running tests",
+                    "session": "session-1",
+                    "tail_lines": 1000,
+                },
+                ["Logs for session 'session-1'", "tail: 1000", "Starting session", "Running tests"],
+            ),
+            ({"logs": "", "session": "session-1", "tail_lines": 100}, ["(no logs available)"]),
+            (
+                {"logs": "", "error": "Session not found", "session": "session-1"},
+                ["Error retrieving logs", "Session not found"],
+            ),
+        ],
+        ids=["with-content", "empty", "error"],
+    )
+    def test_format_logs(self, result: dict, expected: list[str]) -> None:
+        """Test each log result shape renders its key lines."""
         output = format_logs(result)
 
-        assert "Error retrieving logs" in output
-        assert "Session not found" in output
+        assert_all_in(output, expected)
 
 
 class TestFormatTranscript:
@@ -247,6 +370,18 @@ class TestFormatTranscript:
         assert "format: json" in output
         assert '"role": "user"' in output
         assert '"content": "hello"' in output
+        assert json.dumps(result["messages"], indent=2) in output
+
+    def test_format_transcript_compact(self) -> None:
+        """Test compact mode emits single-line JSON and serialized transcripts pass through."""
+        messages = [{"role": "user", "content": "hello"}]
+
+        compact = format_transcript({"session": "s", "messages": messages}, compact=True)
+        passthrough = format_transcript({"session": "s", "messages": '[{"role":"user"}]'})
+
+        assert json.loads(compact.split("\n\n", 1)[1]) == messages
+        assert "\n" not in compact.split("\n\n", 1)[1]
+        assert passthrough.endswith('[{"role":"user"}]')
 
     def test_format_transcript_markdown(self) -> None:
         """Test formatting transcript in Markdown format."""
@@ -258,9 +393,7 @@ class TestFormatTranscript:
 
         output = format_transcript(result)
 
-        assert "Transcript for session 'session-1'" in output
-        assert "format: markdown" in output
-        assert "## User" in output
+        assert_all_in(output, ["Transcript for session 'session-1'", "format: markdown", "## User"])
 
     def test_format_transcript_empty(self) -> None:
         """Test formatting empty transcript."""
@@ -285,143 +418,129 @@ class TestFormatMetrics:
 
         output = format_metrics(result)
 
-        assert "Metrics for session 'session-1'" in output
-        assert "Total Tokens: 5000" in output
-        assert "Duration Seconds: 120" in output
-        assert "Tool Calls: 15" in output
-
-
-class TestFormatLabels:
-    """Tests for format_labels."""
-
-    def test_format_labels_single_label(self) -> None:
-        """Test formatting single label result."""
-        result = {
-            "labeled": True,
-            "session": "session-1",
-            "labels_added": {"env": "test"},
-            "message": "Added 1 label(s) to session 'session-1'",
-        }
-
-        output = format_labels(result)
+        assert_all_in(
+            output, ["Metrics for session 'session-1'", "Total Tokens: 5000", "Duration Seconds: 120", "Tool Calls: 15"]
+        )
 
-        assert "Added 1 label(s)" in output
+    def test_format_metrics_unknown_key(self) -> None:
+        """Test keys outside the known metric set are still title-cased."""
+        output = format_metrics({"session": "session-1", "cache_read_tokens": 42})
 
-    def test_format_labels_single_unlabel(self) -> None:
-        """Test formatting single unlabel result."""
-        result = {
-            "unlabeled": True,
-            "session": "session-1",
-            "labels_removed": ["env"],
-            "message": "Removed 1 label(s) from session 'session-1'",
-        }
-
-        output = format_labels(result)
+        assert "Cache Read Tokens: 42" in output
 
-        assert "Removed 1 label(s)" in output
 
-    def test_format_labels_bulk(self) -> None:
-        """Test formatting bulk label result."""
-        result = {
-            "labeled": ["s1", "s2"],
-            "failed": [],
-            "labels": {"env": "test"},
-        }
+class TestFormatLabels:
+    """Tests for format_labels."""
 
+    @pytest.mark.parametrize(
+        ("result", "expected"),
+        [
+            (
+                {
+                    "labeled": True,
+                    "session": "session-1",
+                    "labels_added": {"env": "test"},
+                    "message": "Added 1 label(s) to session 'session-1'",
+                },
+                ["Added 1 label(s)"],
+            ),
+            (
+                {
+                    "unlabeled": True,
+                    "session": "session-1",
+                    "labels_removed": ["env"],
+                    "message": "Removed 1 label(s) from session 'session-1'",
+                },
+                ["Removed 1 label(s)"],
+            ),
+            (
+                {"labeled": [], "failed": [{"session": "s1", "error": "not found"}], "labels": {"env": "dev"}},
+                ["Successfully labeled 0 session(s)", "s1: not found"],
+            ),
+            (
+                {"labeled": ["s1", "s2"], "failed": [], "labels": {"env": "test"}},
+                ["Successfully labeled 2 session(s)"],
+            ),
+        ],
+        ids=["single-label", "single-unlabel", "bulk-all-failed", "bulk"],
+    )
+    def test_format_labels(self, result: dict, expected: list[str]) -> None:
+        """Test single and bulk label results render their summaries."""
         output = format_labels(result)
 
-        assert "Successfully labeled 2 session(s)" in output
+        assert_all_in(output, expected)
 
 
 class TestFormatLogin:
     """Tests for format_login."""
 
-    def test_format_login_success(self) -> None:
-        """Test formatting successful login."""
-        result = {
-            "authenticated": True,
-            "cluster": "test-cluster",
-            "server": "https://api.test.example.com",
-            "message": "Successfully authenticated",
-        }
-
-        output = format_login(result)
-
-        assert "Authentication successful" in output
-        assert "Cluster: test-cluster" in output
-        assert "Server: https://api.test.example.com" in output
-
-    def test_format_login_failure(self) -> None:
-        """Test formatting failed login."""
-        result = {
-            "authenticated": False,
-            "cluster": "test-cluster",
-            "message": "Invalid token",
-        }
-
+    @pytest.mark.parametrize(
+        ("result", "expected"),
+        [
+            (
+                {
+                    "authenticated": True,
+                    "cluster": "test-cluster",
+                    "server": "https://api.test.example.com",
+                    "message": "Successfully authenticated",
+                },
+                ["Authentication successful", "Cluster: test-cluster", "Server: https://api.test.example.com"],
+            ),
+            (
+                {"authenticated": False, "cluster": "test-cluster", "message": "Invalid token"},
+                ["Authentication failed", "Invalid token"],
+            ),
+        ],
+        ids=["success", "failure"],
+    )
+    def test_format_login(self, result: dict, expected: list[str]) -> None:
+        """Test successful and failed logins render their status."""
         output = format_login(result)
 
-        assert "Authentication failed" in output
-        assert "Invalid token" in output
+        assert_all_in(output, expected)
 
 
 class TestFormatSessionCreated:
     """Tests for format_session_created."""
 
-    def test_format_session_created_from_template(self) -> None:
-        """Test formatting session created from template."""
-        result = {
-            "created": True,
-            "session": "template-abc12",
-            "project": "test-project",
-            "template": "bugfix",
-            "message": "Session created from template",
-        }
-
-        output = format_session_created(result)
-
-        assert "Session created: template-abc12" in output
-        assert "Project: test-project" in output
-        assert "Template: bugfix" in output
-
-    def test_format_session_created_from_clone(self) -> None:
-        """Test formatting session created from clone."""
-        result = {
-            "created": True,
-            "session": "cloned-abc12",
-            "project": "test-project",
-            "source_session": "source-1",
-            "message": "Session cloned",
-        }
-
-        output = format_session_created(result)
-
-        assert "Session created: cloned-abc12" in output
-        assert "Cloned from: source-1" in output
-
-    def test_format_session_created_dry_run(self) -> None:
-        """Test formatting session creation dry run."""
-        result = {
-            "dry_run": True,
-            "success": True,
-            "message": "Would create session",
-            "manifest": {"initialPrompt": "test", "timeout": 900},
-        }
-
-        output = format_session_created(result)
-
-        assert "DRY RUN MODE" in output
-        assert "Would create session" in output
-        assert "Manifest:" in output
-
-    def test_format_session_created_failure(self) -> None:
-        """Test formatting session creation failure."""
-        result = {
-            "created": False,
-            "message": "Invalid spec",
-        }
-
+    @pytest.mark.parametrize(
+        ("result", "expected"),
+        [
+            (
+                {
+                    "created": True,
+                    "session": "template-abc12",
+                    "project": "test-project",
+                    "template": "bugfix",
+                    "message": "Session created from template",
+                },
+                ["Session created: template-abc12", "Project: test-project", "Template: bugfix"],
+            ),
+            (
+                {
+                    "created": True,
+                    "session": "cloned-abc12",
+                    "project": "test-project",
+                    "source_session": "source-1",
+                    "message": "Session cloned",
+                },
+                ["Session created: cloned-abc12", "Cloned from: source-1"],
+            ),
+            (
+                {
+                    "dry_run": True,
+                    "success": True,
+                    "message": "Would create session",
+                    "manifest": {"initialPrompt": "test", "timeout": 900},
+                },
+                ["DRY RUN MODE", "Would create session", "Manifest:"],
+            ),
+            ({"created": False, "message": "Invalid spec"}, ["Failed to create session", "Invalid spec"]),
+        ],
+        ids=["from-template", "from-clone", "dry-run", "failure"],
+    )
+    def test_format_session_created(self, result: dict, expected: list[str]) -> None:
+        """Test each creation result shape renders its key lines."""
         output = format_session_created(result)
 
-        assert "Failed to create session" in output
-        assert "Invalid spec" in output
+        assert_all_in(output, expected)
@@ -1,802 +1,653 @@
 """Tests for MCP server."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
+from mcp.types import ListToolsResult, TextContent, Tool
+
+from mcp_acp.client import ACPClient
+from mcp_acp.server import MAX_TEXT_BLOCK_CHARS, call_tool, list_tools, main, run
+
+EXPECTED_TOOL_NAMES = frozenset(
+    {
+        # Session management tools (stop is via PATCH, no dedicated tool name)
+        "acp_list_sessions",
+        "acp_get_session",
+        "acp_create_session",
+        "acp_create_session_from_template",
+        "acp_delete_session",
+        "acp_restart_session",
+        "acp_clone_session",
+        "acp_update_session",
+        # Observability tools
+        "acp_get_session_logs",
+        "acp_get_session_transcript",
+        "acp_get_session_metrics",
+        # Label tools
+        "acp_label_resource",
+        "acp_unlabel_resource",
+        "acp_list_sessions_by_label",
+        "acp_bulk_label_resources",
+        "acp_bulk_unlabel_resources",
+        # Bulk operation tools
+        "acp_bulk_delete_sessions",
+        "acp_bulk_stop_sessions",
+        "acp_bulk_restart_sessions",
+        "acp_bulk_delete_sessions_by_label",
+        "acp_bulk_stop_sessions_by_label",
+        "acp_bulk_restart_sessions_by_label",
+        # Cluster tools
+        "acp_list_clusters",
+        "acp_whoami",
+        "acp_switch_cluster",
+        "acp_login",
+    }
+)
 
-from mcp_acp.server import call_tool, list_tools
 
+def assert_reply(result: list[TextContent], needle: str) -> None:
+    """Assert call_tool returned a single text block containing needle."""
+    assert len(result) == 1, result
+    assert needle in result[0].text, result[0].text
 
-class TestListTools:
-    """Tests for list_tools."""
 
-    @pytest.mark.asyncio
-    async def test_list_tools_returns_all_tools(self) -> None:
-        """Test listing available tools."""
-        tools = await list_tools()
-        tool_names = [t.name for t in tools]
-
-        # Session management tools
-        assert "acp_list_sessions" in tool_names
-        assert "acp_get_session" in tool_names
-        assert "acp_create_session" in tool_names
-        assert "acp_create_session_from_template" in tool_names
-        assert "acp_delete_session" in tool_names
-        assert "acp_restart_session" in tool_names
-        assert "acp_clone_session" in tool_names
-        assert "acp_update_session" in tool_names
-        assert "acp_stop_session" not in tool_names  # stop is via PATCH, no dedicated tool name
+@pytest.fixture(scope="session")
+async def all_tools() -> list[Tool]:
+    """List the server's tools once for the session."""
+    return await list_tools()
 
-        # Observability tools
-        assert "acp_get_session_logs" in tool_names
-        assert "acp_get_session_transcript" in tool_names
-        assert "acp_get_session_metrics" in tool_names
 
-        # Label tools
-        assert "acp_label_resource" in tool_names
-        assert "acp_unlabel_resource" in tool_names
-        assert "acp_list_sessions_by_label" in tool_names
-        assert "acp_bulk_label_resources" in tool_names
-        assert "acp_bulk_unlabel_resources" in tool_names
+@pytest.fixture(scope="module")
+def client_stub() -> Mock:
+    """A client stub spec'd against ACPClient, reused across the module."""
+    return Mock(spec=ACPClient)
 
-        # Bulk operation tools
-        assert "acp_bulk_delete_sessions" in tool_names
-        assert "acp_bulk_stop_sessions" in tool_names
-        assert "acp_bulk_restart_sessions" in tool_names
-        assert "acp_bulk_delete_sessions_by_label" in tool_names
-        assert "acp_bulk_stop_sessions_by_label" in tool_names
-        assert "acp_bulk_restart_sessions_by_label" in tool_names
 
-        # Cluster tools
-        assert "acp_list_clusters" in tool_names
-        assert "acp_whoami" in tool_names
-        assert "acp_switch_cluster" in tool_names
-        assert "acp_login" in tool_names
+@pytest.fixture
+def mock_client(monkeypatch: pytest.MonkeyPatch, client_stub: Mock) -> Mock:
+    """Reset the client stub, default project test-project, and serve it from get_client."""
+    client_stub.reset_mock(return_value=True, side_effect=True)
+    client_stub.default_project = "test-project"
+    monkeypatch.setattr("mcp_acp.server.get_client", lambda: client_stub)
+    return client_stub
 
-    @pytest.mark.asyncio
-    async def test_list_tools_count(self) -> None:
-        """Test correct number of tools."""
-        tools = await list_tools()
-        assert len(tools) == 26
 
+@pytest.fixture
+def mock_logger(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Replace the server logger with a mock."""
+    logger = MagicMock()
+    monkeypatch.setattr("mcp_acp.server.logger", logger)
+    return logger
 
-class TestCallTool:
-    """Tests for call_tool."""
 
-    @pytest.mark.asyncio
-    async def test_call_tool_list_sessions(self) -> None:
-        """Test calling list sessions tool."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.list_sessions = AsyncMock(
-            return_value={
-                "total": 1,
-                "filters_applied": {},
-                "sessions": [{"id": "test-session", "status": "running", "createdAt": "2024-01-01T00:00:00Z"}],
-            }
-        )
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool("acp_list_sessions", {"project": "test-project"})
-
-            assert len(result) == 1
-            assert "test-session" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_call_tool_delete_session(self) -> None:
-        """Test calling delete session tool."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.delete_session = AsyncMock(return_value={"deleted": True, "message": "Success"})
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool("acp_delete_session", {"project": "test-project", "session": "test-session"})
-
-            assert len(result) == 1
-            assert "Success" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_call_tool_create_session(self) -> None:
-        """Test calling create session tool."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.create_session = AsyncMock(
-            return_value={
-                "created": True,
-                "session": "compiled-abc12",
-                "project": "test-project",
-                "message": "Session 'compiled-abc12' created in project 'test-project'",
-            }
-        )
+class TestListTools:
+    """Tests for list_tools."""
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_create_session",
-                {"project": "test-project", "initial_prompt": "Run tests"},
-            )
-
-            assert len(result) == 1
-            assert "compiled-abc12" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_call_tool_bulk_delete_requires_confirm(self) -> None:
-        """Test bulk delete requires confirm flag."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_delete_sessions",
-                {"project": "test-project", "sessions": ["s1", "s2"]},
-            )
-
-            assert "requires confirm=true" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_call_tool_bulk_delete_with_confirm(self) -> None:
-        """Test bulk delete with confirm flag."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.bulk_delete_sessions = AsyncMock(return_value={"deleted": ["s1", "s2"], "failed": []})
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_delete_sessions",
-                {"project": "test-project", "sessions": ["s1", "s2"], "confirm": True},
-            )
-
-            assert len(result) == 1
-            assert "Successfully deleted 2" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_call_tool_list_clusters(self) -> None:
-        """Test calling list clusters tool."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {}
-        mock_client.list_clusters = MagicMock(
-            return_value={
-                "clusters": [{"name": "test", "server": "https://test.com", "is_default": True}],
-                "default_cluster": "test",
-            }
-        )
+    async def test_list_tools_returns_all_tools(self, all_tools: list[Tool]) -> None:
+        """Test listing available tools, each exactly once."""
+        assert frozenset(t.name for t in all_tools) == EXPECTED_TOOL_NAMES
+        assert len(all_tools) == len(EXPECTED_TOOL_NAMES)
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool("acp_list_clusters", {})
-
-            assert len(result) == 1
-            assert "test" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_call_tool_whoami(self) -> None:
-        """Test calling whoami tool."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {}
-        mock_client.whoami = AsyncMock(
-            return_value={
-                "authenticated": True,
-                "cluster": "test",
-                "server": "https://test.com",
-                "project": "test-project",
-                "token_valid": True,
-            }
-        )
+    async def test_list_tools_serializes(self, all_tools: list[Tool]) -> None:
+        """Test the shared schema fragments serialize in the list_tools response."""
+        result = ListToolsResult(tools=all_tools)
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool("acp_whoami", {})
-
-            assert len(result) == 1
-            assert "test" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_call_tool_switch_cluster(self) -> None:
-        """Test calling switch cluster tool."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {}
-        mock_client.switch_cluster = AsyncMock(
-            return_value={"switched": True, "previous": "old", "current": "new", "message": "Switched"}
-        )
+        payload = json.loads(result.model_dump_json(by_alias=True, exclude_none=True))
+        tools = {tool["name"]: tool for tool in payload["tools"]}
+        assert tools["acp_get_session"]["inputSchema"]["properties"]["project"]["type"] == "string"
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool("acp_switch_cluster", {"cluster": "new"})
+    async def test_list_tools_reuses_definitions(self) -> None:
+        """Test the tool list is built once and shared across calls."""
+        assert await list_tools() is await list_tools()
 
-            assert len(result) == 1
-            assert "Switched" in result[0].text
 
-    @pytest.mark.asyncio
-    async def test_call_tool_unknown(self) -> None:
-        """Test calling unknown tool."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {}
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool("unknown_tool", {})
-
-            assert len(result) == 1
-            assert "Unknown tool" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_call_tool_error_handling(self) -> None:
-        """Test tool error handling."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.delete_session = AsyncMock(side_effect=ValueError("Test error"))
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool("acp_delete_session", {"project": "test-project", "session": "test"})
-
-            assert len(result) == 1
-            assert "Test error" in result[0].text
-
-
-class TestCallToolBulkStop:
-    """Tests for bulk stop tool dispatch."""
-
-    @pytest.mark.asyncio
-    async def test_bulk_stop_requires_confirm(self) -> None:
-        """Bulk stop without confirm should return validation error."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_stop_sessions",
-                {"project": "test-project", "sessions": ["s1", "s2"]},
-            )
-
-            assert "requires confirm=true" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_bulk_stop_with_confirm(self) -> None:
-        """Bulk stop with confirm should dispatch to client."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.bulk_stop_sessions = AsyncMock(return_value={"stopped": ["s1", "s2"], "failed": []})
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_stop_sessions",
-                {"project": "test-project", "sessions": ["s1", "s2"], "confirm": True},
-            )
-
-            assert "Successfully stopped 2" in result[0].text
-
-
-class TestCallToolRestartSession:
-    """Tests for restart session tool dispatch."""
-
-    @pytest.mark.asyncio
-    async def test_restart_session_dispatch(self) -> None:
-        """Restart session should dispatch to client.restart_session."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.restart_session = AsyncMock(
-            return_value={"restarted": True, "message": "Successfully restarted session 's1'"}
-        )
+class TestCallTool:
+    """Tests for call_tool."""
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
+    @pytest.mark.parametrize(
+        ("tool", "method", "arguments", "response", "expected"),
+        [
+            pytest.param(
+                "acp_list_sessions",
+                "list_sessions",
+                {"project": "test-project"},
+                {
+                    "total": 1,
+                    "filters_applied": {},
+                    "sessions": [{"id": "test-session", "status": "running", "createdAt": "2024-01-01T00:00:00Z"}],
+                },
+                "test-session",
+                id="list-sessions",
+            ),
+            pytest.param(
+                "acp_delete_session",
+                "delete_session",
+                {"project": "test-project", "session": "test-session"},
+                {"deleted": True, "message": "Success"},
+                "Success",
+                id="delete-session",
+            ),
+            pytest.param(
+                "acp_create_session",
+                "create_session",
+                {"project": "test-project", "initial_prompt": "Run tests"},
+                {
+                    "created": True,
+                    "session": "compiled-abc12",
+                    "project": "test-project",
+                    "message": "Session 'compiled-abc12' created in project 'test-project'",
+                },
+                "compiled-abc12",
+                id="create-session",
+            ),
+            pytest.param(
                 "acp_restart_session",
+                "restart_session",
                 {"project": "test-project", "session": "s1"},
-            )
+                {"restarted": True, "message": "Successfully restarted session 's1'"},
+                "Successfully restarted",
+                id="restart-session",
+            ),
+            pytest.param(
+                "acp_list_clusters",
+                "list_clusters",
+                {},
+                {
+                    "clusters": [{"name": "test", "server": "https://test.com", "is_default": True}],
+                    "default_cluster": "test",
+                },
+                "test",
+                id="list-clusters",
+            ),
+            pytest.param(
+                "acp_whoami",
+                "whoami",
+                {},
+                {
+                    "authenticated": True,
+                    "cluster": "test",
+                    "server": "https://test.com",
+                    "project": "test-project",
+                    "token_valid": True,
+                },
+                "test",
+                id="whoami",
+            ),
+            pytest.param(
+                "acp_switch_cluster",
+                "switch_cluster",
+                {"cluster": "new"},
+                {"switched": True, "previous": "old", "current": "new", "message": "Switched"},
+                "Switched",
+                id="switch-cluster",
+            ),
+            pytest.param(
+                "acp_login",
+                "login",
+                {"cluster": "test", "token": "my-token"},
+                {
+                    "authenticated": True,
+                    "cluster": "test",
+                    "server": "https://test.com",
+                    "message": "Successfully authenticated to cluster 'test'",
+                },
+                "Authentication successful",
+                id="login",
+            ),
+            pytest.param(
+                "acp_get_session",
+                "get_session",
+                {"project": "test-project", "session": "session-1"},
+                {"id": "session-1", "status": "running", "displayName": "My Session"},
+                "session-1",
+                id="get-session",
+            ),
+            pytest.param(
+                "acp_create_session_from_template",
+                "create_session_from_template",
+                {"project": "test-project", "template": "bugfix", "display_name": "Fix bug"},
+                {
+                    "created": True,
+                    "session": "template-abc12",
+                    "project": "test-project",
+                    "template": "bugfix",
+                    "message": "Session 'template-abc12' created from template 'bugfix'",
+                },
+                "template-abc12",
+                id="create-from-template",
+            ),
+            pytest.param(
+                "acp_clone_session",
+                "clone_session",
+                {"project": "test-project", "source_session": "source-1", "new_display_name": "my-clone"},
+                {
+                    "created": True,
+                    "session": "cloned-abc12",
+                    "source_session": "source-1",
+                    "project": "test-project",
+                    "message": "Session 'cloned-abc12' cloned from 'source-1'",
+                },
+                "cloned-abc12",
+                id="clone-session",
+            ),
+            pytest.param(
+                "acp_update_session",
+                "update_session",
+                {"project": "test-project", "session": "session-1", "display_name": "new-name"},
+                {
+                    "updated": True,
+                    "message": "Successfully updated session 'session-1'",
+                    "session": {"id": "session-1"},
+                },
+                "updated",
+                id="update-session",
+            ),
+            pytest.param(
+                "acp_get_session_logs",
+                "get_session_logs",
+                {"project": "test-project", "session": "session-1"},
+                {"logs": "INFO: started\nINFO: running", "session": "session-1", "tail_lines": 1000},
+                "started",
+                id="get-session-logs",
+            ),
+            pytest.param(
+                "acp_get_session_transcript",
+                "get_session_transcript",
+                {"project": "test-project", "session": "session-1"},
+                {"session": "session-1", "format": "json", "messages": [{"role": "user", "content": "hello"}]},
+                "hello",
+                id="get-session-transcript",
+            ),
+            pytest.param(
+                "acp_get_session_metrics",
+                "get_session_metrics",
+                {"project": "test-project", "session": "session-1"},
+                {"session": "session-1", "total_tokens": 5000, "duration_seconds": 120, "tool_calls": 15},
+                "5000",
+                id="get-session-metrics",
+            ),
+            pytest.param(
+                "acp_label_resource",
+                "label_session",
+                {"project": "test-project", "name": "session-1", "labels": {"env": "test"}},
+                {"labeled": True, "labels_added": {"env": "test"}, "message": "Added 1 label(s)"},
+                "Added 1 label(s)",
+                id="label-resource",
+            ),
+            pytest.param(
+                "acp_unlabel_resource",
+                "unlabel_session",
+                {"project": "test-project", "name": "session-1", "label_keys": ["env"]},
+                {"unlabeled": True, "labels_removed": ["env"], "message": "Removed 1 label(s)"},
+                "Removed 1 label(s)",
+                id="unlabel-resource",
+            ),
+            pytest.param(
+                "acp_list_sessions_by_label",
+                "list_sessions_by_label",
+                {"project": "test-project", "labels": {"env": "test"}},
+                {
+                    "total": 1,
+                    "sessions": [{"id": "session-1", "status": "running", "createdAt": "2024-01-01T00:00:00Z"}],
+                    "labels_filter": {"env": "test"},
+                },
+                "session-1",
+                id="list-sessions-by-label",
+            ),
+        ],
+    )
+    async def test_call_tool_dispatch(
+        self,
+        mock_client: Mock,
+        tool: str,
+        method: str,
+        arguments: dict,
+        response: dict,
+        expected: str,
+    ) -> None:
+        """Test each tool dispatches to its client method and formats the result."""
+        getattr(mock_client, method).return_value = response
+
+        result = await call_tool(tool, arguments)
+
+        assert_reply(result, expected)
+
+    async def test_call_tool_bulk_delete_dry_run_skips_confirm(self, mock_client: Mock) -> None:
+        """Test a dry run is allowed without confirm."""
+        mock_client.bulk_delete_sessions.return_value = {
+            "dry_run": True,
+            "dry_run_info": {"would_execute": [{"session": "s1"}], "skipped": []},
+        }
+
+        result = await call_tool(
+            "acp_bulk_delete_sessions",
+            {"project": "test-project", "sessions": ["s1"], "dry_run": True},
+        )
 
-            assert len(result) == 1
-            assert "Successfully restarted" in result[0].text
+        assert "Would delete 1 session(s)" in result[0].text
+        mock_client.bulk_delete_sessions.assert_called_once_with(project="test-project", sessions=["s1"], dry_run=True)
 
+    async def test_call_tool_autofills_default_project(self, mock_client: Mock) -> None:
+        """Test a missing project is filled from the client's default project."""
+        mock_client.default_project = "default-project"
+        mock_client.get_session.return_value = {"message": "ok"}
 
-class TestCallToolLogin:
-    """Tests for login tool dispatch."""
+        await call_tool("acp_get_session", {"session": "s1"})
+
+        mock_client.get_session.assert_called_once_with(project="default-project", session="s1")
+
+    async def test_call_tool_runs_concurrently(self, mock_client: Mock) -> None:
+        """Test concurrent tool calls overlap instead of running one after another."""
+        started = 0
+        both_started = asyncio.Event()
 
-    @pytest.mark.asyncio
-    async def test_login_dispatch(self) -> None:
-        """Login should dispatch to client.login."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {}
-        mock_client.login = AsyncMock(
-            return_value={
-                "authenticated": True,
-                "cluster": "test",
-                "server": "https://test.com",
-                "message": "Successfully authenticated to cluster 'test'",
-            }
+        async def get_session(project: str, session: str) -> dict:
+            nonlocal started
+            started += 1
+            if started == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+            return {"message": session}
+
+        mock_client.get_session.side_effect = get_session
+
+        first, second = await asyncio.gather(
+            call_tool("acp_get_session", {"session": "s1"}),
+            call_tool("acp_get_session", {"session": "s2"}),
         )
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_login",
-                {"cluster": "test", "token": "my-token"},
-            )
+        assert first[0].text == "s1"
+        assert second[0].text == "s2"
 
-            assert len(result) == 1
-            assert "Authentication successful" in result[0].text
+    async def test_call_tool_concurrency_capped(self, mock_client: Mock) -> None:
+        """Test no more than the configured number of tool calls run at once."""
+        in_flight = 0
+        peak = 0
 
+        async def get_session(project: str, session: str) -> dict:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return {"message": session}
 
-class TestCallToolGetSession:
-    """Tests for get session tool dispatch."""
+        mock_client.get_session.side_effect = get_session
 
-    @pytest.mark.asyncio
-    async def test_get_session_dispatch(self) -> None:
-        """Get session should dispatch to client.get_session."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.get_session = AsyncMock(
-            return_value={"id": "session-1", "status": "running", "displayName": "My Session"}
-        )
+        with patch("mcp_acp.server._tool_call_slots", asyncio.Semaphore(2)):
+            await asyncio.gather(*(call_tool("acp_get_session", {"session": f"s{i}"}) for i in range(5)))
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool("acp_get_session", {"project": "test-project", "session": "session-1"})
-
-            assert len(result) == 1
-            assert "session-1" in result[0].text
-
-
-class TestCallToolCreateSessionFromTemplate:
-    """Tests for create session from template tool dispatch."""
-
-    @pytest.mark.asyncio
-    async def test_create_from_template_dispatch(self) -> None:
-        """Should dispatch to client.create_session_from_template."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.create_session_from_template = AsyncMock(
-            return_value={
-                "created": True,
-                "session": "template-abc12",
-                "project": "test-project",
-                "template": "bugfix",
-                "message": "Session 'template-abc12' created from template 'bugfix'",
-            }
-        )
+        assert peak == 2
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_create_session_from_template",
-                {"project": "test-project", "template": "bugfix", "display_name": "Fix bug"},
-            )
-
-            assert len(result) == 1
-            assert "template-abc12" in result[0].text
-
-
-class TestCallToolCloneSession:
-    """Tests for clone session tool dispatch."""
-
-    @pytest.mark.asyncio
-    async def test_clone_session_dispatch(self) -> None:
-        """Should dispatch to client.clone_session."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.clone_session = AsyncMock(
-            return_value={
-                "created": True,
-                "session": "cloned-abc12",
-                "source_session": "source-1",
-                "project": "test-project",
-                "message": "Session 'cloned-abc12' cloned from 'source-1'",
-            }
-        )
+    async def test_call_tool_dispatches_through_handler_registry(
+        self, mock_client: Mock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test call_tool looks handlers up by name in the registry only."""
+        handler = AsyncMock(return_value="handled")
+        monkeypatch.setattr("mcp_acp.server._HANDLERS", {"acp_sentinel": handler})
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_clone_session",
-                {"project": "test-project", "source_session": "source-1", "new_display_name": "my-clone"},
-            )
-
-            assert len(result) == 1
-            assert "cloned-abc12" in result[0].text
-
-
-class TestCallToolUpdateSession:
-    """Tests for update session tool dispatch."""
-
-    @pytest.mark.asyncio
-    async def test_update_session_dispatch(self) -> None:
-        """Should dispatch to client.update_session."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.update_session = AsyncMock(
-            return_value={
-                "updated": True,
-                "message": "Successfully updated session 'session-1'",
-                "session": {"id": "session-1"},
-            }
-        )
+        result = await call_tool("acp_sentinel", {"project": "test-project"})
+        missing = await call_tool("acp_get_session", {"project": "test-project", "session": "s1"})
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_update_session",
-                {"project": "test-project", "session": "session-1", "display_name": "new-name"},
-            )
+        assert_reply(result, "handled")
+        handler.assert_awaited_once_with(mock_client, "test-project", {"project": "test-project"})
+        assert_reply(missing, "Unknown tool: acp_get_session")
+        mock_client.get_session.assert_not_called()
 
-            assert len(result) == 1
-            assert "updated" in result[0].text.lower()
+    async def test_call_tool_unknown(self, mock_client: Mock) -> None:
+        """Test calling unknown tool."""
+        result = await call_tool("unknown_tool", {})
 
+        assert_reply(result, "Unknown tool")
 
-class TestCallToolObservability:
-    """Tests for observability tool dispatch (logs, transcript, metrics)."""
-
-    @pytest.mark.asyncio
-    async def test_get_session_logs_dispatch(self) -> None:
-        """Should dispatch to client.get_session_logs."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.get_session_logs = AsyncMock(
-            return_value={"logs": "INFO: started\nINFO: running", "session": "session-1", "tail_lines": 1000}
-        )
+    @pytest.mark.parametrize(
+        ("error", "expected"),
+        [
+            (ValueError("Test error"), "Validation Error: Test error"),
+            (TimeoutError("Request timed out"), "Timeout Error: Request timed out"),
+            (RuntimeError("Boom"), "Error: Boom"),
+        ],
+        ids=["validation", "timeout", "unexpected"],
+    )
+    async def test_call_tool_error_handling(self, mock_client: Mock, error: Exception, expected: str) -> None:
+        """Test each error class is reported with its own prefix."""
+        mock_client.delete_session.side_effect = error
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_get_session_logs",
-                {"project": "test-project", "session": "session-1"},
-            )
-
-            assert len(result) == 1
-            assert "started" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_get_session_transcript_dispatch(self) -> None:
-        """Should dispatch to client.get_session_transcript."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.get_session_transcript = AsyncMock(
-            return_value={
-                "session": "session-1",
-                "format": "json",
-                "messages": [{"role": "user", "content": "hello"}],
-            }
-        )
+        result = await call_tool("acp_delete_session", {"project": "test-project", "session": "test"})
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_get_session_transcript",
-                {"project": "test-project", "session": "session-1"},
-            )
-
-            assert len(result) == 1
-            assert "hello" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_get_session_metrics_dispatch(self) -> None:
-        """Should dispatch to client.get_session_metrics."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.get_session_metrics = AsyncMock(
-            return_value={"session": "session-1", "total_tokens": 5000, "duration_seconds": 120, "tool_calls": 15}
-        )
+        assert [block.text for block in result] == [expected]
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_get_session_metrics",
-                {"project": "test-project", "session": "session-1"},
-            )
 
-            assert len(result) == 1
-            assert "5000" in result[0].text or "5,000" in result[0].text
+class TestCallToolLogin:
+    """Tests for login tool dispatch."""
 
+    async def test_login_token_not_logged(self, mock_client: Mock, mock_logger: MagicMock) -> None:
+        """The token argument should be redacted from the call log."""
+        mock_client.login.return_value = {"authenticated": True, "cluster": "test", "message": "ok"}
 
-class TestCallToolLabels:
-    """Tests for label tool dispatch."""
+        await call_tool("acp_login", {"cluster": "test", "token": "my-token"})
 
-    @pytest.mark.asyncio
-    async def test_label_resource_dispatch(self) -> None:
-        """Should dispatch to client.label_session."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.label_session = AsyncMock(
-            return_value={"labeled": True, "labels_added": {"env": "test"}, "message": "Added 1 label(s)"}
-        )
+        logged = mock_logger.debug.call_args.kwargs["arguments"]
+        assert logged == {"cluster": "test"}
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_label_resource",
-                {"project": "test-project", "name": "session-1", "labels": {"env": "test"}},
-            )
-
-            assert len(result) == 1
-            assert "label" in result[0].text.lower()
-
-    @pytest.mark.asyncio
-    async def test_unlabel_resource_dispatch(self) -> None:
-        """Should dispatch to client.unlabel_session."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.unlabel_session = AsyncMock(
-            return_value={"unlabeled": True, "labels_removed": ["env"], "message": "Removed 1 label(s)"}
-        )
+    async def test_call_start_not_logged_above_debug(self, mock_client: Mock, mock_logger: MagicMock) -> None:
+        """The start event and its argument copy are skipped unless DEBUG is enabled."""
+        mock_client.login.return_value = {"authenticated": True, "cluster": "test", "message": "ok"}
+        mock_logger.isEnabledFor.return_value = False
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_unlabel_resource",
-                {"project": "test-project", "name": "session-1", "label_keys": ["env"]},
-            )
-
-            assert len(result) == 1
-            assert "label" in result[0].text.lower()
-
-    @pytest.mark.asyncio
-    async def test_list_sessions_by_label_dispatch(self) -> None:
-        """Should dispatch to client.list_sessions_by_label."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.list_sessions_by_label = AsyncMock(
-            return_value={
-                "total": 1,
-                "sessions": [{"id": "session-1", "status": "running", "createdAt": "2024-01-01T00:00:00Z"}],
-                "labels_filter": {"env": "test"},
-            }
-        )
+        await call_tool("acp_login", {"cluster": "test", "token": "my-token"})
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_list_sessions_by_label",
-                {"project": "test-project", "labels": {"env": "test"}},
-            )
-
-            assert len(result) == 1
-            assert "session-1" in result[0].text
-
-
-class TestCallToolBulkLabels:
-    """Tests for bulk label/unlabel tool dispatch."""
-
-    @pytest.mark.asyncio
-    async def test_bulk_label_requires_confirm(self) -> None:
-        """Bulk label without confirm should return validation error."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_label_resources",
-                {"project": "test-project", "sessions": ["s1"], "labels": {"env": "test"}},
-            )
-
-            assert "requires confirm=true" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_bulk_label_with_confirm(self) -> None:
-        """Bulk label with confirm should dispatch to client."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.bulk_label_sessions = AsyncMock(
-            return_value={"labeled": ["s1"], "failed": [], "labels": {"env": "test"}}
-        )
+        mock_logger.debug.assert_not_called()
+        assert mock_logger.info.call_args.args[0] == "tool_call_completed"
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_label_resources",
-                {"project": "test-project", "sessions": ["s1"], "labels": {"env": "test"}, "confirm": True},
-            )
-
-            assert len(result) == 1
-
-    @pytest.mark.asyncio
-    async def test_bulk_unlabel_requires_confirm(self) -> None:
-        """Bulk unlabel without confirm should return validation error."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_unlabel_resources",
-                {"project": "test-project", "sessions": ["s1"], "label_keys": ["env"]},
-            )
-
-            assert "requires confirm=true" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_bulk_unlabel_with_confirm(self) -> None:
-        """Bulk unlabel with confirm should dispatch to client."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.bulk_unlabel_sessions = AsyncMock(
-            return_value={"unlabeled": ["s1"], "failed": [], "label_keys": ["env"]}
-        )
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_unlabel_resources",
-                {"project": "test-project", "sessions": ["s1"], "label_keys": ["env"], "confirm": True},
-            )
-
-            assert len(result) == 1
-
-
-class TestCallToolBulkByLabel:
-    """Tests for bulk-by-label tool dispatch."""
-
-    @pytest.mark.asyncio
-    async def test_bulk_restart_requires_confirm(self) -> None:
-        """Bulk restart without confirm should return validation error."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_restart_sessions",
-                {"project": "test-project", "sessions": ["s1", "s2"], "confirm": False},
-            )
-
-            assert "requires confirm=true" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_bulk_restart_with_confirm(self) -> None:
-        """Bulk restart with confirm should dispatch to client."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.bulk_restart_sessions = AsyncMock(return_value={"restarted": ["s1", "s2"], "failed": []})
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_restart_sessions",
-                {"project": "test-project", "sessions": ["s1", "s2"], "confirm": True},
-            )
-
-            assert "Successfully restarted 2" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_bulk_delete_by_label_requires_confirm(self) -> None:
-        """Bulk delete by label without confirm should return validation error."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_delete_sessions_by_label",
-                {"project": "test-project", "labels": {"env": "test"}},
-            )
-
-            assert "requires confirm=true" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_bulk_delete_by_label_with_confirm(self) -> None:
-        """Bulk delete by label with confirm should dispatch to client."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.bulk_delete_sessions_by_label = AsyncMock(
-            return_value={"deleted": ["s1"], "failed": [], "labels_filter": {"env": "test"}}
-        )
+class TestCallToolObservability:
+    """Tests for session log tool dispatch."""
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_delete_sessions_by_label",
-                {"project": "test-project", "labels": {"env": "test"}, "confirm": True},
-            )
-
-            assert len(result) == 1
-            assert "Successfully deleted 1" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_bulk_stop_by_label_requires_confirm(self) -> None:
-        """Bulk stop by label without confirm should return validation error."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_stop_sessions_by_label",
-                {"project": "test-project", "labels": {"env": "test"}},
-            )
-
-            assert "requires confirm=true" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_bulk_stop_by_label_with_confirm(self) -> None:
-        """Bulk stop by label with confirm should dispatch to client."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.bulk_stop_sessions_by_label = AsyncMock(
-            return_value={"stopped": ["s1"], "failed": [], "labels_filter": {"env": "test"}}
-        )
+    async def test_get_session_logs_schema_defaults(self, mock_client: Mock) -> None:
+        """Omitted arguments should take the defaults advertised in the tool schema."""
+        mock_client.get_session_logs.return_value = {"logs": "ok", "session": "s1", "tail_lines": 1000}
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_stop_sessions_by_label",
-                {"project": "test-project", "labels": {"env": "test"}, "confirm": True},
-            )
-
-            assert len(result) == 1
-            assert "Successfully stopped 1" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_bulk_restart_by_label_requires_confirm(self) -> None:
-        """Bulk restart by label without confirm should return validation error."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_restart_sessions_by_label",
-                {"project": "test-project", "labels": {"env": "test"}},
-            )
-
-            assert "requires confirm=true" in result[0].text
-
-    @pytest.mark.asyncio
-    async def test_bulk_restart_by_label_with_confirm(self) -> None:
-        """Bulk restart by label with confirm should dispatch to client."""
-        mock_client = MagicMock()
-        mock_client.clusters_config = MagicMock()
-        mock_client.clusters_config.default_cluster = "test"
-        mock_client.clusters_config.clusters = {"test": MagicMock(default_project="test-project")}
-        mock_client.bulk_restart_sessions_by_label = AsyncMock(
-            return_value={"restarted": ["s1"], "failed": [], "labels_filter": {"env": "test"}}
-        )
+        await call_tool("acp_get_session_logs", {"project": "test-project", "session": "s1"})
 
-        with patch("mcp_acp.server.get_client", return_value=mock_client):
-            result = await call_tool(
-                "acp_bulk_restart_sessions_by_label",
-                {"project": "test-project", "labels": {"env": "test"}, "confirm": True},
-            )
+        mock_client.get_session_logs.assert_called_once_with(
+            project="test-project", session="s1", container=None, tail_lines=1000
+        )
 
-            assert len(result) == 1
-            assert "Successfully restarted 1" in result[0].text
+    async def test_get_session_logs_large_output_split(self, mock_client: Mock) -> None:
+        """Large logs should come back as several blocks split on line boundaries."""
+        logs = "".join(f"line {i:06d} " + "x" * 90 + "\n" for i in range(2000))
+        mock_client.get_session_logs.return_value = {"logs": logs, "session": "session-1", "tail_lines": 2000}
+
+        result = await call_tool("acp_get_session_logs", {"project": "test-project", "session": "session-1"})
+
+        assert len(result) > 1
+        assert all(len(block.text) <= MAX_TEXT_BLOCK_CHARS for block in result)
+        assert all(block.text.endswith("\n") for block in result[:-1])
+        assert "".join(block.text for block in result).endswith(logs)
+
+
+BULK_CONFIRM_CASES = [
+    pytest.param(
+        "acp_bulk_delete_sessions",
+        "bulk_delete_sessions",
+        {"project": "test-project", "sessions": ["s1", "s2"]},
+        {"deleted": ["s1", "s2"], "failed": []},
+        "Successfully deleted 2",
+        id="delete",
+    ),
+    pytest.param(
+        "acp_bulk_stop_sessions",
+        "bulk_stop_sessions",
+        {"project": "test-project", "sessions": ["s1", "s2"]},
+        {"stopped": ["s1", "s2"], "failed": []},
+        "Successfully stopped 2",
+        id="stop",
+    ),
+    pytest.param(
+        "acp_bulk_restart_sessions",
+        "bulk_restart_sessions",
+        {"project": "test-project", "sessions": ["s1", "s2"]},
+        {"restarted": ["s1", "s2"], "failed": []},
+        "Successfully restarted 2",
+        id="restart",
+    ),
+    pytest.param(
+        "acp_bulk_label_resources",
+        "bulk_label_sessions",
+        {"project": "test-project", "sessions": ["s1"], "labels": {"env": "test"}},
+        {"labeled": ["s1"], "failed": [], "labels": {"env": "test"}},
+        "Successfully labeled 1",
+        id="label",
+    ),
+    pytest.param(
+        "acp_bulk_unlabel_resources",
+        "bulk_unlabel_sessions",
+        {"project": "test-project", "sessions": ["s1"], "label_keys": ["env"]},
+        {"unlabeled": ["s1"], "failed": [], "label_keys": ["env"]},
+        "Successfully unlabeled 1",
+        id="unlabel",
+    ),
+    pytest.param(
+        "acp_bulk_delete_sessions_by_label",
+        "bulk_delete_sessions_by_label",
+        {"project": "test-project", "labels": {"env": "test"}},
+        {"deleted": ["s1"], "failed": [], "labels_filter": {"env": "test"}},
+        "Successfully deleted 1",
+        id="delete-by-label",
+    ),
+    pytest.param(
+        "acp_bulk_stop_sessions_by_label",
+        "bulk_stop_sessions_by_label",
+        {"project": "test-project", "labels": {"env": "test"}},
+        {"stopped": ["s1"], "failed": [], "labels_filter": {"env": "test"}},
+        "Successfully stopped 1",
+        id="stop-by-label",
+    ),
+    pytest.param(
+        "acp_bulk_restart_sessions_by_label",
+        "bulk_restart_sessions_by_label",
+        {"project": "test-project", "labels": {"env": "test"}},
+        {"restarted": ["s1"], "failed": [], "labels_filter": {"env": "test"}},
+        "Successfully restarted 1",
+        id="restart-by-label",
+    ),
+]
+
+
+class TestCallToolBulkConfirm:
+    """Tests for the confirm gate on bulk tool dispatch."""
+
+    @pytest.mark.parametrize(("tool", "method", "arguments", "response", "expected"), BULK_CONFIRM_CASES)
+    async def test_bulk_requires_confirm(
+        self,
+        mock_client: Mock,
+        tool: str,
+        method: str,
+        arguments: dict,
+        response: dict,
+        expected: str,
+    ) -> None:
+        """Bulk tools without confirm should return a validation error."""
+        result = await call_tool(tool, arguments)
+
+        assert "requires confirm=true" in result[0].text
+        getattr(mock_client, method).assert_not_called()
+
+    @pytest.mark.parametrize(("tool", "method", "arguments", "response", "expected"), BULK_CONFIRM_CASES)
+    async def test_bulk_with_confirm(
+        self,
+        mock_client: Mock,
+        tool: str,
+        method: str,
+        arguments: dict,
+        response: dict,
+        expected: str,
+    ) -> None:
+        """Bulk tools with confirm should dispatch to the client."""
+        getattr(mock_client, method).return_value = response
+
+        result = await call_tool(tool, {**arguments, "confirm": True})
+
+        assert_reply(result, expected)
+
+
+class TestMain:
+    """Tests for server startup."""
+
+    async def test_main_initializes_client_before_serving(self) -> None:
+        """Test the client is built before the server starts reading requests."""
+        calls: list[str] = []
+        stdio = MagicMock()
+        stdio.return_value.__aenter__ = AsyncMock(side_effect=lambda: calls.append("serve") or (None, None))
+        stdio.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch("mcp_acp.server.get_client", side_effect=lambda: calls.append("client")),
+            patch("mcp_acp.server.stdio_server", stdio),
+            patch("mcp_acp.server.app.run", AsyncMock()),
+        ):
+            await main()
+
+        assert calls == ["client", "serve"]
+
+    async def test_main_serves_when_client_init_fails(self) -> None:
+        """Test a bad config does not stop the server from starting."""
+        stdio = MagicMock()
+        stdio.return_value.__aenter__ = AsyncMock(return_value=(None, None))
+        stdio.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch("mcp_acp.server.get_client", side_effect=ValueError("bad config")),
+            patch("mcp_acp.server.stdio_server", stdio),
+            patch("mcp_acp.server.app.run", AsyncMock()) as mock_app_run,
+        ):
+            await main()
+
+        mock_app_run.assert_awaited_once()
+
+    async def test_main_closes_client_on_shutdown(self, mock_client: Mock) -> None:
+        """Test the pooled HTTP clients are closed when the server stops."""
+        stdio = MagicMock()
+        stdio.return_value.__aenter__ = AsyncMock(return_value=(None, None))
+        stdio.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with (
+            patch("mcp_acp.server._client", mock_client),
+            patch("mcp_acp.server.stdio_server", stdio),
+            patch("mcp_acp.server.app.run", AsyncMock()),
+        ):
+            await main()
+
+        mock_client.close.assert_awaited_once()
+
+
+class TestRun:
+    """Tests for the run entry point."""
+
+    def test_run_uses_uvloop_when_installed(self) -> None:
+        """Test run passes uvloop's loop factory to asyncio.run."""
+        fake_uvloop = SimpleNamespace(new_event_loop=asyncio.new_event_loop)
+
+        with (
+            patch.dict("sys.modules", {"uvloop": fake_uvloop}),
+            patch("mcp_acp.server.main", MagicMock()),
+            patch("mcp_acp.server.asyncio.run") as mock_run,
+        ):
+            run()
+
+        assert mock_run.call_args.kwargs["loop_factory"] is fake_uvloop.new_event_loop
+
+    def test_run_falls_back_without_uvloop(self) -> None:
+        """Test run uses the default event loop when uvloop is missing."""
+        with (
+            patch.dict("sys.modules", {"uvloop": None}),
+            patch("mcp_acp.server.main", MagicMock()),
+            patch("mcp_acp.server.asyncio.run") as mock_run,
+        ):
+            run()
+
+        assert "loop_factory" not in mock_run.call_args.kwargs